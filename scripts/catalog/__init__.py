@@ -0,0 +1,7 @@
+"""Shared helpers for the variant / configuration generator scripts.
+
+The scripts under ``scripts/`` are run from their own directories, so each
+one puts ``scripts/`` on ``sys.path`` before importing from this package.
+From ``scripts/`` the same steps run as ``python -m catalog <command>``
+(see ``catalog.cli``).  Importing the package itself loads nothing else.
+"""
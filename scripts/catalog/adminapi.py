@@ -0,0 +1,256 @@
+"""Minimal asyncio client for the Shopify Admin GraphQL API.
+
+Only the standard library is used: requests go over a small pool of
+keep-alive HTTP/1.1 connections opened with ``asyncio.open_connection``.
+A client-side leaky bucket mirrors the server's ``throttleStatus`` so we
+wait *before* sending instead of collecting ``THROTTLED`` errors, and
+transient failures are retried with exponential backoff.
+"""
+import asyncio
+import json
+import random
+import ssl
+import time
+from urllib.parse import urlsplit
+
+# ——— DEFAULTS ———
+API_VERSION      = "2025-01"
+POOL_SIZE        = 4       # concurrent keep-alive connections
+MAX_ATTEMPTS     = 5
+BACKOFF_BASE     = 0.5     # seconds, doubled per attempt
+BACKOFF_MAX      = 16.0
+BUCKET_SIZE      = 2000    # Admin API standard plan bucket
+RESTORE_RATE     = 100     # points per second
+DEFAULT_COST     = 10      # assumed cost until the server tells us
+TIMEOUT          = 30.0    # seconds to connect, and to read one response
+MAX_WAIT_STEP    = 0.5     # seconds; longest bucket wait before re-checking
+# ————————
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def admin_url(shop, version=API_VERSION):
+    return f"https://{shop}/admin/api/{version}/graphql.json"
+
+
+class TransientError(Exception):
+    """Raised for failures that are worth retrying."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LeakyBucket:
+    """Client-side copy of the server's cost bucket.
+
+    ``acquire`` blocks until ``cost`` points are available; ``update`` resyncs
+    with the ``throttleStatus`` the server reports after every request.
+    """
+
+    def __init__(self, capacity=BUCKET_SIZE, restore_rate=RESTORE_RATE):
+        self.capacity = capacity
+        self.restore_rate = restore_rate
+        self.available = float(capacity)
+        self.stamp = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity,
+                             self.available + (now - self.stamp) * self.restore_rate)
+        self.stamp = now
+
+    async def acquire(self, cost):
+        cost = min(cost, self.capacity)
+        async with self.lock:
+            self._refill()
+            while self.available < cost:
+                # short naps, so a throttleStatus that arrives meanwhile counts
+                await asyncio.sleep(min(MAX_WAIT_STEP, (cost - self.available) / self.restore_rate))
+                self._refill()
+            self.available -= cost
+
+    def update(self, throttle_status):
+        if not throttle_status:
+            return
+        self.capacity = throttle_status.get("maximumAvailable", self.capacity)
+        self.restore_rate = throttle_status.get("restoreRate", self.restore_rate)
+        self.available = float(throttle_status.get("currentlyAvailable", self.available))
+        self.stamp = time.monotonic()
+
+    def wait_for(self, cost):
+        self._refill()
+        return max(0.0, (cost - self.available) / self.restore_rate)
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Up to ``size`` keep-alive connections to a single host."""
+
+    def __init__(self, url, size=POOL_SIZE, timeout=TIMEOUT):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.secure = parts.scheme == "https"
+        self.port = parts.port or (443 if self.secure else 80)
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.ssl = ssl.create_default_context() if self.secure else None
+        self.timeout = timeout
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        return _Connection(reader, writer)
+
+    async def request(self, body, headers, method="POST", path=None):
+        """``(status, headers, payload)``; ``path`` defaults to the pool URL's."""
+        async with self.slots:
+            try:
+                conn = self.idle.pop() if self.idle else await asyncio.wait_for(
+                    self._open(), self.timeout)
+            except asyncio.TimeoutError:
+                raise TransientError(f"no connection within {self.timeout}s")
+            except OSError as exc:
+                raise TransientError(f"connection error: {exc!r}")
+            # the connection goes back to the pool only after a complete response;
+            # anything else (timeouts, bad framing, cancellation) closes it
+            reusable = False
+            try:
+                status, resp_headers, payload = await asyncio.wait_for(
+                    self._roundtrip(conn, body, headers, method, path or self.path), self.timeout)
+                reusable = resp_headers.get("connection", "").lower() != "close"
+                return status, resp_headers, payload
+            except asyncio.TimeoutError:
+                raise TransientError(f"no response within {self.timeout}s")
+            except (OSError, asyncio.IncompleteReadError, ConnectionError) as exc:
+                raise TransientError(f"connection error: {exc!r}")
+            finally:
+                if reusable:
+                    self.idle.append(conn)
+                else:
+                    conn.close()
+
+    async def _roundtrip(self, conn, body, headers, method="POST", path=None):
+        head = [f"{method} {path or self.path} HTTP/1.1", f"Host: {self.host}",
+                f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        head += [f"{k}: {v}" for k, v in headers.items()]
+        conn.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        resp_headers = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            resp_headers[k.strip().lower()] = v.strip()
+
+        if resp_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await conn.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await conn.reader.readline()
+                    break
+                chunks.append(await conn.reader.readexactly(size))
+                await conn.reader.readline()
+            payload = b"".join(chunks)
+        else:
+            payload = await conn.reader.readexactly(int(resp_headers.get("content-length", 0)))
+        return status, resp_headers, payload
+
+    def close(self):
+        while self.idle:
+            self.idle.pop().close()
+
+
+class AdminClient:
+    """Send GraphQL documents through a shared pool, throttle and retry."""
+
+    def __init__(self, url, token=None, pool_size=POOL_SIZE, bucket=None,
+                 max_attempts=MAX_ATTEMPTS, backoff_base=BACKOFF_BASE, timeout=TIMEOUT):
+        self.pool = ConnectionPool(url, pool_size, timeout)
+        self.bucket = bucket or LeakyBucket()
+        self.headers = {"Content-Type": "application/json"}
+        if token:
+            self.headers["X-Shopify-Access-Token"] = token
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.last_cost = DEFAULT_COST
+        self.retries = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return retry_after
+        delay = min(BACKOFF_MAX, self.backoff_base * 2 ** attempt)
+        return delay * (0.5 + random.random() / 2)
+
+    async def execute(self, query, variables=None, cost=None):
+        """Return the decoded response, retrying transient failures."""
+        body = json.dumps({"query": query, "variables": variables or {}}).encode("utf-8")
+        for attempt in range(self.max_attempts):
+            # without an estimate, retries wait for the cost the server just reported
+            await self.bucket.acquire(cost or self.last_cost)
+            try:
+                resp = await self._send(body)
+            except TransientError as exc:
+                if attempt + 1 == self.max_attempts:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, exc.retry_after))
+                continue
+            return resp
+        raise TransientError("retries exhausted")
+
+    async def _send(self, body):
+        status, headers, payload = await self.pool.request(body, self.headers)
+        if status in RETRY_STATUSES:
+            retry_after = headers.get("retry-after")
+            raise TransientError(f"HTTP {status}",
+                                 float(retry_after) if retry_after else None)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}: {payload[:200]!r}")
+
+        resp = json.loads(payload)
+        cost_ext = (resp.get("extensions") or {}).get("cost") or {}
+        self.bucket.update(cost_ext.get("throttleStatus"))
+        if "requestedQueryCost" in cost_ext:
+            self.last_cost = cost_ext["requestedQueryCost"]
+
+        codes = {(e.get("extensions") or {}).get("code") for e in resp.get("errors") or []}
+        if "THROTTLED" in codes:
+            raise TransientError("THROTTLED", self.bucket.wait_for(self.last_cost))
+        return resp
+
+
+def user_errors(resp):
+    """Collect ``userErrors`` from every top-level field of a response."""
+    found = []
+    for alias, result in ((resp or {}).get("data") or {}).items():
+        for err in (result or {}).get("userErrors") or []:
+            found.append({"alias": alias, **err})
+    return found
@@ -0,0 +1,266 @@
+"""Split aliased ``metaobjectCreate`` mutations into cost/size bounded batches.
+
+One document with every cartesian combination runs into the Admin API's
+calculated query cost limit (1000 points) and grows without bound as options
+are added.  The emitter below packs aliases greedily into batches that stay
+under both a cost and a byte budget.  Aliases keep their global ``conf_NNN``
+number, so the responses of all batches can simply be merged by alias.
+"""
+import json
+import os
+
+from .cache import write_text
+from .instrument import count, stage
+
+# ——— LIMITS ———
+MAX_QUERY_COST = 1000      # Admin API single query cost ceiling
+MAX_BATCH_BYTES = 32_000   # keep documents well below the request size limit
+MUTATION_COST = 10         # every mutation field costs 10 points
+OBJECT_COST = 1            # every object in the selection costs 1 point
+# ————————
+
+OPERATION_NAME = "BulkCreateConfigurations"
+
+
+def alias_name(i):
+    return f"conf_{i:03}"
+
+
+def alias_number(alias):
+    """``conf_017`` → 17; ``None`` for any other key (``del_001``, ...)."""
+    prefix, _, digits = alias.partition("_")
+    return int(digits) if prefix == "conf" and digits.isdigit() else None
+
+
+def graphql_string(s):
+    # JSON string escaping is valid GraphQL string escaping
+    return json.dumps(s, ensure_ascii=False)
+
+
+def render_alias(alias, definition_handle, refs):
+    refs_json = json.dumps(list(refs))
+    return f'''
+  {alias}: metaobjectCreate(metaobject: {{
+    type: "{definition_handle}",
+    fields: [
+      {{ key: "configurations", value: {graphql_string(refs_json)} }}
+    ]
+  }}) {{
+    metaobject {{ id }}
+    userErrors {{ field message }}
+  }}'''
+
+
+def render_delete(alias, metaobject_id):
+    return f'''
+  {alias}: metaobjectDelete(id: {graphql_string(metaobject_id)}) {{
+    deletedId
+    userErrors {{ field message }}
+  }}'''
+
+
+def alias_cost():
+    # metaobjectCreate + the metaobject and userErrors objects it selects
+    return MUTATION_COST + 2 * OBJECT_COST
+
+
+def document_head(batch_no=None, operation=OPERATION_NAME):
+    name = operation if batch_no is None else f"{operation}{batch_no:03}"
+    return f"mutation {name} {{"
+
+
+def document(blocks, batch_no=None, operation=OPERATION_NAME):
+    return document_head(batch_no, operation) + "\n".join(blocks) + "\n}"
+
+
+def config_entries(combos, definition_handle, start=1):
+    """Yield ``(alias, block)`` for each combination, numbered from ``start``."""
+    for i, combo in enumerate(combos, start=start):
+        alias = alias_name(i)
+        yield alias, render_alias(alias, definition_handle, combo)
+
+
+def chunk_entries(entries, max_cost=MAX_QUERY_COST, max_bytes=MAX_BATCH_BYTES):
+    """Greedily pack ``(alias, block)`` pairs into batches within both budgets.
+
+    A single alias that is larger than ``max_bytes`` on its own still gets a
+    batch of its own rather than being dropped.
+    """
+    overhead = len(document([], 999).encode("utf-8"))
+    per_alias = alias_cost()
+    batch, cost, size = [], 0, overhead
+    for alias, block in entries:
+        block_bytes = len(block.encode("utf-8")) + 1  # joining newline
+        if batch and (cost + per_alias > max_cost or size + block_bytes > max_bytes):
+            yield batch
+            batch, cost, size = [], 0, overhead
+        batch.append((alias, block))
+        cost += per_alias
+        size += block_bytes
+    if batch:
+        yield batch
+
+
+def write_batches(entries, out_dir=".", prefix="create_configs",
+                  max_cost=MAX_QUERY_COST, max_bytes=MAX_BATCH_BYTES,
+                  operation=OPERATION_NAME):
+    """Write one ``<prefix>_NNN.graphql`` per batch plus a manifest.
+
+    Returns the manifest dict; it is also written to ``<prefix>.manifest.json``.
+    Files go through ``catalog.cache.write_text``: with a cache configured, a
+    batch whose text did not change is left untouched and listed under
+    ``unchanged`` in the returned dict (not in the written manifest).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    batches, unchanged = [], []
+    with stage("write batches", prefix=prefix):
+        for batch_no, batch in enumerate(chunk_entries(entries, max_cost, max_bytes), start=1):
+            text = document([block for _, block in batch], batch_no, operation)
+            filename = f"{prefix}_{batch_no:03}.graphql"
+            if not write_text(os.path.join(out_dir, filename), text):
+                unchanged.append(filename)
+            batches.append({
+                "file": filename,
+                "operation": f"{operation}{batch_no:03}",
+                "first_alias": batch[0][0],
+                "last_alias": batch[-1][0],
+                "aliases": len(batch),
+                "estimated_cost": len(batch) * alias_cost(),
+                "bytes": len(text.encode("utf-8")),
+            })
+
+    manifest = {
+        "max_cost": max_cost,
+        "max_bytes": max_bytes,
+        "total_aliases": sum(b["aliases"] for b in batches),
+        "batches": batches,
+    }
+    write_text(os.path.join(out_dir, f"{prefix}.manifest.json"), json.dumps(manifest, indent=2))
+    count("bytes written", sum(b["bytes"] for b in batches))
+    return dict(manifest, unchanged=unchanged)
+
+
+def merge_responses(responses):
+    """Merge the ``data`` of several batch responses into one alias map."""
+    merged = {}
+    for resp in responses:
+        merged.update(resp.get("data") or {})
+    return {"data": merged}
+
+
+# ——— parameterized documents ———
+#
+# The literal documents above inline every refs list and repeat the whole
+# selection per alias, so each batch is a different ~31 KB document the
+# server parses from scratch.  The parameterized form sends one document per
+# batch *size* — the same text for every full batch — with the refs as typed
+# ``String!`` variables ($c0, $c1, ...) and the selection in a fragment; the
+# variables file is compact JSON.  Slots are positional, so the manifest
+# lists each batch's aliases and ``remap_response`` turns ``c0`` back into
+# ``conf_NNN`` before responses are merged.
+
+PARAM_OPERATION = "CreateConfigurations"
+RESULT_FRAGMENT = "fragment Created on MetaobjectCreatePayload{metaobject{id}userErrors{field message}}"
+
+
+def slot_name(i):
+    return f"c{i}"
+
+
+def param_document(slots, operation=PARAM_OPERATION):
+    """Reusable document creating ``slots`` configs from ``$type`` and ``$c0..``.
+
+    Machine-sent, so one alias per line without optional whitespace.
+    """
+    decls = "".join(f",${slot_name(i)}:String!" for i in range(slots))
+    fields = "".join(
+        f'{slot_name(i)}:metaobjectCreate(metaobject:{{type:$type,fields:'
+        f'[{{key:"configurations",value:${slot_name(i)}}}]}}){{...Created}}\n'
+        for i in range(slots))
+    return f"mutation {operation}{slots}($type:String!{decls}){{\n{fields}}}\n{RESULT_FRAGMENT}\n"
+
+
+def param_variables(definition_handle, refs_list):
+    variables = {"type": definition_handle}
+    for i, refs in enumerate(refs_list):
+        variables[slot_name(i)] = json.dumps(list(refs), separators=(",", ":"))
+    return variables
+
+
+def remap_response(resp, aliases):
+    """Rename slot aliases (``c0``...) of a parameterized batch response to ``aliases``."""
+    data = resp.get("data") or {}
+    mapped = {aliases[int(k[1:])]: v for k, v in data.items()
+              if k[:1] == "c" and k[1:].isdigit() and int(k[1:]) < len(aliases)}
+    return dict(resp, data=mapped)
+
+
+def _param_line_bytes(i):
+    # one aliased field of param_document plus its variable declaration
+    return len(param_document(i + 1)) - len(param_document(i))
+
+
+def write_param_batches(aliased_refs, definition_handle, out_dir=".", prefix="create_configs",
+                        max_cost=MAX_QUERY_COST, max_bytes=MAX_BATCH_BYTES,
+                        operation=PARAM_OPERATION):
+    """Parameterized counterpart of ``write_batches`` for ``(alias, refs)`` pairs.
+
+    Writes ``<prefix>.params_<n>.graphql`` once per distinct batch size,
+    ``<prefix>_NNN.variables.json`` per batch and the manifest; returns the
+    manifest (plus ``unchanged`` like ``write_batches``).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    per_alias = alias_cost()
+
+    def batches():
+        batch, size = [], len(param_document(0)) + 2
+        for alias, refs in aliased_refs:
+            value = json.dumps(json.dumps(list(refs), separators=(",", ":")))
+            grow = _param_line_bytes(len(batch)) + len(value) + len(slot_name(len(batch))) + 4
+            if batch and ((len(batch) + 1) * per_alias > max_cost or size + grow > max_bytes):
+                yield batch
+                batch, size = [], len(param_document(0)) + 2
+                grow = _param_line_bytes(0) + len(value) + len(slot_name(0)) + 4
+            batch.append((alias, refs))
+            size += grow
+        if batch:
+            yield batch
+
+    entries, unchanged, documents = [], [], {}
+    with stage("write batches", prefix=prefix, params=True):
+        for batch_no, batch in enumerate(batches(), start=1):
+            n = len(batch)
+            doc_file = f"{prefix}.params_{n}.graphql"
+            if doc_file not in documents:
+                documents[doc_file] = param_document(n, operation)
+                if not write_text(os.path.join(out_dir, doc_file), documents[doc_file]):
+                    unchanged.append(doc_file)
+            filename = f"{prefix}_{batch_no:03}.variables.json"
+            text = json.dumps(param_variables(definition_handle, [r for _, r in batch]),
+                              ensure_ascii=False, separators=(",", ":"))
+            if not write_text(os.path.join(out_dir, filename), text):
+                unchanged.append(filename)
+            entries.append({
+                "file": filename,
+                "document": doc_file,
+                "operation": f"{operation}{n}",
+                "first_alias": batch[0][0],
+                "last_alias": batch[-1][0],
+                "aliases": n,
+                "slots": [alias for alias, _ in batch],
+                "estimated_cost": n * per_alias,
+                "bytes": len(text.encode("utf-8")) + len(documents[doc_file].encode("utf-8")),
+            })
+
+    manifest = {
+        "mode": "params",
+        "max_cost": max_cost,
+        "max_bytes": max_bytes,
+        "total_aliases": sum(b["aliases"] for b in entries),
+        "documents": sorted(documents),
+        "batches": entries,
+    }
+    write_text(os.path.join(out_dir, f"{prefix}.manifest.json"), json.dumps(manifest, indent=2))
+    count("bytes written", sum(len(t.encode("utf-8")) for t in documents.values())
+          + sum(b["bytes"] - len(documents[b["document"]].encode("utf-8")) for b in entries))
+    return dict(manifest, unchanged=unchanged)
@@ -0,0 +1,283 @@
+"""Scaling benchmark for the variant/config generators.
+
+Builds synthetic ``metaobjects.json`` / ``configuration_value.json`` catalogs
+for a range of combination counts, runs every generator stage in a fresh
+child process and records wall time, peak RSS and output bytes::
+
+    python -m catalog.bench --scales 324,3240,32400 --out bench_results.json
+    python -m catalog.bench --out new.json --baseline bench_results.json
+
+With ``--baseline`` the run is compared against an earlier results file and
+the exit status is 1 if any stage got slower or bigger than ``--threshold``.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from .batching import alias_name
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SCALES = (324, 3_240, 32_400)
+SIDES, HANGS, PACKS = 2, 9, 3          # fixed dimensions; sizes grow with scale
+
+# Child process: run one script as __main__ and report its own resource usage.
+_CHILD = r"""
+import contextlib, json, os, resource, runpy, sys, time
+script, cwd, stdout_path, argv = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4:]
+os.chdir(cwd)
+sys.argv = [script] + argv
+code = 0
+start = time.perf_counter()
+with open(stdout_path, "w") as out, contextlib.redirect_stdout(out):
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as exc:
+        code = exc.code or 0
+wall = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024
+print(json.dumps({"wall_s": wall, "peak_rss_kb": rss, "exit": code}), file=sys.__stdout__)
+"""
+
+
+# ——— synthetic inputs ———
+
+def _money(amount):
+    return json.dumps({"amount": f"{amount:.2f}", "currency_code": "EUR"}, separators=(",", ":"))
+
+
+def _measure(value, unit):
+    return json.dumps({"value": float(value), "unit": unit}, separators=(",", ":"))
+
+
+def _size(i):
+    width, height = 40 + (i % 60) * 5, 80 + (i // 60) * 5
+    return width, height, f"{width} × {height} cm"
+
+
+def synth_metaobjects(sizes, sides=SIDES, hangs=HANGS, packs=PACKS):
+    """A ``metaobjects.json`` document with the given dimension sizes."""
+    ids = iter(range(500000000000, 10**13))
+
+    def node(fields):
+        return {"node": {"id": f"gid://shopify/Metaobject/{next(ids)}",
+                         "fields": [{"key": k, "value": v} for k, v in fields]}}
+
+    data = {
+        "sizeOptions": {"edges": [
+            node([("name", name), ("weight", _measure(100 + i % 400, "GRAMS")),
+                  ("width", _measure(w, "CENTIMETERS")), ("height", _measure(h, "CENTIMETERS")),
+                  ("price", _money(5 + (i % 90) * 0.1))])
+            for i, (w, h, name) in ((i, _size(i)) for i in range(sizes))]},
+        "printedSides": {"edges": [
+            node([("side", f"Side {i}" if i else "Front"), ("price", _money(i * 0.4))])
+            for i in range(sides)]},
+        "hangloopOptions": {"edges": [
+            node([("position", f"Position {i}" if i else "None"), ("price", _money(0.2 if i else 0))])
+            for i in range(hangs)]},
+        "packagingOptions": {"edges": [
+            node([("packaging", f"Bag {i}" if i else "No Bag"), ("price", _money(i * 0.4))])
+            for i in range(packs)]},
+    }
+    return {"data": data}
+
+
+OPTION_TYPES = ("Towel Size", "Printed Sides", "Hangloop Position", "Packaging")
+
+
+def synth_config_values(sizes, sides=SIDES, hangs=HANGS, packs=PACKS):
+    """``(configuration_value.json, configuration_option.json)`` documents."""
+    option_ids = {t: f"gid://shopify/Metaobject/{344660000000 + i}"
+                  for i, t in enumerate(OPTION_TYPES)}
+    ids = iter(range(600000000000, 10**13))
+    edges, nodes = [], []
+
+    def add(display, fields):
+        edges.append({"node": {"id": f"gid://shopify/Metaobject/{next(ids)}",
+                               "displayName": display, "type": "configuration_value"}})
+        nodes.append({"fields": [{"key": k, "value": v} for k, v in fields]})
+
+    for i in range(sizes):
+        w, h, name = _size(i)
+        add(name, [("name", name), ("price", _money(5 + (i % 90) * 0.1)),
+                   ("weight", _measure(100 + i % 400, "GRAMS")),
+                   ("option_id", option_ids["Towel Size"])])
+    for i in range(sides):
+        name = f"Side {i}" if i else "Front"
+        add(name, [("name", name), ("price", _money(i * 0.4)), ("weight", None),
+                   ("option_id", option_ids["Printed Sides"]), ("print_sides", name)])
+    for i in range(hangs):
+        name = f"Position {i}" if i else "No Hangloop"
+        pos = f"position-{i}" if i else "none"
+        add(name, [("name", name), ("price", _money(0.2 if i else 0)), ("weight", None),
+                   ("option_id", option_ids["Hangloop Position"]), ("hangloop_position", pos)])
+    for i in range(packs):
+        name = f"Bag {i}" if i else "No Bag"
+        add(name, [("name", name), ("price", _money(i * 0.4)), ("weight", None),
+                   ("option_id", option_ids["Packaging"]), ("packaging", name.lower())])
+
+    values = {"data": {"metaobjectDefinition": {"metaobjects": {"edges": edges, "nodes": nodes}}}}
+    options = {"data": {"metaobjectDefinition": {"metaobjects": {
+        "edges": [{"node": {"id": oid, "displayName": t, "type": "configuration_option"}}
+                  for t, oid in option_ids.items()],
+        "nodes": [{"fields": [{"key": "name", "value": t}]} for t in option_ids]}}}}
+    return values, options
+
+
+def synth_configs_response(count):
+    """A ``conf_NNN`` response for ``count`` configs, one alias per config combination."""
+    return {"data": {alias_name(i): {
+        "metaobject": {"id": f"gid://shopify/Metaobject/{700000000000 + i}"}, "userErrors": []}
+        for i in range(1, count + 1)}}
+
+
+# ——— stages ———
+
+STAGES = {
+    # name: (script, argv, output globs; "-" = the script's stdout)
+    "make_configs":          ("create-varients-v3/make_configs.py", [],
+                              ["create_configs_*.graphql"]),
+    "full_workflow_configs": ("create-varients-v2/generate_full_workflow.py", ["metaobjects.json"],
+                              ["create_configs_*.graphql"]),
+    "full_workflow_variants": ("create-varients-v2/generate_full_workflow.py",
+                               ["metaobjects.json", "configs.json"], ["-"]),
+    "full_workflow_jsonl":   ("create-varients-v2/generate_full_workflow.py",
+                              ["--jsonl", "variants.jsonl", "metaobjects.json", "configs.json"],
+                              ["variants.jsonl"]),
+    "product_variants":      ("helper-scripts/create-product-variables/generate_product-varients.py", [],
+                              ["product_variants_variables.json", "product_variants.jsonl"]),
+}
+
+
+def _output_bytes(cwd, patterns, stdout_path):
+    import glob
+    total = 0
+    for pattern in patterns:
+        if pattern == "-":
+            total += os.path.getsize(stdout_path)
+        else:
+            total += sum(os.path.getsize(p) for p in glob.glob(os.path.join(cwd, pattern)))
+    return total
+
+
+def run_stage(name, cwd, repeat=1):
+    """Run ``name`` ``repeat`` times; keeps the fastest wall time and the largest RSS."""
+    script, argv, outputs = STAGES[name]
+    stdout_path = os.path.join(cwd, f".{name}.stdout")
+    row = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-c", _CHILD, os.path.join(SCRIPTS, script), cwd,
+                               stdout_path, *argv], capture_output=True, text=True)
+        if proc.returncode != 0 or not proc.stdout.strip():
+            return {"stage": name, "ok": False, "error": proc.stderr.strip()[-500:]}
+        run = json.loads(proc.stdout.strip().splitlines()[-1])
+        if row is None:
+            row = run
+        else:
+            row["wall_s"] = min(row["wall_s"], run["wall_s"])
+            row["peak_rss_kb"] = max(row["peak_rss_kb"], run["peak_rss_kb"])
+    row.update(stage=name, ok=row.pop("exit") == 0, repeat=repeat,
+               output_bytes=_output_bytes(cwd, outputs, stdout_path))
+    return row
+
+
+def prepare(cwd, combos):
+    """Write synthetic inputs for ``combos`` config combinations into ``cwd``."""
+    sizes = max(1, round(combos / (SIDES * HANGS * PACKS)))
+    with open(os.path.join(cwd, "metaobjects.json"), "w") as f:
+        json.dump(synth_metaobjects(sizes), f)
+    with open(os.path.join(cwd, "configs.json"), "w") as f:
+        json.dump(synth_configs_response(sizes * SIDES * HANGS * PACKS), f)
+    values, options = synth_config_values(sizes)
+    with open(os.path.join(cwd, "configuration_value.json"), "w") as f:
+        json.dump(values, f)
+    with open(os.path.join(cwd, "configuration_option.json"), "w") as f:
+        json.dump(options, f)
+    return {"sizes": sizes, "config_combos": sizes * SIDES * HANGS * PACKS,
+            "variant_combos": sizes * SIDES * 2 * PACKS}
+
+
+def run(scales=DEFAULT_SCALES, stages=tuple(STAGES), repeat=1, log=print):
+    rows = []
+    for combos in scales:
+        with tempfile.TemporaryDirectory(prefix="catalog-bench-") as cwd:
+            dims = prepare(cwd, combos)
+            for name in stages:
+                row = run_stage(name, cwd, repeat)
+                row.update(scale=combos, **dims)
+                rows.append(row)
+                if row["ok"]:
+                    log(f"{name:24} {combos:>9} combos  {row['wall_s']:8.3f}s  "
+                        f"{row['peak_rss_kb'] / 1024:8.1f} MB  {row['output_bytes']:>12} B")
+                else:
+                    log(f"{name:24} {combos:>9} combos  FAILED: {row['error'].splitlines()[-1:]}")
+    return rows
+
+
+def environment():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS,
+                             capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        rev = None
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "git_rev": rev, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+
+
+def compare(rows, baseline_rows, threshold):
+    """Regressions as ``(stage, scale, metric, old, new)`` tuples."""
+    old = {(r["stage"], r["scale"]): r for r in baseline_rows if r.get("ok")}
+    found = []
+    for r in rows:
+        prev = old.get((r["stage"], r["scale"]))
+        if not prev:
+            continue
+        if not r.get("ok"):
+            found.append((r["stage"], r["scale"], "ok", True, False))
+            continue
+        for metric in ("wall_s", "peak_rss_kb", "output_bytes"):
+            if prev[metric] and r[metric] > prev[metric] * (1 + threshold):
+                found.append((r["stage"], r["scale"], metric, prev[metric], r[metric]))
+    return found
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                    help="comma separated config combination counts (up to ~1000000)")
+    ap.add_argument("--stages", default=",".join(STAGES))
+    ap.add_argument("--repeat", type=int, default=3, help="runs per stage; the fastest counts")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--baseline", help="earlier results file to compare against")
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="allowed relative growth before a metric counts as a regression")
+    args = ap.parse_args()
+
+    scales = [int(s.replace("_", "")) for s in args.scales.split(",") if s]
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stages: {sorted(unknown)}")
+
+    rows = run(scales, stages, args.repeat)
+    with open(args.out, "w") as f:
+        json.dump({"environment": environment(), "results": rows}, f, indent=2)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(rows, json.load(f)["results"], args.threshold)
+        for stage, scale, metric, before, after in regressions:
+            print(f"REGRESSION {stage} @ {scale}: {metric} {before} → {after}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Fixed-width, memory-mappable variant catalog.
+
+One file, little-endian, every section 8-byte aligned and stored as a flat
+column so readers can ``mmap`` it and view each column with
+``memoryview.cast`` — nothing is parsed or copied at open time::
+
+    header   magic "DLVC", version, dims, variant count, id count, section offsets
+    ids      u64[n_ids]          numeric metaobject ids, sorted
+    labels   u32[n_ids][2]       (offset, length) of each id's label in the pool
+    price    u32[n]              cents
+    grams    u32[n]
+    title    u32[n][2]           (offset, length) in the pool
+    refs     u32[n][dims]        positions in ``ids``
+    config   u64[n]              numeric mft_configuration id, 0 if not created yet
+    order    u32[n]              variant positions sorted by ``refs``
+    pool     utf-8 strings
+
+Lookups are binary searches over the mapped columns::
+
+    cat = VariantCatalog("variants.dlvc")
+    i = cat.find(("gid://shopify/Metaobject/1", ...))
+    cat.price(i), cat.grams(i), cat.title(i)
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from .instrument import count_file, timed
+
+MAGIC = b"DLVC"
+VERSION = 1
+GID_PREFIX = "gid://shopify/Metaobject/"
+
+SECTIONS = ("ids", "labels", "price", "grams", "title", "refs", "config", "order", "pool")
+HEADER = struct.Struct("<4sHHII" + "Q" * len(SECTIONS))
+
+
+def gid_number(gid):
+    return int(gid.rpartition("/")[2])
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _bytes(arr):
+    if sys.byteorder != "little" and arr.itemsize > 1:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+@timed("write binary catalog")
+def write_catalog(path, rows, labels=None):
+    """Write ``rows`` of ``(refs, cents, grams, title, config_gid)``; returns the count.
+
+    ``refs`` are metaobject gids (same length for every row), ``labels`` an
+    optional ``{gid: label}`` for the id table.
+    """
+    labels = labels or {}
+    pool, seen = bytearray(), {}
+
+    def intern(text):
+        data = text.encode("utf-8")
+        pos = seen.get(data)
+        if pos is None:
+            pos = seen[data] = len(pool)
+            pool.extend(data)
+        return pos, len(data)
+
+    price, grams, title, config = array("I"), array("I"), array("I"), array("Q")
+    raw_refs, dims = [], None
+    for refs, cents, g, name, config_gid in rows:
+        if dims is None:
+            dims = len(refs)
+        elif len(refs) != dims:
+            raise ValueError(f"variant {name!r} has {len(refs)} refs, expected {dims}")
+        raw_refs.append(tuple(gid_number(r) for r in refs))
+        price.append(cents)
+        grams.append(g)
+        title.extend(intern(name))
+        config.append(gid_number(config_gid) if config_gid else 0)
+    dims = dims or 0
+
+    label_of = {gid_number(k): v for k, v in labels.items()}
+    ids = array("Q", sorted({n for refs in raw_refs for n in refs}))
+    position = {n: i for i, n in enumerate(ids)}
+    id_labels = array("I")
+    for n in ids:
+        id_labels.extend(intern(label_of.get(n, "")))
+    refs = array("I", (position[n] for r in raw_refs for n in r))
+    order = array("I", sorted(range(len(raw_refs)), key=lambda i: [position[n] for n in raw_refs[i]]))
+
+    blobs = [_bytes(ids), _bytes(id_labels), _bytes(price), _bytes(grams), _bytes(title),
+             _bytes(refs), _bytes(config), _bytes(order), bytes(pool)]
+    offsets, pos = [], _align(HEADER.size)
+    for blob in blobs:
+        offsets.append(pos)
+        pos = _align(pos + len(blob))
+    with open(path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, VERSION, dims, len(price), len(ids), *offsets))
+        for off, blob in zip(offsets, blobs):
+            out.write(b"\0" * (off - out.tell()))
+            out.write(blob)
+    count_file(path)
+    return len(price)
+
+
+class VariantCatalog:
+    """Read-only view of a catalog file; columns are ``memoryview``s over the mapping."""
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise OSError("VariantCatalog maps little-endian columns directly")
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.dims, self.size, n_ids, *offsets = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} variant catalog")
+        buf = memoryview(self._map)
+        sec = dict(zip(SECTIONS, offsets))
+        n, d = self.size, self.dims
+
+        def col(name, fmt, count):
+            size = struct.calcsize(fmt) * count
+            return buf[sec[name]:sec[name] + size].cast(fmt)
+
+        self.ids = col("ids", "Q", n_ids)
+        self.labels = col("labels", "I", 2 * n_ids)
+        self.prices = col("price", "I", n)
+        self.weights = col("grams", "I", n)
+        self.titles = col("title", "I", 2 * n)
+        self.refs_col = col("refs", "I", n * d)
+        self.configs = col("config", "Q", n)
+        self.order = col("order", "I", n)
+        self.pool = buf[sec["pool"]:]
+
+    def close(self):
+        for name in ("ids", "labels", "prices", "weights", "titles",
+                     "refs_col", "configs", "order", "pool"):
+            getattr(self, name).release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    def _string(self, column, i):
+        off, length = column[2 * i], column[2 * i + 1]
+        return str(self.pool[off:off + length], "utf-8")
+
+    def price(self, i):
+        return self.prices[i]
+
+    def grams(self, i):
+        return self.weights[i]
+
+    def title(self, i):
+        return self._string(self.titles, i)
+
+    def id_position(self, gid):
+        """Position of ``gid`` in the sorted id table, or -1."""
+        n = gid_number(gid)
+        lo, hi = 0, len(self.ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ids[mid] < n:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self.ids) and self.ids[lo] == n else -1
+
+    def label(self, gid):
+        pos = self.id_position(gid)
+        return self._string(self.labels, pos) if pos >= 0 else None
+
+    def refs(self, i):
+        d = self.dims
+        return tuple(f"{GID_PREFIX}{self.ids[p]}" for p in self.refs_col[i * d:(i + 1) * d])
+
+    def config_id(self, i):
+        n = self.configs[i]
+        return f"{GID_PREFIX}{n}" if n else None
+
+    def find(self, refs):
+        """Variant position for a tuple of metaobject gids, or -1."""
+        key = [self.id_position(r) for r in refs]
+        if -1 in key or len(key) != self.dims:
+            return -1
+        d, lo, hi = self.dims, 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = self.order[mid]
+            if list(self.refs_col[i * d:(i + 1) * d]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.size:
+            i = self.order[lo]
+            if list(self.refs_col[i * d:(i + 1) * d]) == key:
+                return i
+        return -1
@@ -0,0 +1,279 @@
+"""Create configs / variants through Shopify bulk mutations instead of inline payloads.
+
+One run is::
+
+    JSONL variables file ─ stagedUploadsCreate ─ multipart upload
+        ─ bulkOperationRunMutation ─ poll node(id) until finished
+        ─ download result JSONL ─ id mapping (+ journal)
+
+Each input line is one set of variables for a single-mutation document, so
+thousands of configs or variants go through one operation that Shopify runs
+server-side, instead of aliased mutations under the query cost limit.  The
+result JSONL is read line by line; ``__lineNumber`` points back at the input
+line, which gives the alias (configs) or title (variants) of every outcome.
+
+The mapping is written in the same shape as the inline responses —
+``{"data": {"conf_001": {"metaobject": {"id": ...}}}}`` for configs, one
+merged ``productVariantsBulkCreate`` payload for variants — so step 2, the
+journal and ``python -m catalog check`` take it unchanged.
+
+``catalog.fakeadmin`` implements the whole sequence for offline runs::
+
+    python -m catalog.fakeadmin --port 8787
+    python -m catalog bulk configs metaobjects.json --url http://127.0.0.1:8787/graphql.json
+"""
+import asyncio
+import json
+import os
+import sys
+import uuid
+from urllib.parse import urlsplit
+
+from .adminapi import AdminClient, ConnectionPool, user_errors
+from .instrument import count, count_file, stage
+from .jsonl import dumps_line, write_jsonl
+
+# ——— DEFAULTS ———
+POLL_INTERVAL = 1.0    # seconds before the first status check
+POLL_MAX      = 15.0   # the interval grows ×1.5 up to this
+POLL_TIMEOUT  = 6 * 3600
+# ————————
+
+FINISHED = {"COMPLETED", "FAILED", "CANCELED", "EXPIRED"}
+
+CONFIG_MUTATION = """
+mutation CreateConfiguration($metaobject: MetaobjectCreateInput!) {
+  metaobjectCreate(metaobject: $metaobject) {
+    metaobject { id }
+    userErrors { field message }
+  }
+}
+""".strip()
+
+VARIANT_MUTATION = """
+mutation ProductVariantsCreate($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
+  productVariantsBulkCreate(productId: $productId, variants: $variants) {
+    productVariants { id title }
+    userErrors { field message }
+  }
+}
+""".strip()
+
+STAGED_UPLOAD_MUTATION = """
+mutation StageBulkVariables($input: [StagedUploadInput!]!) {
+  stagedUploadsCreate(input: $input) {
+    stagedTargets { url resourceUrl parameters { name value } }
+    userErrors { field message }
+  }
+}
+""".strip()
+
+RUN_MUTATION = """
+mutation RunBulkMutation($mutation: String!, $stagedUploadPath: String!) {
+  bulkOperationRunMutation(mutation: $mutation, stagedUploadPath: $stagedUploadPath) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}
+""".strip()
+
+POLL_QUERY = """
+query BulkOperationStatus($id: ID!) {
+  node(id: $id) {
+    ... on BulkOperation { id status errorCode objectCount fileSize url partialDataUrl }
+  }
+}
+""".strip()
+
+
+class BulkError(RuntimeError):
+    """The bulk operation could not be started or did not complete."""
+
+
+def config_line(definition, refs):
+    return {"metaobject": {"type": definition,
+                           "fields": [{"key": "configurations", "value": json.dumps(list(refs))}]}}
+
+
+def variant_title(line):
+    return line["variants"][0]["optionValues"][0]["name"]
+
+
+def multipart(fields, filename, content, content_type="text/jsonl"):
+    """``(body, content type header)`` for a form upload with the file last."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields:
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                     f"{value}\r\n".encode("utf-8"))
+    parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+                 f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'.encode("utf-8"))
+    parts.append(content)
+    parts.append(f"\r\n--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+async def _http(method, url, body=b"", headers=None):
+    parts = urlsplit(url)
+    pool = ConnectionPool(url, size=1)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    try:
+        return await pool.request(body, headers or {}, method, path)
+    finally:
+        pool.close()
+
+
+def _check(resp, field):
+    if resp.get("errors"):
+        raise BulkError("; ".join(e.get("message", "") for e in resp["errors"]))
+    errs = user_errors(resp)
+    if errs:
+        raise BulkError(f"{field}: " + "; ".join(e.get("message", "") for e in errs))
+    return resp["data"][field]
+
+
+async def stage_upload(client, jsonl_path):
+    """Upload ``jsonl_path`` to a staged target; returns the ``stagedUploadPath``."""
+    filename = os.path.basename(jsonl_path)
+    resp = await client.execute(STAGED_UPLOAD_MUTATION, {"input": [{
+        "resource": "BULK_MUTATION_VARIABLES", "filename": filename,
+        "mimeType": "text/jsonl", "httpMethod": "POST"}]})
+    target = _check(resp, "stagedUploadsCreate")["stagedTargets"][0]
+    params = [(p["name"], p["value"]) for p in target["parameters"]]
+    with open(jsonl_path, "rb") as f:
+        body, content_type = multipart(params, filename, f.read())
+    with stage("upload", bytes=len(body)):
+        status, _, payload = await _http("POST", target["url"], body,
+                                         {"Content-Type": content_type})
+    if status not in (200, 201, 204):
+        raise BulkError(f"staged upload failed: HTTP {status} {payload[:200]!r}")
+    count("bytes uploaded", len(body))
+    return dict(params)["key"]
+
+
+async def run_mutation(client, mutation, jsonl_path, poll_interval=POLL_INTERVAL,
+                       timeout=POLL_TIMEOUT, on_status=None):
+    """Stage, start and poll one bulk mutation; returns the finished ``BulkOperation``."""
+    staged_path = await stage_upload(client, jsonl_path)
+    resp = await client.execute(RUN_MUTATION, {"mutation": mutation,
+                                               "stagedUploadPath": staged_path})
+    op = _check(resp, "bulkOperationRunMutation")["bulkOperation"]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    interval = poll_interval
+    with stage("bulk operation", id=op["id"]):
+        while op["status"] not in FINISHED:
+            if loop.time() > deadline:
+                raise BulkError(f"{op['id']} still {op['status']} after {timeout}s")
+            await asyncio.sleep(interval)
+            interval = min(POLL_MAX, interval * 1.5)
+            resp = await client.execute(POLL_QUERY, {"id": op["id"]})
+            if resp.get("errors"):
+                raise BulkError("; ".join(e.get("message", "") for e in resp["errors"]))
+            op = resp["data"]["node"]
+            if on_status:
+                on_status(op)
+    return op
+
+
+async def download(url, dest):
+    """Save the result JSONL of a finished operation to ``dest``."""
+    with stage("download"):
+        status, _, payload = await _http("GET", url)
+    if status != 200:
+        raise BulkError(f"result download failed: HTTP {status}")
+    with open(dest, "wb") as f:
+        f.write(payload)
+    count_file(dest, "bytes downloaded")
+    return dest
+
+
+def result_lines(path):
+    """``(line number, data, errors)`` per result line, streamed from disk."""
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            if raw.strip():
+                line = json.loads(raw)
+                yield line.get("__lineNumber"), line.get("data") or {}, line.get("errors") or []
+
+
+async def _run(url, token, mutation, jsonl_path, results_path, poll_interval):
+    async with AdminClient(url, token) as client:
+        op = await run_mutation(client, mutation, jsonl_path, poll_interval,
+                                on_status=lambda op: print(
+                                    f"{op['id']}: {op['status']} ({op.get('objectCount') or 0} objects)",
+                                    file=sys.stderr))
+    # FAILED operations can still carry results for the lines that ran
+    result_url = op.get("url") or op.get("partialDataUrl")
+    if op["status"] != "COMPLETED" and not result_url:
+        raise BulkError(f"{op['id']} {op['status']}: {op.get('errorCode')}")
+    if result_url:
+        await download(result_url, results_path)
+    else:  # nothing was created (empty input)
+        open(results_path, "w").close()
+    return op
+
+
+def bulk_configs(url, token, definition, aliased_refs, out_path, journal=None,
+                 workdir=".", poll_interval=POLL_INTERVAL):
+    """Create ``[(alias, refs)]`` in one bulk operation; returns the configs response.
+
+    Aliases without a result line are reported as missing; with ``journal``
+    every outcome is recorded as it is read.
+    """
+    aliased_refs = list(aliased_refs)  # __lineNumber → alias
+    jsonl_path = os.path.join(workdir, "bulk_configs.jsonl")
+    results_path = os.path.join(workdir, "bulk_configs.results.jsonl")
+    write_jsonl((config_line(definition, refs) for _, refs in aliased_refs), jsonl_path)
+    op = asyncio.run(_run(url, token, CONFIG_MUTATION, jsonl_path, results_path, poll_interval))
+
+    data = {}
+    for n, result, errors in result_lines(results_path):
+        alias = aliased_refs[n][0]
+        created = result.get("metaobjectCreate") or {}
+        if errors:
+            created = {"metaobject": None,
+                       "userErrors": [{"message": e.get("message", "")} for e in errors]}
+        data[alias] = created
+    resp = {"data": data, "extensions": {"bulkOperation": op}}
+    if journal is not None:
+        journal.record_config_response(resp, dict(aliased_refs))
+    with open(out_path, "w") as out:
+        json.dump(resp, out, indent=2, ensure_ascii=False)
+    return resp
+
+
+def bulk_variants(url, token, lines, out_path, journal=None, workdir=".",
+                  poll_interval=POLL_INTERVAL):
+    """Create variants from ``bulk_variant_lines`` output; returns the merged response.
+
+    ``None`` when ``lines`` is empty (nothing is sent).
+    """
+    jsonl_path = os.path.join(workdir, "bulk_variants.jsonl")
+    results_path = os.path.join(workdir, "bulk_variants.results.jsonl")
+    titles = []
+    with open(jsonl_path, "w", encoding="utf-8") as out:
+        for line in lines:
+            titles.append(variant_title(line))
+            out.write(dumps_line(line) + "\n")
+    if not titles:
+        return None
+    op = asyncio.run(_run(url, token, VARIANT_MUTATION, jsonl_path, results_path, poll_interval))
+
+    created, errors = [], []
+    for n, result, line_errors in result_lines(results_path):
+        payload = result.get("productVariantsBulkCreate") or {}
+        created += payload.get("productVariants") or []
+        errors += [dict(e, line=n, title=titles[n]) for e in payload.get("userErrors") or []]
+        errors += [{"message": e.get("message", ""), "line": n, "title": titles[n]}
+                   for e in line_errors]
+    resp = {"data": {"productVariantsBulkCreate": {"productVariants": created,
+                                                   "userErrors": errors}},
+            "extensions": {"bulkOperation": op}}
+    if journal is not None:
+        journal.record_variant_response(resp, titles)
+    with open(out_path, "w") as out:
+        json.dump(resp, out, indent=2, ensure_ascii=False)
+    return resp
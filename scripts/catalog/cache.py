@@ -0,0 +1,266 @@
+"""Content-addressed cache for the generated GraphQL and variables files.
+
+Off unless ``CATALOG_CACHE=DIR`` is set or ``python -m catalog --cache DIR``
+is used.  Two levels:
+
+* **runs** — ``cached_run`` keys a whole command on the bytes of its input
+  files, its parameters (product / option ids, definition handle, range),
+  ``GENERATOR_VERSION`` and the source of this package.  On a hit every
+  output is restored from the store and nothing is parsed or rendered.
+* **shards** — every file written through ``write_text`` (each
+  ``create_configs_NNN.graphql`` batch, each ``variables/<handle>.json``) is
+  stored by the SHA-256 of its content and only rewritten when that content
+  changed, so a changed option value touches just the shards it appears in
+  and the other files keep their bytes and mtimes.
+
+Layout::
+
+    DIR/objects/ab/abcdef...    file contents, named by their SHA-256
+    DIR/runs/<key>.json         {"outputs": {path: sha256}, ...}
+
+Entries are evicted least-recently-used first (hits refresh the mtime) once
+the store is larger than ``MAX_BYTES``::
+
+    CATALOG_CACHE=.catalog-cache python -m catalog configs metaobjects.json
+    python -m catalog cache stats | evict [--max-bytes N] | clear
+"""
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+
+from .instrument import count
+
+# ——— CONFIG ———
+CACHE_ENV = "CATALOG_CACHE"
+MAX_BYTES_ENV = "CATALOG_CACHE_MAX_BYTES"
+MAX_BYTES = 256 * 1024 * 1024
+# bump when the generators change their output for the same inputs
+GENERATOR_VERSION = 1
+# ————————
+
+_cache = None
+_configured = False
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_digest():
+    """Digest of this package's modules — a code change invalidates every run."""
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class ArtifactCache:
+    def __init__(self, root, max_bytes=MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._outputs = None      # {path: sha256} of the run being recorded
+        self._source = None
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "runs"), exist_ok=True)
+
+    # ——— objects ———
+
+    def _object(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _put(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object(digest)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return digest
+
+    def _materialize(self, path, digest):
+        """Copy object ``digest`` to ``path`` unless it already holds it; True if written."""
+        src = self._object(digest)
+        if (os.path.exists(path) and os.path.getsize(path) == os.path.getsize(src)
+                and _sha256_file(path) == digest):
+            count("outputs unchanged")
+            return False
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(src, "rb") as f:
+            data = f.read()
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        os.utime(src)
+        count("outputs written")
+        return True
+
+    def write(self, path, data):
+        digest = self._put(data)
+        if self._outputs is not None:
+            self._outputs[path] = digest
+        return self._materialize(path, digest)
+
+    def track(self, path):
+        """Store a file some other writer produced as an output of the current run."""
+        if self._outputs is not None and os.path.exists(path):
+            with open(path, "rb") as f:
+                self._outputs[path] = self._put(f.read())
+
+    # ——— runs ———
+
+    def key(self, command, inputs=(), params=None):
+        if self._source is None:
+            self._source = _source_digest()
+        h = hashlib.sha256()
+        h.update(json.dumps({"command": command, "version": GENERATOR_VERSION,
+                             "source": self._source, "cwd": os.getcwd(),
+                             "params": params or {}}, sort_keys=True).encode())
+        for path in inputs:
+            h.update(path.encode())
+            h.update(_sha256_file(path).encode())
+        return h.hexdigest()
+
+    def _run_path(self, key):
+        return os.path.join(self.root, "runs", f"{key}.json")
+
+    def lookup(self, key):
+        """``{path: sha256}`` of a recorded run whose objects are all still there."""
+        path = self._run_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                outputs = json.load(f)["outputs"]
+        except (OSError, ValueError, KeyError):
+            return None
+        if not all(os.path.exists(self._object(d)) for d in outputs.values()):
+            os.remove(path)   # partly evicted
+            return None
+        os.utime(path)
+        return outputs
+
+    def restore(self, outputs):
+        return sum(self._materialize(p, d) for p, d in outputs.items())
+
+    def begin(self):
+        self._outputs = {}
+
+    def commit(self, key, command):
+        outputs, self._outputs = self._outputs, None
+        with open(self._run_path(key), "w", encoding="utf-8") as f:
+            json.dump({"command": command, "created": time.time(), "outputs": outputs}, f,
+                      indent=2)
+        self.evict()
+        return outputs
+
+    def abort(self):
+        self._outputs = None
+
+    # ——— size ———
+
+    def entries(self):
+        """``(mtime, size, path)`` of every object and run file."""
+        out = []
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                p = os.path.join(dirpath, name)
+                st = os.stat(p)
+                out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def evict(self, max_bytes=None):
+        """Delete least-recently-used files until the store fits; returns bytes freed."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total - freed <= max_bytes:
+                break
+            os.remove(path)
+            freed += size
+        if freed:
+            count("cache bytes evicted", freed)
+        return freed
+
+    def stats(self):
+        entries = self.entries()
+        runs = [e for e in entries if os.sep + "runs" + os.sep in e[2]]
+        return {"root": self.root, "bytes": sum(s for _, s, _ in entries),
+                "max_bytes": self.max_bytes, "runs": len(runs),
+                "objects": len(entries) - len(runs)}
+
+
+def configure(root=None, max_bytes=None):
+    """Use the store at ``root`` (or ``$CATALOG_CACHE``); ``None`` leaves caching off."""
+    global _cache, _configured
+    _configured = True
+    root = root or os.environ.get(CACHE_ENV)
+    if not root:
+        return _cache
+    max_bytes = max_bytes or int(os.environ.get(MAX_BYTES_ENV, MAX_BYTES))
+    _cache = ArtifactCache(root, max_bytes)
+    return _cache
+
+
+def active():
+    if not _configured:
+        configure()
+    return _cache
+
+
+def write_text(path, text):
+    """Write ``text`` to ``path`` through the store if caching is on; True if the file changed."""
+    cache = active()
+    if cache is None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return True
+    return cache.write(path, text.encode("utf-8"))
+
+
+def track(path):
+    cache = active()
+    if cache is not None:
+        cache.track(path)
+
+
+def cached_run(command, inputs, params, build, stream=sys.stderr):
+    """Restore the outputs of an identical earlier run, or ``build()`` and record them.
+
+    Returns ``True`` on a hit.  Without a cache ``build()`` just runs.
+    """
+    cache = active()
+    if cache is None:
+        build()
+        return False
+    key = cache.key(command, inputs, params)
+    outputs = cache.lookup(key)
+    if outputs is not None:
+        written = cache.restore(outputs)
+        count("cache hits")
+        print(f"[cache] {command}: inputs unchanged, {len(outputs)} outputs restored "
+              f"({written} rewritten)", file=stream)
+        return True
+    count("cache misses")
+    cache.begin()
+    try:
+        build()
+    except BaseException:
+        cache.abort()
+        raise
+    cache.commit(key, command)
+    return False
@@ -0,0 +1,508 @@
+"""One entry point for the generators: ``python -m catalog <command> ...``.
+
+::
+
+    python -m catalog fetch --url URL [--out-dir .] [--only metaobjects,live]
+    python -m catalog values [--var-dir variables]
+    python -m catalog configs metaobjects.json [--range 17:40] [--journal J] [responses ...]
+    python -m catalog configs metaobjects.json --params + send create_configs.manifest.json --url URL
+    python -m catalog variants metaobjects.json configs_001.json ... [--jsonl variants.jsonl.gz]
+    python -m catalog variants metaobjects.json configs_001.json --lookup lookup.json --variant-ids live_state.json
+    python -m catalog variants --values configuration_value.json --options configuration_option.json
+    python -m catalog bulk configs metaobjects.json --url URL [--journal J]
+    python -m catalog bulk variants metaobjects.json bulk_configs_response.json --url URL
+    python -m catalog feed metaobjects.json --base-url URL [--variant-ids J] [--format csv]
+    python -m catalog sync live_state.json metaobjects.json [sync_configs_001.json ...] [--page live_state_2.json] [--prune-configs]
+    python -m catalog check metaobjects.json configs_001.json ...
+    python -m catalog --cache .catalog-cache cache stats|evict|clear
+
+Options may come before or after the file arguments; ``--time`` reports a
+command's wall time, and ``--trace trace.json`` anywhere in the line (or
+``CATALOG_TRACE``) records per-stage timers, counters and a Chrome trace (see
+``catalog.instrument``); ``--cache DIR`` (or ``CATALOG_CACHE``) restores the
+outputs of ``values``, ``configs`` and ``variants`` when their inputs are
+unchanged (see ``catalog.cache``).  Commands can be chained with ``+`` to run in one
+process, e.g. ``configs metaobjects.json + variants metaobjects.json
+configs_001.json``; parsed inputs are cached per process, so the chain parses
+each file once.  Only ``argparse``, ``json`` and the idle ``instrument`` hooks
+load up front — every command imports the modules it needs when it runs, so
+``check`` starts in milliseconds.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+DEFAULT_PRODUCT_ID = "gid://shopify/Product/15391530385753"
+DEFAULT_OPTION_ID = "gid://shopify/ProductOption/17750055289177"
+# option of the configuration-value variants (generate_product-varients.py)
+VALUES_OPTION_ID = "gid://shopify/ProductOption/17751741202777"
+
+_cache = {}
+
+
+def _cached(kind, path, load):
+    key = (kind, os.path.realpath(path), os.stat(path).st_mtime_ns)
+    if key not in _cache:
+        _cache[key] = load(path)
+    return _cache[key]
+
+
+def load_json(path):
+    def load(p):
+        from .instrument import stage
+        with stage("parse", file=p), open(p, encoding="utf-8") as f:
+            return json.load(f)
+    return _cached("json", path, load)
+
+
+def load_options(path):
+    from .metaobjects import Catalog
+    from .workflow import decode_options
+    return _cached("options", path,
+                   lambda p: decode_options(Catalog.from_metaobjects(load_json(p)["data"])))
+
+
+def merged(paths):
+    from .batching import merge_responses
+    return merge_responses(load_json(p) for p in paths)
+
+
+def _product(args):
+    from .pipeline import Product
+    return Product(args.product_id, args.option_id, args.definition)
+
+
+# ——— commands ———
+
+def _cached_run(args, inputs, build):
+    """Run ``build`` through ``catalog.cache`` when the outputs depend only on ``inputs`` + args.
+
+    Journal runs (state outside the inputs), the extra tables and stdout
+    output are always generated.
+    """
+    if (getattr(args, "journal", None) or getattr(args, "stdout", False)
+            or any(getattr(args, k, None) for k in ("prices", "map", "bin", "lookup"))):
+        return build()
+    from .cache import cached_run
+    params = {k: v for k, v in vars(args).items() if k not in ("run", "time", "command")}
+    cached_run(args.command, inputs, params, build)
+
+
+def cmd_values(args):
+    from .values import write_values
+    # the entries are constants of catalog/values.py, covered by the source digest
+    _cached_run(args, [], lambda: write_values(args.gql, args.var_dir))
+
+
+def cmd_configs(args):
+    from . import pipeline
+
+    def build():
+        options = load_options(args.metaobjects)
+        _extras(args, options, args.responses)
+        if args.journal:
+            from .journal import Journal
+            with Journal(args.journal) as journal:
+                pipeline.record_responses(options, journal, args.responses)
+                pipeline.make_config_mutation(options, args.definition, args.range, journal,
+                                          args.params)
+        else:
+            pipeline.make_config_mutation(options, args.definition, args.range, params=args.params)
+    _cached_run(args, [args.metaobjects, *args.responses], build)
+
+
+def cmd_variants(args):
+    if args.option_id is None:
+        args.option_id = VALUES_OPTION_ID if args.values else DEFAULT_OPTION_ID
+    if args.values:
+        return _cached_run(args, [args.values, args.options], lambda: _product_variants(args))
+    if not args.metaobjects or not args.responses:
+        raise SystemExit("variants: metaobjects.json and at least one configs response are required "
+                         "(or --values/--options)")
+    from . import pipeline
+    args.stdout = not args.jsonl
+
+    def build():
+        options = load_options(args.metaobjects)
+        _extras(args, options, args.responses)
+        if args.journal:
+            from .journal import Journal
+            with Journal(args.journal) as journal:
+                pipeline.record_responses(options, journal, args.responses)
+                pipeline.make_resumable_variants(options, _product(args), journal, args.jsonl,
+                                                 args.range)
+        else:
+            pipeline.make_variant_mutation(options, _product(args), merged(args.responses),
+                                           args.jsonl, args.range)
+    _cached_run(args, [args.metaobjects, *args.responses], build)
+
+
+def _product_variants(args):
+    from .product_variants import write_files
+    write_files(load_json(args.values), load_json(args.options), args.product_id, args.option_id,
+                args.jsonl or "product_variants.jsonl", log=print if args.verbose else None)
+
+
+def cmd_send(args):
+    import asyncio
+    from .runner import send_config_batches
+    if not args.url:
+        raise SystemExit("send: --url or SHOPIFY_ADMIN_URL is required")
+    summary = asyncio.run(send_config_batches(args.url, args.token, args.manifest, args.out_prefix,
+                                              args.concurrency))
+    print(f"Sent {summary['sent']} batches: {summary['ok']} ok, {summary['user_errors']} with "
+          f"userErrors, {summary['failed']} failed, {summary['retries']} retries", file=sys.stderr)
+    for r in summary["results"]:
+        if r["status"] == "failed":
+            print(f"  {r['name']}: {r['error']}", file=sys.stderr)
+    if summary["failed"]:
+        raise SystemExit(1)
+
+
+def cmd_cache(args):
+    from . import cache
+    store = cache.active()
+    if store is None:
+        raise SystemExit("cache: no store; pass --cache DIR or set CATALOG_CACHE")
+    if args.action == "clear":
+        freed = store.evict(0)
+        print(f"{store.root}: removed {freed} bytes")
+    elif args.action == "evict":
+        freed = store.evict(args.max_bytes)
+        print(f"{store.root}: evicted {freed} bytes")
+    else:
+        print(json.dumps(store.stats(), indent=2))
+
+
+def cmd_bulk(args):
+    from . import pipeline
+    if not args.url:
+        raise SystemExit("bulk: --url or SHOPIFY_ADMIN_URL is required")
+    options = load_options(args.metaobjects)
+    out = args.out or f"bulk_{args.kind}_response.json"
+    journal = None
+    if args.journal:
+        from .journal import Journal
+        journal = Journal(args.journal)
+    try:
+        if journal:
+            pipeline.record_responses(options, journal, args.responses)
+        if args.kind == "configs":
+            pipeline.make_bulk_configs(options, args.definition, args.url, args.token, out,
+                                       journal, args.range)
+        elif journal or args.responses:
+            pipeline.make_bulk_variants(options, _product(args),
+                                        merged(args.responses) if args.responses else None,
+                                        args.url, args.token, out, journal, args.range)
+        else:
+            raise SystemExit("bulk variants: configs responses or --journal are required")
+    finally:
+        if journal:
+            journal.close()
+
+
+def cmd_fetch(args):
+    import asyncio
+    from . import fetch
+    if not args.url:
+        raise SystemExit("fetch: --url or SHOPIFY_ADMIN_URL is required")
+    targets = args.only.split(",") if args.only else fetch.TARGETS
+    unknown = set(targets) - set(fetch.TARGETS)
+    if unknown:
+        raise SystemExit(f"fetch: unknown target(s) {', '.join(sorted(unknown))}; "
+                         f"expected {', '.join(fetch.TARGETS)}")
+    asyncio.run(fetch.fetch_all(args.url, args.token, args.product_id, args.out_dir, targets,
+                                args.pool_size, args.definition, args.page_size))
+
+
+def cmd_feed(args):
+    from . import pipeline
+    from .feed import MAX_BYTES, MAX_ITEMS, Site
+    if not args.base_url:
+        raise SystemExit("feed: --base-url or SHOPIFY_STORE_URL is required")
+    site = Site(args.base_url, args.handle)
+    variants_resp = load_json(args.variant_ids) if args.variant_ids else None
+    limits = dict(sitemap=not args.no_sitemap, max_bytes=args.max_bytes or MAX_BYTES,
+                  max_items=args.max_items or MAX_ITEMS)
+    if args.values:
+        pipeline.make_value_feed(load_json(args.values), load_json(args.options), args.out_dir,
+                                 site, args.format, variants_resp, **limits)
+    elif args.metaobjects:
+        from .metaobjects import Catalog
+        cat = Catalog.from_metaobjects(load_json(args.metaobjects)["data"])
+        pipeline.make_feed(load_options(args.metaobjects), cat, args.out_dir, site,
+                           args.format, variants_resp, **limits)
+    else:
+        raise SystemExit("feed: metaobjects.json or --values/--options is required")
+
+
+def cmd_sync(args):
+    from . import pipeline
+    from .sync import TruncatedLiveState
+    options = load_options(args.metaobjects)
+    pages = [load_json(p) for p in [args.live] + (args.page or [])]
+    try:
+        pipeline.make_sync_plan(options, _product(args), pages, merged(args.responses),
+                                args.prune_configs)
+    except TruncatedLiveState as exc:
+        raise SystemExit(f"sync: live state is incomplete: {exc}")
+
+
+def _extras(args, options, responses):
+    from . import pipeline
+    if args.prices:
+        pipeline.make_price_table(options, args.prices)
+    if args.map:
+        pipeline.make_variant_map(options, args.map)
+    if args.bin:
+        pipeline.make_binary_catalog(options, args.bin, merged(responses) if responses else None)
+    if args.lookup:
+        pipeline.make_lookup_index(options, args.lookup,
+                                   load_json(args.variant_ids) if args.variant_ids else None)
+
+
+def describe(doc):
+    """One line about what kind of export/response ``doc`` is, or raise ``ValueError``."""
+    if isinstance(doc, dict) and "products" in doc and "catalog" in doc:
+        return f"products manifest, {len(doc['products'])} products"
+    if isinstance(doc, dict) and "batches" in doc and "total_aliases" in doc:
+        return f"batch manifest, {doc['total_aliases']} aliases in {len(doc['batches'])} batches"
+    if isinstance(doc, dict) and "variant" in doc and "strides" in doc:
+        from .lookup import Lookup
+        Lookup(doc)
+        if any(not 0 <= v < len(doc["ids"]) for v in doc["variant"]):
+            raise ValueError("variant entry outside the variant table")
+        return (f"lookup index, {len(doc['variant'])} selections ➞ {len(doc['ids'])} variants, "
+                f"{sum(i is None for i in doc['ids'])} without id")
+    data = doc.get("data") if isinstance(doc, dict) else None
+    if not isinstance(data, dict):
+        raise ValueError("no top-level data object")
+    if "metaobjectDefinition" in data:
+        conn = (data["metaobjectDefinition"] or {}).get("metaobjects") or {}
+        edges, nodes = conn.get("edges", []), conn.get("nodes", [])
+        if nodes and len(nodes) != len(edges):
+            raise ValueError(f"{len(edges)} edges but {len(nodes)} nodes")
+        return f"definition export, {len(edges)} metaobjects"
+    groups = [k for k in ("sizeOptions", "printedSides", "hangloopOptions", "packagingOptions")
+              if k in data]
+    if groups:
+        counts = []
+        for g in groups:
+            nodes = [e["node"] for e in data[g].get("edges", [])]
+            for n in nodes:
+                keys = {f["key"] for f in n.get("fields", [])}
+                if "price" not in keys:
+                    raise ValueError(f"{g}: {n.get('id')} has no price field")
+            counts.append(f"{g}={len(nodes)}")
+        return "metaobjects export, " + ", ".join(counts)
+    aliases = [k for k in data if k.startswith(("conf_", "del_"))]
+    if aliases:
+        failed = [a for a in aliases if not ((data[a] or {}).get("metaobject")
+                                             or (data[a] or {}).get("deletedId"))]
+        return f"configs response, {len(aliases) - len(failed)} ok, {len(failed)} failed"
+    if "productVariantsBulkCreate" in data:
+        payload = data["productVariantsBulkCreate"] or {}
+        return (f"variants response, {len(payload.get('productVariants') or [])} created, "
+                f"{len(payload.get('userErrors') or [])} userErrors")
+    if "product" in data or "configurations" in data:
+        return "live state export"
+    raise ValueError(f"unrecognised data keys {sorted(data)[:5]}")
+
+
+def unit_problems(doc):
+    """Unit/currency mismatches in a metaobjects or definition export."""
+    from . import codecs
+    from .metaobjects import Catalog
+    data = doc.get("data") or {}
+    if "metaobjectDefinition" in data:
+        cat = Catalog.from_definition(data)
+    elif any(g in data for g in ("sizeOptions", "printedSides", "hangloopOptions", "packagingOptions")):
+        cat = Catalog.from_metaobjects(data)
+    else:
+        return []
+    return codecs.unit_problems((r.id, r) for r in cat.records())
+
+
+def cmd_check(args):
+    bad = 0
+    for path in args.files:
+        try:
+            doc = load_json(path)
+            print(f"{path}: {describe(doc)}")
+            problems = unit_problems(doc)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            bad += 1
+            print(f"{path}: INVALID — {exc}")
+            continue
+        bad += bool(problems)
+        for problem in problems:
+            print(f"  unit mismatch: {problem}")
+    if bad:
+        raise SystemExit(1)
+
+
+# ——— parser ———
+
+def build_parsers():
+    """``{command: ArgumentParser}``; each parses intermixed options and files."""
+    parsers = {}
+
+    def command(name, run, help):
+        p = argparse.ArgumentParser(prog=f"python -m catalog {name}", description=help)
+        p.add_argument("--time", action="store_true", help="report the command's wall time")
+        p.set_defaults(run=run, command=name)
+        parsers[name] = p
+        return p
+
+    def product_args(p, option_id=DEFAULT_OPTION_ID):
+        p.add_argument("--product-id", default=DEFAULT_PRODUCT_ID)
+        p.add_argument("--option-id", default=option_id)
+        p.add_argument("--definition", default="mft_configuration")
+
+    def extra_args(p):
+        p.add_argument("--range", help="1-based inclusive slice, e.g. 17:40")
+        p.add_argument("--journal", help="record responses here; resend only what is missing")
+        p.add_argument("--prices", help="also write the tier/reseller price table")
+        p.add_argument("--map", help="also write the selection → variant mapping")
+        p.add_argument("--bin", help="also write the memory-mapped variant catalog")
+        p.add_argument("--lookup", help="also write the studio selection → variant lookup index")
+        p.add_argument("--variant-ids", metavar="JSON",
+                       help="variants response or live-state export with the ids for --lookup")
+
+    p = command("values", cmd_values, "configuration_value entries + create mutation")
+    p.add_argument("--gql", default="create_metaobject.graphql")
+    p.add_argument("--var-dir", default="variables")
+
+    p = command("configs", cmd_configs, "batched mft_configuration create mutations")
+    p.add_argument("metaobjects")
+    p.add_argument("--params", action="store_true",
+                   help="reusable documents with typed variables instead of inlined literals")
+    p.add_argument("responses", nargs="*", help="responses to record with --journal")
+    product_args(p)
+    extra_args(p)
+
+    p = command("variants", cmd_variants, "variant mutation / bulk JSONL")
+    p.add_argument("metaobjects", nargs="?")
+    p.add_argument("responses", nargs="*", help="configs_NNN.json responses")
+    p.add_argument("--jsonl", help="write bulk-operation JSONL instead of printing (.gz ok)")
+    p.add_argument("--values", help="configuration_value.json (configuration-value variants)")
+    p.add_argument("--options", default="configuration_option.json")
+    p.add_argument("--verbose", action="store_true", help="log every value and variant")
+    product_args(p, option_id=None)
+    extra_args(p)
+
+    p = command("bulk", cmd_bulk, "create configs or variants with one bulk mutation each")
+    p.add_argument("kind", choices=("configs", "variants"))
+    p.add_argument("metaobjects")
+    p.add_argument("responses", nargs="*", help="configs responses (inline or bulk) for variants")
+    p.add_argument("--url", default=os.environ.get("SHOPIFY_ADMIN_URL"),
+                   help="Admin GraphQL endpoint (or SHOPIFY_ADMIN_URL)")
+    p.add_argument("--token", default=os.environ.get("SHOPIFY_ADMIN_TOKEN"),
+                   help="Admin API access token (or SHOPIFY_ADMIN_TOKEN)")
+    p.add_argument("--out", help="id mapping in response shape (default bulk_<kind>_response.json)")
+    p.add_argument("--range", help="1-based inclusive slice, e.g. 17:40")
+    p.add_argument("--journal", help="record outcomes; send only what is missing")
+    product_args(p)
+
+    p = command("fetch", cmd_fetch, "page every input export out of the Admin API concurrently")
+    p.add_argument("--url", default=os.environ.get("SHOPIFY_ADMIN_URL"),
+                   help="Admin GraphQL endpoint (or SHOPIFY_ADMIN_URL)")
+    p.add_argument("--token", default=os.environ.get("SHOPIFY_ADMIN_TOKEN"),
+                   help="Admin API access token (or SHOPIFY_ADMIN_TOKEN)")
+    p.add_argument("--out-dir", default=".")
+    p.add_argument("--only", help="comma-separated subset of metaobjects,values,options,live")
+    p.add_argument("--page-size", type=int, default=250)
+    p.add_argument("--pool-size", type=int, default=4, help="concurrent connections")
+    p.add_argument("--product-id", default=DEFAULT_PRODUCT_ID)
+    p.add_argument("--definition", default="mft_configuration")
+
+    p = command("feed", cmd_feed, "gzip merchant feed + variant sitemap, split at size limits")
+    p.add_argument("metaobjects", nargs="?")
+    p.add_argument("--values", help="configuration_value.json (configuration-value variants)")
+    p.add_argument("--options", default="configuration_option.json")
+    p.add_argument("--variant-ids", metavar="JSON",
+                   help="variants response or live-state export with the variant ids")
+    p.add_argument("--base-url", default=os.environ.get("SHOPIFY_STORE_URL"),
+                   help="storefront URL the links point to (or SHOPIFY_STORE_URL)")
+    p.add_argument("--handle", default="customizable-microfiber-towel", help="product handle")
+    p.add_argument("--format", choices=("xml", "csv"), default="xml")
+    p.add_argument("--out-dir", default="feed")
+    p.add_argument("--no-sitemap", action="store_true")
+    p.add_argument("--max-bytes", type=int, help="uncompressed bytes per part (default 50 MiB)")
+    p.add_argument("--max-items", type=int, help="items per part (default 50000)")
+
+    p = command("sync", cmd_sync, "minimal changes against a live_state.graphql export")
+    p.add_argument("live")
+    p.add_argument("metaobjects")
+    p.add_argument("responses", nargs="*", help="sync_configs_NNN.json responses")
+    p.add_argument("--page", action="append",
+                   help="further page of the live-state export, in order (repeatable)")
+    p.add_argument("--prune-configs", action="store_true",
+                   help="also delete stale configs that only reference this product's options")
+    product_args(p)
+
+    p = command("send", cmd_send,
+                "send a configs manifest (literal or --params), one response per batch")
+    p.add_argument("manifest")
+    p.add_argument("--url", default=os.environ.get("SHOPIFY_ADMIN_URL"),
+                   help="Admin GraphQL endpoint (or SHOPIFY_ADMIN_URL)")
+    p.add_argument("--token", default=os.environ.get("SHOPIFY_ADMIN_TOKEN"),
+                   help="Admin API access token (or SHOPIFY_ADMIN_TOKEN)")
+    p.add_argument("--out-prefix", default="configs", help="responses go to <prefix>_NNN.json")
+    p.add_argument("--concurrency", type=int, default=4)
+
+    p = command("cache", cmd_cache, "inspect or shrink the artifact cache (catalog.cache)")
+    p.add_argument("action", choices=("stats", "evict", "clear"))
+    p.add_argument("--max-bytes", type=int, help="evict down to this size (default: the store's limit)")
+
+    p = command("check", cmd_check, "identify and validate export/response files")
+    p.add_argument("files", nargs="+")
+    return parsers
+
+
+def split_chain(argv):
+    chain, current = [], []
+    for arg in argv:
+        if arg == "+":
+            chain.append(current)
+            current = []
+        else:
+            current.append(arg)
+    chain.append(current)
+    return [c for c in chain if c]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parsers = build_parsers()
+    if not argv or argv[0] in ("-h", "--help"):
+        print(__doc__)
+        print("commands: " + ", ".join(parsers))
+        return
+    if "--trace" in argv[:-1]:
+        i = argv.index("--trace")
+        trace_path, argv = argv[i + 1], argv[:i] + argv[i + 2:]
+    else:
+        trace_path = None
+    if "--cache" in argv[:-1]:
+        i = argv.index("--cache")
+        from . import cache
+        cache.configure(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    from .instrument import configure, stage
+    configure(trace_path)
+    for part in split_chain(argv):
+        if part[0] not in parsers:
+            raise SystemExit(f"unknown command {part[0]!r}; expected one of {', '.join(parsers)}")
+        args = parsers[part[0]].parse_intermixed_args(part[1:])
+        start = time.perf_counter()
+        with stage(f"catalog {args.command}", argv=part[1:]):
+            args.run(args)
+        if args.time:
+            print(f"[{args.command}] {time.perf_counter() - start:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
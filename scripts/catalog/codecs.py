@@ -0,0 +1,132 @@
+"""Typed decoders for the JSON-encoded money / weight / dimension field values.
+
+Metaobject fields store these as strings, e.g.
+``{"amount":"5.80","currency_code":"EUR"}`` or ``{"value":120.0,"unit":"GRAMS"}``.
+Every decoder is memoized on the raw string, so each distinct value is parsed
+once per run (the ``fields decoded`` counter of ``catalog.instrument``) and
+equal strings share one immutable result::
+
+    money('{"amount":"5.80","currency_code":"EUR"}')   # Money(Decimal('5.80'), 'EUR', 580)
+    weight('{"value":0.12,"unit":"KILOGRAMS"}').grams   # 120
+    dimension('{"value":40.0,"unit":"CENTIMETERS"}').mm # 400
+
+Units are normalized (cents, grams, millimetres) so sums never mix them;
+``unit_problems`` reports fields whose unit or currency differs from
+``EXPECTED_UNITS`` instead of letting it flow into prices and weights.
+"""
+import json
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+from .instrument import count
+from .pricing import GRAMS_PER_UNIT, price_cents
+
+Money     = namedtuple("Money", "amount currency cents")
+Weight    = namedtuple("Weight", "value unit grams")
+Dimension = namedtuple("Dimension", "value unit mm")
+
+MM_PER_UNIT = {
+    "MILLIMETERS": Decimal(1),
+    "CENTIMETERS": Decimal(10),
+    "METERS":      Decimal(1000),
+    "INCHES":      Decimal("25.4"),
+    "FEET":        Decimal("304.8"),
+}
+
+# unit (currency for money) every catalog field is expected to use
+EXPECTED_UNITS = {
+    "price":  "EUR",
+    "weight": "GRAMS",
+    "width":  "CENTIMETERS",
+    "height": "CENTIMETERS",
+}
+DIMENSION_KEYS = ("width", "height")
+
+
+def _round(value):
+    return int(value.quantize(Decimal(1), ROUND_HALF_UP))
+
+
+def _load(raw, *keys):
+    try:
+        j = json.loads(raw)
+        return [j[k] for k in keys]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError(f"cannot decode {raw!r}: {exc}") from None
+
+
+@lru_cache(maxsize=None)
+def money(raw):
+    count("fields decoded")
+    amount, currency = _load(raw, "amount", "currency_code")
+    amount = Decimal(str(amount))
+    return Money(amount, currency, price_cents(amount))
+
+
+@lru_cache(maxsize=None)
+def weight(raw):
+    count("fields decoded")
+    value, unit = _load(raw, "value", "unit")
+    return weight_of(value, unit)
+
+
+@lru_cache(maxsize=None)
+def weight_of(value, unit="GRAMS"):
+    try:
+        factor = GRAMS_PER_UNIT[unit]
+    except KeyError:
+        raise ValueError(f"unknown weight unit {unit!r}") from None
+    value = Decimal(str(value))
+    return Weight(value, unit, _round(value * factor))
+
+
+@lru_cache(maxsize=None)
+def dimension(raw):
+    count("fields decoded")
+    value, unit = _load(raw, "value", "unit")
+    try:
+        factor = MM_PER_UNIT[unit]
+    except KeyError:
+        raise ValueError(f"unknown dimension unit {unit!r}") from None
+    value = Decimal(str(value))
+    return Dimension(value, unit, _round(value * factor))
+
+
+DECODERS = {"price": money, "weight": weight, "width": dimension, "height": dimension}
+
+
+def decode(key, raw):
+    """Typed value of field ``key``; ``None`` for empty fields and untyped keys."""
+    decoder = DECODERS.get(key)
+    if decoder is None or not raw:
+        return None
+    return decoder(raw)
+
+
+def unit_of(value):
+    return value.currency if isinstance(value, Money) else value.unit
+
+
+def unit_problems(records, expected=EXPECTED_UNITS):
+    """``"<id>: width is MILLIMETERS, expected CENTIMETERS"`` for every mismatch.
+
+    ``records`` yields ``(id, fields)`` pairs where ``fields`` has ``.get(key)``
+    (a ``Record`` or a plain dict).  Undecodable values are reported too.
+    """
+    problems = []
+    for rid, fields in records:
+        for key, want in expected.items():
+            try:
+                value = decode(key, fields.get(key))
+            except ValueError as exc:
+                problems.append(f"{rid}: {key} {exc}")
+                continue
+            if value is not None and unit_of(value) != want:
+                problems.append(f"{rid}: {key} is {unit_of(value)}, expected {want}")
+    return problems
+
+
+def cache_info():
+    """``{decoder: (hits, misses)}`` — misses are the distinct strings parsed."""
+    return {f.__name__: f.cache_info()[:2] for f in (money, weight, weight_of, dimension)}
@@ -0,0 +1,111 @@
+"""Collapse option values into equivalence classes before building variants.
+
+Shopify caps the number of variants per product, so values that differ only
+in something the variant itself does not need to know — e.g. *where* the
+hangloop is sewn, as long as every position costs and weighs the same — are
+folded into one class.  Groups whose value identity matters for fulfilment
+(size, print, packaging) keep one class per value.
+
+The result is the minimal variant space plus a mapping table that resolves an
+exact selection (one metaobject id per group) to its variant and to its
+position in the full configuration space::
+
+    compressed = compress(options, {"hangloopOptions": hangloop_label})
+    compressed.space                 # CombinationSpace over class representatives
+    compressed.resolve(selection)    # → (variant index, config index)
+    compressed.mapping()             # JSON-ready table for the storefront
+"""
+from .instrument import timed
+from .space import CombinationSpace
+
+
+def equivalence_classes(values, key):
+    """``[(key, [members])]`` in order of first appearance."""
+    classes = {}
+    for v in values:
+        classes.setdefault(key(v), []).append(v)
+    return list(classes.items())
+
+
+def price_weight_key(option):
+    return option.cents, option.grams
+
+
+class Compressed:
+    __slots__ = ("groups", "classes", "space", "_class_of", "_config_pos", "_config_strides")
+
+    def __init__(self, groups, classes, config_order):
+        self.groups = tuple(groups)
+        self.classes = classes      # per group: [(representative, [members])]
+        self.space = CombinationSpace(*[[rep for rep, _ in cls] for cls in classes])
+        self._class_of = [{m.id: k for k, (_, members) in enumerate(cls) for m in members}
+                          for cls in classes]
+        # exact selections index the full space in ``config_order``
+        self._config_pos = [{o.id: i for i, o in enumerate(opts)} for opts in config_order]
+        radices = [len(opts) for opts in config_order]
+        strides, stride = [], 1
+        for r in reversed(radices):
+            strides.append(stride)
+            stride *= r
+        self._config_strides = tuple(reversed(strides))
+
+    @property
+    def exact_size(self):
+        size = 1
+        for pos in self._config_pos:
+            size *= len(pos)
+        return size
+
+    def resolve(self, selection):
+        """``(variant index, config index)`` for one metaobject id per group."""
+        if len(selection) != len(self.groups):
+            raise ValueError(f"expected {len(self.groups)} ids, got {len(selection)}")
+        try:
+            digits = [cls[i] for cls, i in zip(self._class_of, selection)]
+            config = sum(pos[i] * s for pos, i, s in
+                         zip(self._config_pos, selection, self._config_strides))
+        except KeyError as exc:
+            raise KeyError(f"{exc.args[0]} is not an option of this product") from None
+        return self.space.rank(digits), config
+
+    def mapping(self):
+        """Per group: classes with their label, price, weight and member ids."""
+        return {
+            "groups": [
+                {"group": g,
+                 "classes": [{"label": rep.label, "cents": rep.cents, "grams": rep.grams,
+                              "members": [m.id for m in members]}
+                             for rep, members in cls]}
+                for g, cls in zip(self.groups, self.classes)
+            ],
+            "variants": len(self.space),
+            "exact_selections": self.exact_size,
+        }
+
+
+@timed("compress")
+def compress(options, labels, config_order=None, key=price_weight_key):
+    """Fold the groups named in ``labels`` into price/weight classes.
+
+    ``labels[group](representative, members)`` names each class; classes of a
+    folded group are ordered by price so free options come first.  Other
+    groups keep one class per value in export order.  ``config_order`` is the
+    per-group option order of the full configuration space (defaults to
+    ``options``).
+    """
+    classes = []
+    for group, opts in options.items():
+        if group not in labels:
+            classes.append([(o, [o]) for o in opts])
+            continue
+        folded = sorted(equivalence_classes(opts, key), key=lambda kv: kv[0])
+        reps = []
+        for _, members in folded:
+            rep = members[0]
+            reps.append((rep._replace(label=labels[group](rep, members)), members))
+        names = [rep.label for rep, _ in reps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"{group}: class labels are not unique: {names}")
+        classes.append(reps)
+    order = config_order or list(options.values())
+    return Compressed(options.keys(), classes, order)
@@ -0,0 +1,133 @@
+"""Per-variant unit prices for every bulk tier and customer class.
+
+The cart discount function applies a quantity tier (4% ≥1000, 8% ≥2000,
+12% ≥4000, 16% ≥7500 pcs) and then, for customers tagged ``reseller``, a
+further 15% (see ``.cursor/rules/tiered-bulk-discount-and-reseller-bonus.mdc``).
+Discounts are applied one after the other, so a reseller at 16% pays
+``0.84 * 0.85`` of the base price.
+
+``write_price_table`` stores the resulting unit prices (integer cents) as a
+packed little-endian ``uint32`` table ``[variant][tier][class]`` plus a JSON
+index; ``PriceTable`` answers ``(variant, quantity, class)`` in O(1)::
+
+    table = PriceTable.load("variant_prices.json")
+    table.unit_cents("40 × 80 cm | Front | No Hangloop | No Bag", 2500, "reseller")
+"""
+import bisect
+import json
+import os
+import sys
+from array import array
+
+from .instrument import count_file, timed
+
+# (minimum total quantity, percent off), ascending
+TIERS = ((0, 0), (1000, 4), (2000, 8), (4000, 12), (7500, 16))
+
+# customer class → extra percent off (customer tag "reseller")
+CUSTOMER_CLASSES = {"retail": 0, "reseller": 15}
+
+FORMAT = "uint32-le"
+
+
+def discounted_cents(base, *percents):
+    """Apply each percentage in turn; exact integer math, half-up to a cent."""
+    num, den = base, 1
+    for pct in percents:
+        num *= 100 - pct
+        den *= 100
+    return (2 * num + den) // (2 * den)
+
+
+def price_row(base, tiers=TIERS, classes=CUSTOMER_CLASSES):
+    return [discounted_cents(base, pct, extra)
+            for _, pct in tiers for extra in classes.values()]
+
+
+@timed("write price table")
+def write_price_table(rows, path, tiers=TIERS, classes=CUSTOMER_CLASSES):
+    """Write ``rows`` of ``(key, base_cents)`` to ``path`` (``.json``) + ``.bin``.
+
+    Returns the number of variants written.
+    """
+    stem = path[:-5] if path.endswith(".json") else path
+    bin_path = stem + ".bin"
+    keys = {}
+    values = array("I")
+    with open(bin_path, "wb") as out:
+        for key, base in rows:
+            if key in keys:
+                raise ValueError(f"duplicate variant key {key!r}")
+            keys[key] = len(keys)
+            values.extend(price_row(base, tiers, classes))
+            if len(values) >= 1 << 16:
+                _flush(values, out)
+        _flush(values, out)
+
+    index = {
+        "format": FORMAT,
+        "unit": "cents",
+        "bin": os.path.basename(bin_path),
+        "tiers": [{"min_qty": q, "percent": p} for q, p in tiers],
+        "classes": list(classes),
+        "class_percent": dict(classes),
+        "stacking": "sequential",
+        "variants": len(keys),
+        "keys": keys,
+    }
+    with open(stem + ".json", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    count_file(bin_path)
+    count_file(stem + ".json")
+    return len(keys)
+
+
+def _flush(values, out):
+    if sys.byteorder != "little":
+        values.byteswap()
+    values.tofile(out)
+    del values[:]
+
+
+class PriceTable:
+    __slots__ = ("keys", "tier_mins", "classes", "values", "_stride")
+
+    def __init__(self, index, values):
+        self.keys = index["keys"]
+        self.tier_mins = [t["min_qty"] for t in index["tiers"]]
+        self.classes = {c: i for i, c in enumerate(index["classes"])}
+        self.values = values
+        self._stride = len(self.tier_mins) * len(self.classes)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("format") != FORMAT:
+            raise ValueError(f"{path}: unsupported price table format {index.get('format')!r}")
+        values = array("I")
+        with open(os.path.join(os.path.dirname(path), index["bin"]), "rb") as f:
+            values.frombytes(f.read())
+        if sys.byteorder != "little":
+            values.byteswap()
+        return cls(index, values)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def unit_cents(self, key, quantity=0, customer_class="retail"):
+        """Discounted unit price of ``key`` for a cart of ``quantity`` pieces."""
+        tier = bisect.bisect_right(self.tier_mins, quantity) - 1
+        return self.values[self.keys[key] * self._stride
+                           + tier * len(self.classes)
+                           + self.classes[customer_class]]
+
+    def row(self, key):
+        """``{class: [cents per tier]}`` for one variant."""
+        start = self.keys[key] * self._stride
+        cells = self.values[start:start + self._stride]
+        n = len(self.classes)
+        return {c: list(cells[i::n]) for c, i in self.classes.items()}
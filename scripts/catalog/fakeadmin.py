@@ -0,0 +1,472 @@
+"""Local stand-in for the Admin GraphQL endpoint.
+
+Answers ``metaobjectCreate`` calls sent with a ``$input`` variable, the
+aliased ``conf_NNN`` batches of ``catalog.batching`` (literal or the ``$c0``...
+slots of ``param_document``) and ``productVariantsBulkCreate``.  Every request
+is charged its calculated cost — 10 per mutation field, 1 per selected object,
+``first`` per connection — against a leaky bucket; documents over
+``MAX_QUERY_COST`` get ``MAX_COST_EXCEEDED``, an empty bucket ``THROTTLED``,
+and ``extensions.cost`` reports both like the real API, so the runner's
+throttle and retry paths can be exercised offline::
+
+    python -m catalog.fakeadmin --port 8787
+    python send_bulk_create.py --url http://127.0.0.1:8787/graphql.json
+
+``--latency``/``--jitter`` delay every GraphQL response and ``--error-rate``
+answers that share of requests with ``--error-status`` (503) before anything
+is executed; ``--random-seed`` makes the faults repeatable.
+``catalog.loadtest`` drives the whole pipeline through it.
+
+It also runs the bulk-mutation sequence of ``catalog.bulkops``:
+``stagedUploadsCreate`` hands out an upload form on ``/staged-uploads``,
+``bulkOperationRunMutation`` executes the uploaded JSONL on a background
+thread (``metaobjectCreate`` / ``productVariantsBulkCreate`` per line, one
+operation at a time like the real shop), ``node(id:)`` reports its status and
+the result JSONL is served from ``/bulk-results/<n>.jsonl``.
+
+Created metaobjects and variants are kept, and the read queries of
+``catalog.fetch`` page through them with ``first``/``after`` cursors (at most
+250 per page, like the real API).  ``--seed`` preloads exported
+``metaobjects.json`` / ``configuration_*.json`` files::
+
+    python -m catalog.fakeadmin --seed create-varients-v3/metaobjects.json
+    python -m catalog fetch --url http://127.0.0.1:8787/graphql.json --out-dir /tmp/fetched
+"""
+import argparse
+import base64
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .batching import MAX_QUERY_COST, MUTATION_COST, OBJECT_COST, alias_cost
+from .fetch import GROUP_TYPES
+
+MAX_PAGE = 250
+
+# aliased metaobjectCreate of catalog.batching.param_document
+PARAM_CREATE = re.compile(r'(\w+):metaobjectCreate\(metaobject:\{type:\$(\w+),fields:'
+                          r'\[\{key:"(\w+)",value:\$(\w+)\}\]\}\)')
+# aliased metaobjectCreate of catalog.batching.render_alias (inlined literals)
+LITERAL_CREATE = re.compile(r'(\w+):\s*metaobjectCreate\(metaobject:\s*\{\s*type:\s*"([^"]*)",\s*'
+                            r'fields:\s*\[\s*\{\s*key:\s*"(\w+)",\s*value:\s*("(?:[^"\\]|\\.)*")')
+
+
+class FakeAdmin:
+    """In-memory state shared by all handler threads."""
+
+    def __init__(self, capacity=2000, restore_rate=100, max_cost=MAX_QUERY_COST, bulk_seconds=0.5,
+                 latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=None):
+        self.capacity = capacity
+        self.restore_rate = restore_rate
+        self.max_cost = max_cost
+        self.available = float(capacity)
+        self.stamp = time.monotonic()
+        self.ids = itertools.count(900000000001)
+        self.handles = {}
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0                   # MAX_COST_EXCEEDED
+        self.spent = 0                      # cost points charged
+        self.lock = threading.Lock()
+        # fault injection
+        self.latency = latency              # seconds added to every GraphQL response
+        self.jitter = jitter                # + uniform(0, jitter)
+        self.error_rate = error_rate        # share answered with error_status
+        self.error_status = error_status
+        self.errors = 0
+        self.random = random.Random(seed)
+        # bulk operations
+        self.base_url = "http://127.0.0.1"
+        self.bulk_seconds = bulk_seconds    # minimum run time of one operation
+        self.variant_ids = itertools.count(500000000001)
+        self.op_ids = itertools.count(1)
+        self.uploads = {}                   # staged key → bytes
+        self.operations = {}                # gid → BulkOperation dict
+        self.results = {}                   # result file name → bytes
+        self.metaobjects = {}               # type → [node], creation order
+        self.variants = {}                  # product id → [variant]
+
+    def throttle_status(self):
+        return {"maximumAvailable": self.capacity,
+                "currentlyAvailable": int(self.available),
+                "restoreRate": self.restore_rate}
+
+    def charge(self, cost):
+        now = time.monotonic()
+        self.available = min(self.capacity,
+                             self.available + (now - self.stamp) * self.restore_rate)
+        self.stamp = now
+        if self.available < cost:
+            self.throttled += 1
+            return False
+        self.available -= cost
+        self.spent += cost
+        return True
+
+    def query_cost(self, query, variables):
+        """Requested cost of one document, calculated the way the Admin API does."""
+        creates = len(PARAM_CREATE.findall(query)) or len(LITERAL_CREATE.findall(query))
+        if creates:
+            return creates * alias_cost()
+        if "productVariantsBulkCreate" in query:
+            # the mutation + one object per returned variant and the payload
+            return MUTATION_COST + OBJECT_COST * (len(variables.get("variants") or []) + 1)
+        if "mutation" in query:
+            return alias_cost()
+        # connection queries cost what they may return
+        return 2 + OBJECT_COST * min(int(variables.get("first") or 1), MAX_PAGE)
+
+    def fault(self):
+        """``(delay seconds, HTTP status or None)`` for the next request."""
+        with self.lock:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.errors += 1
+                return delay, self.error_status
+        return delay, None
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "throttled": self.throttled,
+                    "maxCostExceeded": self.rejected, "injectedErrors": self.errors,
+                    "costSpent": self.spent,
+                    "metaobjects": sum(len(v) for v in self.metaobjects.values()),
+                    "variants": sum(len(v) for v in self.variants.values()),
+                    "throttleStatus": self.throttle_status()}
+
+    def create_metaobject(self, inp):
+        handle = inp.get("handle")
+        if handle and (inp.get("type"), handle) in self.handles:
+            return {"metaobject": None,
+                    "userErrors": [{"field": ["handle"], "message": "Value is already taken"}]}
+        gid = f"gid://shopify/Metaobject/{next(self.ids)}"
+        if handle:
+            self.handles[(inp.get("type"), handle)] = gid
+        name = next((f["value"] for f in inp.get("fields", []) if f["key"] == "name"), handle)
+        self.add_metaobject(inp.get("type"), {"id": gid, "displayName": name or gid,
+                                              "fields": inp.get("fields") or []})
+        return {"metaobject": {"id": gid, "displayName": name}, "userErrors": []}
+
+    def add_metaobject(self, type_, node):
+        fields = []
+        for f in node.get("fields") or []:
+            value = f.get("value")
+            json_value = f.get("jsonValue", value)
+            if "jsonValue" not in f and isinstance(value, str) and value.startswith(("[", "{")):
+                json_value = json.loads(value)
+            fields.append({"key": f["key"], "value": value, "type": f.get("type"),
+                           "jsonValue": json_value})
+        self.metaobjects.setdefault(type_, []).append(
+            {"id": node["id"], "type": type_, "displayName": node.get("displayName") or node["id"],
+             "fields": fields})
+
+    def seed(self, doc, product_id=None):
+        """Load an exported ``metaobjects.json``, ``configuration_*.json`` or live-state file."""
+        data = doc.get("data") or {}
+        if "metaobjectDefinition" in data:
+            conn = data["metaobjectDefinition"]["metaobjects"]
+            for edge, node in zip(conn["edges"], conn["nodes"]):
+                self.add_metaobject(edge["node"]["type"], dict(edge["node"], **node))
+            return
+        if "product" in data:
+            for v in data["product"]["variants"]["nodes"]:
+                self.variants.setdefault(product_id, []).append(v)
+            for node in data["configurations"]["nodes"]:
+                self.add_metaobject("mft_configuration",
+                                    {"id": node["id"], "fields": [dict(node["configurations"],
+                                                                       key="configurations")]})
+            return
+        for group, conn in data.items():
+            for edge in conn["edges"]:
+                self.add_metaobject(GROUP_TYPES.get(group, group), edge["node"])
+
+    def create_variants(self, variables):
+        created = []
+        stored = self.variants.setdefault(variables.get("productId"), [])
+        for v in variables.get("variants") or []:
+            title = " / ".join(o.get("name", "") for o in v.get("optionValues") or [])
+            gid = f"gid://shopify/ProductVariant/{next(self.variant_ids)}"
+            created.append({"id": gid, "title": title})
+            metafields = {m["key"]: {"value": m["value"]} for m in v.get("metafields") or []}
+            stored.append({"id": gid, "title": title, "price": str(v.get("price", "0.00")),
+                           "variations": metafields.get("variations"),
+                           "weight": metafields.get("metadata_weight")})
+        return {"productVariants": created, "userErrors": []}
+
+    def variant_links(self, product_id):
+        """``[(variant title, config refs or None)]`` following each ``variations`` metafield."""
+        refs = {}
+        with self.lock:
+            for nodes in self.metaobjects.values():
+                for n in nodes:
+                    for f in n["fields"]:
+                        if f["key"] == "configurations":
+                            refs[n["id"]] = tuple(f["jsonValue"])
+            return [(v["title"], refs.get((v.get("variations") or {}).get("value")))
+                    for v in self.variants.get(product_id, [])]
+
+    def page(self, items, variables):
+        """One connection page of ``items``; the cursor is the base64 offset."""
+        first = min(int(variables.get("first") or MAX_PAGE), MAX_PAGE)
+        after = variables.get("after")
+        start = int(base64.b64decode(after)) if after else 0
+        chunk = items[start:start + first]
+        end = start + len(chunk)
+        return chunk, {"hasNextPage": end < len(items),
+                       "endCursor": base64.b64encode(str(end).encode()).decode() if chunk else None}
+
+    def search(self, type_, query):
+        """Metaobjects of ``type_``; ``query`` may be ``fields.<key>:"<value>"``."""
+        items = self.metaobjects.get(type_, [])
+        if not query:
+            return items
+        key, _, value = query.partition(":")
+        key, value = key.removeprefix("fields."), value.strip('"')
+        return [n for n in items
+                if any(f["key"] == key and f["value"] == value for f in n["fields"])]
+
+    def staged_uploads(self, inputs):
+        targets = []
+        for inp in inputs:
+            key = f"tmp/bulk/{uuid.uuid4().hex}/{inp.get('filename', 'vars.jsonl')}"
+            targets.append({"url": f"{self.base_url}/staged-uploads",
+                            "resourceUrl": f"{self.base_url}/staged-uploads/{key}",
+                            "parameters": [{"name": "key", "value": key},
+                                           {"name": "Content-Type", "value": inp.get("mimeType")}]})
+        return {"stagedTargets": targets, "userErrors": []}
+
+    def run_bulk(self, mutation, staged_path):
+        def error(message):
+            return {"bulkOperation": None, "userErrors": [{"field": None, "message": message}]}
+        if any(op["status"] in ("CREATED", "RUNNING") for op in self.operations.values()):
+            return error("A bulk mutation operation for this app and shop is already in progress.")
+        if staged_path not in self.uploads:
+            return error("The JSONL file could not be found.")
+        if "metaobjectCreate" in mutation:
+            run_line = lambda v: {"metaobjectCreate": self.create_metaobject(v.get("metaobject") or {})}
+        elif "productVariantsBulkCreate" in mutation:
+            run_line = lambda v: {"productVariantsBulkCreate": self.create_variants(v)}
+        else:
+            return error("Unsupported bulk mutation")
+        n = next(self.op_ids)
+        gid = f"gid://shopify/BulkOperation/{n}"
+        op = {"id": gid, "status": "CREATED", "errorCode": None, "objectCount": "0",
+              "fileSize": None, "url": None, "partialDataUrl": None}
+        self.operations[gid] = op
+        lines = self.uploads.pop(staged_path).decode("utf-8").splitlines()
+        threading.Thread(target=self._execute, args=(op, n, lines, run_line), daemon=True).start()
+        return {"bulkOperation": {"id": gid, "status": "CREATED"}, "userErrors": []}
+
+    def _execute(self, op, n, lines, run_line):
+        started = time.monotonic()
+        with self.lock:
+            op["status"] = "RUNNING"
+        out = []
+        for i, raw in enumerate(lines):
+            if not raw.strip():
+                continue
+            try:
+                with self.lock:
+                    data = run_line(json.loads(raw))
+                out.append(json.dumps({"data": data, "__lineNumber": i}))
+            except ValueError as exc:
+                out.append(json.dumps({"errors": [{"message": f"invalid JSON: {exc}"}],
+                                       "__lineNumber": i}))
+            with self.lock:
+                op["objectCount"] = str(len(out))
+        time.sleep(max(0.0, self.bulk_seconds - (time.monotonic() - started)))
+        payload = ("\n".join(out) + "\n").encode() if out else b""
+        with self.lock:
+            name = f"{n}.jsonl"
+            self.results[name] = payload
+            op.update(status="COMPLETED", fileSize=str(len(payload)),
+                      url=f"{self.base_url}/bulk-results/{name}" if out else None)
+
+    def graphql(self, query, variables):
+        """``data`` for the operations the stand-in knows, else ``None``."""
+        if "query FetchGroup" in query:
+            nodes, info = self.page(self.search(variables.get("type"), variables.get("query")),
+                                    variables)
+            return {"metaobjects": {"edges": [{"node": {
+                "id": n["id"], "fields": [{"key": f["key"], "value": f["value"]} for f in n["fields"]]}}
+                for n in nodes], "pageInfo": info}}
+        if "query FetchDefinition" in query:
+            if variables.get("type") not in self.metaobjects:
+                return {"metaobjectDefinition": None}
+            nodes, info = self.page(self.metaobjects[variables["type"]], variables)
+            return {"metaobjectDefinition": {"type": variables["type"], "metaobjects": {
+                "edges": [{"node": {"id": n["id"], "displayName": n["displayName"], "type": n["type"]}}
+                          for n in nodes],
+                "nodes": [{"fields": [{"jsonValue": f["jsonValue"], "value": f["value"],
+                                       "type": f["type"], "key": f["key"]} for f in n["fields"]]}
+                          for n in nodes],
+                "pageInfo": info}}}
+        if "query FetchLiveVariants" in query:
+            if variables.get("productId") not in self.variants:
+                return {"product": None}
+            nodes, info = self.page(self.variants[variables["productId"]], variables)
+            return {"product": {"variants": {"nodes": nodes, "pageInfo": info}}}
+        if "query FetchLiveConfigurations" in query:
+            nodes, info = self.page(self.metaobjects.get(variables.get("type"), []), variables)
+            return {"metaobjects": {"nodes": [
+                {"id": n["id"], "configurations": next(
+                    ({"value": f["value"]} for f in n["fields"] if f["key"] == "configurations"), None)}
+                for n in nodes], "pageInfo": info}}
+        if "stagedUploadsCreate" in query:
+            return {"stagedUploadsCreate": self.staged_uploads(variables.get("input") or [])}
+        if "bulkOperationRunMutation" in query:
+            return {"bulkOperationRunMutation": self.run_bulk(variables.get("mutation", ""),
+                                                              variables.get("stagedUploadPath"))}
+        if "BulkOperation" in query and "id" in variables:
+            op = self.operations.get(variables["id"])
+            return {"node": dict(op) if op else None}
+        if "productVariantsBulkCreate" in query:
+            return {"productVariantsBulkCreate": self.create_variants(variables)}
+        if PARAM_CREATE.search(query):
+            return {alias: self.create_metaobject(
+                        {"type": variables.get(type_var),
+                         "fields": [{"key": key, "value": variables.get(value_var)}]})
+                    for alias, type_var, key, value_var in PARAM_CREATE.findall(query)}
+        if LITERAL_CREATE.search(query):
+            return {alias: self.create_metaobject(
+                        {"type": type_, "fields": [{"key": key, "value": json.loads(value)}]})
+                    for alias, type_, key, value in LITERAL_CREATE.findall(query)}
+        if "metaobjectCreate" in query and "input" in variables:
+            return {"metaobjectCreate": self.create_metaobject(variables["input"])}
+        return None
+
+    def handle(self, body):
+        query, variables = body.get("query", ""), body.get("variables") or {}
+        with self.lock:
+            self.requests += 1
+            requested = self.query_cost(query, variables)
+            cost = {"requestedQueryCost": requested, "actualQueryCost": requested}
+            if requested > self.max_cost:
+                self.rejected += 1
+                return {"errors": [{"message": f"Query cost is {requested}, which exceeds the "
+                                               f"single query max cost limit ({self.max_cost}).",
+                                    "extensions": {"code": "MAX_COST_EXCEEDED",
+                                                   "cost": requested, "maxCost": self.max_cost}}]}
+            if not self.charge(requested):
+                cost["actualQueryCost"] = None
+                cost["throttleStatus"] = self.throttle_status()
+                return {"errors": [{"message": "Throttled",
+                                    "extensions": {"code": "THROTTLED"}}],
+                        "extensions": {"cost": cost}}
+            data = self.graphql(query, variables)
+            if data is None:
+                return {"errors": [{"message": "Unsupported operation"}]}
+            cost["throttleStatus"] = self.throttle_status()
+            return {"data": data, "extensions": {"cost": cost}}
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status, payload, content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            if self.path.startswith("/staged-uploads"):
+                key, content = parse_upload(self.headers.get("Content-Type", ""), body)
+                if key is None:
+                    return self._reply(400, b"missing key or file")
+                with state.lock:
+                    state.uploads[key] = content
+                return self._reply(201, b"")
+            delay, status = state.fault()
+            if delay:
+                time.sleep(delay)
+            if status is not None:
+                return self._reply(status, b'{"errors":[{"message":"Service Unavailable"}]}')
+            self._reply(200, json.dumps(state.handle(json.loads(body))).encode())
+
+        def do_GET(self):
+            name = self.path.rsplit("/", 1)[-1]
+            with state.lock:
+                payload = state.results.get(name) if self.path.startswith("/bulk-results/") else None
+            if payload is None:
+                return self._reply(404, b"not found", "text/plain")
+            self._reply(200, payload, "application/jsonl")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def parse_upload(content_type, body):
+    """``(key, file bytes)`` from a multipart staged upload, ``(None, None)`` if incomplete."""
+    boundary = content_type.partition("boundary=")[2].strip('"')
+    if not boundary:
+        return None, None
+    fields = {}
+    for part in body.split(b"--" + boundary.encode())[1:-1]:
+        head, _, content = part.partition(b"\r\n\r\n")
+        name = head.decode("utf-8", "replace").partition('name="')[2].partition('"')[0]
+        fields[name] = content[:-2] if content.endswith(b"\r\n") else content
+    if "key" not in fields or "file" not in fields:
+        return None, None
+    return fields["key"].decode("utf-8"), fields["file"]
+
+
+def serve(host="127.0.0.1", port=0, state=None):
+    """Start the stand-in on a background thread; returns ``(server, state)``."""
+    state = state or FakeAdmin()
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    state.base_url = f"http://{host}:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--bucket", type=int, default=2000)
+    ap.add_argument("--restore-rate", type=int, default=100)
+    ap.add_argument("--bulk-seconds", type=float, default=0.5,
+                    help="minimum run time of a bulk operation")
+    ap.add_argument("--max-cost", type=int, default=MAX_QUERY_COST,
+                    help="single query cost limit")
+    ap.add_argument("--latency", type=float, default=0.0,
+                    help="seconds added to every GraphQL response")
+    ap.add_argument("--jitter", type=float, default=0.0,
+                    help="plus a uniform random delay up to this many seconds")
+    ap.add_argument("--error-rate", type=float, default=0.0,
+                    help="share of GraphQL requests answered with --error-status")
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--random-seed", type=int, help="repeatable latency jitter and errors")
+    ap.add_argument("--seed", action="append", default=[], metavar="JSON",
+                    help="exported metaobjects / configuration / live-state file to preload")
+    ap.add_argument("--product-id", help="product the seeded live-state variants belong to")
+    args = ap.parse_args()
+    state = FakeAdmin(args.bucket, args.restore_rate, args.max_cost, args.bulk_seconds,
+                      args.latency, args.jitter, args.error_rate, args.error_status,
+                      args.random_seed)
+    for path in args.seed:
+        with open(path, encoding="utf-8") as f:
+            state.seed(json.load(f), args.product_id)
+    server, _ = serve(args.host, args.port, state)
+    print(f"Fake Admin API on http://{args.host}:{server.server_port}/graphql.json")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Merchant product feed and variant sitemap, streamed into size-split gzip files.
+
+One pass over the same combination enumeration the mutations use feeds every
+writer at once, one item at a time, so memory stays flat however many
+variants there are::
+
+    feed-001.xml.gz, feed-002.xml.gz, ...     RSS 2.0 with g: fields (or feed-NNN.csv.gz)
+    feed_index.json                           parts, item and byte counts
+    sitemap-001.xml.gz, ...                   one <url> per variant with an id
+    sitemap_index.xml                         <sitemapindex> over the parts
+
+A part is closed before its *uncompressed* size would pass ``MAX_BYTES`` or
+its item count ``MAX_ITEMS`` (the sitemap protocol limits, which merchant
+feeds accept too) and the next one is opened.  Gzip headers carry
+``mtime=0``, so the same catalog always gives the same bytes::
+
+    python -m catalog feed metaobjects.json --base-url https://shop.example --variant-ids live_state.json
+    python -m catalog feed --values configuration_value.json --options configuration_option.json ...
+
+Items come from ``catalog_items`` (``metaobjects.json`` workflow) or
+``value_items`` (configuration-value variants).  Variant ids are matched by
+title like ``catalog.lookup``; variants without one are still fed (linking
+to the product page) but left out of the sitemap.
+"""
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from collections import namedtuple
+from xml.sax.saxutils import escape
+
+from . import codecs
+from .instrument import count, stage
+from .pricing import format_cents
+
+# ——— CONFIG ———
+MAX_BYTES = 50 * 1024 * 1024   # uncompressed bytes per part
+MAX_ITEMS = 50_000             # items / URLs per part
+CURRENCY  = "EUR"
+BRAND     = "Drylance"
+FEED_TITLE = "Drylance configurable products"
+# ————————
+
+FeedItem = namedtuple("FeedItem", "id title cents grams width_mm height_mm variant_id")
+
+CSV_COLUMNS = ("id", "item_group_id", "title", "link", "price", "shipping_weight",
+               "product_width", "product_height", "availability", "condition", "brand")
+
+
+def item_id(refs):
+    """Stable id from the metaobject refs — the same variant keeps it across runs."""
+    return hashlib.blake2b("|".join(refs).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _size_dimensions(rec):
+    dims = [codecs.decode(k, rec.get(k)) if rec is not None else None
+            for k in codecs.DIMENSION_KEYS]
+    return tuple(d.mm if d else None for d in dims)
+
+
+def catalog_items(space, cat, matrix, ids_by_title=None):
+    """``FeedItem`` per variant of ``space`` (``workflow.variant_space``).
+
+    Width and height are those of the size option, read from the ``Catalog``
+    records (``Option`` tuples do not carry them).
+    """
+    from .workflow import iter_combinations
+    ids_by_title = ids_by_title or {}
+    for i, (refs, _, _, title) in enumerate(iter_combinations(space, matrix=matrix)):
+        width, height = _size_dimensions(cat.get(refs[0]))
+        yield FeedItem(item_id(refs), title, matrix.price(i), matrix.weight(i),
+                       width, height, ids_by_title.get(title))
+
+
+def value_items(dimensions, matrix, ids_by_title=None):
+    """``FeedItem`` per variant of ``product_variants.variant_dimensions``."""
+    import itertools
+    ids_by_title = ids_by_title or {}
+    for i, (size, side, hang, pack) in enumerate(itertools.product(*dimensions)):
+        title = f"{size['name']} | {side['name']} | {hang['name']} | {pack['name']}"
+        refs = [size['metaobject_id'], side['metaobject_id'], *hang['metaobject_ids'],
+                pack['metaobject_id']]
+        yield FeedItem(item_id(refs), title, matrix.price(i), int(size.get('weight', 0)),
+                       size.get('width_mm'), size.get('height_mm'), ids_by_title.get(title))
+
+
+def _cm(mm):
+    return "" if mm is None else f"{mm / 10:g} cm"
+
+
+def _numeric(gid):
+    return gid.rpartition("/")[2]
+
+
+class Site:
+    """Where links point: ``<base_url>/products/<handle>?variant=<n>``."""
+
+    def __init__(self, base_url, handle):
+        self.base_url = base_url.rstrip("/")
+        self.handle = handle
+
+    def link(self, item):
+        url = f"{self.base_url}/products/{self.handle}"
+        return f"{url}?variant={_numeric(item.variant_id)}" if item.variant_id else url
+
+
+class SplitWriter:
+    """Gzip parts ``<stem>-NNN<suffix>.gz`` with a header and footer each.
+
+    ``write`` takes one already-rendered record; the part rolls over first if
+    the record (plus the footer) would not fit.
+    """
+
+    def __init__(self, out_dir, stem, suffix, header, footer, max_bytes=MAX_BYTES,
+                 max_items=MAX_ITEMS):
+        self.out_dir, self.stem, self.suffix = out_dir, stem, suffix
+        self.header, self.footer = header.encode("utf-8"), footer.encode("utf-8")
+        self.max_bytes, self.max_items = max_bytes, max_items
+        if len(self.header) + len(self.footer) >= max_bytes:
+            raise ValueError(f"max_bytes {max_bytes} leaves no room for records")
+        self.parts = []     # {"file", "items", "bytes", "gzip_bytes"}
+        self._gz = None
+
+    def _open(self):
+        name = f"{self.stem}-{len(self.parts) + 1:03}{self.suffix}.gz"
+        path = os.path.join(self.out_dir, name)
+        self._gz = gzip.GzipFile(path, "wb", compresslevel=6, mtime=0)
+        self._gz.write(self.header)
+        self.parts.append({"file": name, "items": 0, "bytes": len(self.header), "gzip_bytes": 0})
+
+    def _close(self):
+        self._gz.write(self.footer)
+        self._gz.close()
+        self._gz = None
+        part = self.parts[-1]
+        part["bytes"] += len(self.footer)
+        part["gzip_bytes"] = os.path.getsize(os.path.join(self.out_dir, part["file"]))
+        count("bytes written", part["gzip_bytes"])
+
+    def write(self, record):
+        data = record.encode("utf-8")
+        if self._gz is not None:
+            part = self.parts[-1]
+            if (part["items"] >= self.max_items
+                    or part["bytes"] + len(data) + len(self.footer) > self.max_bytes):
+                self._close()
+        if self._gz is None:
+            self._open()
+            part = self.parts[-1]
+            if len(self.header) + len(data) + len(self.footer) > self.max_bytes:
+                raise ValueError(f"one record is larger than max_bytes {self.max_bytes}")
+        self._gz.write(data)
+        part["items"] += 1
+        part["bytes"] += len(data)
+
+    def close(self):
+        if self._gz is not None:
+            self._close()
+        return self.parts
+
+
+# ——— formats ———
+
+def _fields(item, site, group_id):
+    return {
+        "id": item.id,
+        "item_group_id": group_id,
+        "title": item.title,
+        "link": site.link(item),
+        "price": f"{format_cents(item.cents)} {CURRENCY}",
+        "shipping_weight": f"{item.grams} g",
+        "product_width": _cm(item.width_mm),
+        "product_height": _cm(item.height_mm),
+        "availability": "in_stock",
+        "condition": "new",
+        "brand": BRAND,
+    }
+
+
+class XmlFeed:
+    suffix = ".xml"
+    header = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">\n<channel>\n'
+              f"<title>{escape(FEED_TITLE)}</title>\n")
+    footer = "</channel>\n</rss>\n"
+
+    @staticmethod
+    def render(fields):
+        body = "".join(f"<g:{k}>{escape(v)}</g:{k}>" for k, v in fields.items() if v)
+        return f"<item>{body}</item>\n"
+
+
+class CsvFeed:
+    suffix = ".csv"
+    header = ",".join(CSV_COLUMNS) + "\r\n"
+    footer = ""
+
+    @staticmethod
+    def render(fields):
+        buf = io.StringIO()
+        csv.writer(buf).writerow([fields[c] for c in CSV_COLUMNS])
+        return buf.getvalue()
+
+
+FORMATS = {"xml": XmlFeed, "csv": CsvFeed}
+
+SITEMAP_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                  '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+SITEMAP_FOOTER = "</urlset>\n"
+
+
+def write_sitemap_index(path, site, parts, lastmod=None):
+    with open(path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                  '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for part in parts:
+            mod = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+            out.write(f"<sitemap><loc>{escape(site.base_url)}/{part['file']}</loc>{mod}</sitemap>\n")
+        out.write("</sitemapindex>\n")
+
+
+def write_feed(items, out_dir, site, fmt="xml", sitemap=True, max_bytes=MAX_BYTES,
+               max_items=MAX_ITEMS, lastmod=None):
+    """Stream ``items`` into feed (and sitemap) parts plus their indexes; returns the index."""
+    os.makedirs(out_dir, exist_ok=True)
+    kind = FORMATS[fmt]
+    feed = SplitWriter(out_dir, "feed", kind.suffix, kind.header, kind.footer,
+                       max_bytes, max_items)
+    urls = (SplitWriter(out_dir, "sitemap", ".xml", SITEMAP_HEADER, SITEMAP_FOOTER,
+                        max_bytes, max_items) if sitemap else None)
+    mod = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+    n = without_id = 0
+    with stage("write feed", format=fmt):
+        for item in items:
+            feed.write(kind.render(_fields(item, site, site.handle)))
+            n += 1
+            if item.variant_id is None:
+                without_id += 1
+            elif urls is not None:
+                urls.write(f"<url><loc>{escape(site.link(item))}</loc>{mod}</url>\n")
+        feed_parts = feed.close()
+        sitemap_parts = urls.close() if urls is not None else []
+    count("feed items", n)
+
+    index = {"format": fmt, "items": n, "without_variant_id": without_id,
+             "parts": feed_parts, "sitemap": sitemap_parts}
+    with open(os.path.join(out_dir, "feed_index.json"), "w", encoding="utf-8") as out:
+        json.dump(index, out, indent=2, ensure_ascii=False)
+    if sitemap_parts:
+        write_sitemap_index(os.path.join(out_dir, "sitemap_index.xml"), site, sitemap_parts,
+                            lastmod)
+    return index
@@ -0,0 +1,202 @@
+"""Fetch the generator inputs straight from the Admin API, every page of them.
+
+Writes the exact shapes the scripts read today:
+
+* ``metaobjects.json``         — ``data.<group>.edges[].node{id, fields}``, one
+  group per option type (``GROUP_TYPES``), filtered to the product;
+* ``configuration_value.json`` / ``configuration_option.json`` —
+  ``data.metaobjectDefinition.metaobjects{edges, nodes}``;
+* ``live_state.json``          — ``live_state.graphql``'s shape for ``sync``.
+
+Every connection is followed with cursors until ``hasNextPage`` is false, so
+large definitions are no longer cut off at the first page (``live_state.graphql``
+alone stops at 250 of the 324 configs).  Connections are independent, so all
+of them run concurrently over one pooled, throttled ``AdminClient``; pages
+of one connection follow each other.  Files are written to a temp name and
+renamed, so a failed refresh never leaves half a file behind::
+
+    python -m catalog fetch --url https://shop/admin/api/2025-01/graphql.json --out-dir .
+    python -m catalog.fakeadmin --seed create-varients-v3/metaobjects.json   # offline
+"""
+import asyncio
+import json
+import os
+import sys
+
+from .adminapi import AdminClient
+from .instrument import count, count_file, stage
+
+# ——— CONFIG ———
+PAGE_SIZE = 250
+# metaobject type behind each metaobjects.json group — match the shop's definitions
+GROUP_TYPES = {
+    "sizeOptions":      "size_option",
+    "printedSides":     "printed_side",
+    "hangloopOptions":  "hangloop_option",
+    "packagingOptions": "packaging_option",
+}
+VALUE_TYPE  = "configuration_value"
+OPTION_TYPE = "configuration_option"
+CONFIG_TYPE = "mft_configuration"
+# ————————
+
+GROUP_QUERY = """
+query FetchGroup($type: String!, $query: String, $first: Int!, $after: String) {
+  metaobjects(type: $type, query: $query, first: $first, after: $after) {
+    edges { node { id fields { key value } } }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+""".strip()
+
+DEFINITION_QUERY = """
+query FetchDefinition($type: String!, $first: Int!, $after: String) {
+  metaobjectDefinition: metaobjectDefinitionByType(type: $type) {
+    type
+    metaobjects(first: $first, after: $after) {
+      edges { node { id displayName type } }
+      nodes { fields { jsonValue value type key } }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+""".strip()
+
+LIVE_VARIANTS_QUERY = """
+query FetchLiveVariants($productId: ID!, $first: Int!, $after: String) {
+  product(id: $productId) {
+    variants(first: $first, after: $after) {
+      nodes {
+        id
+        title
+        price
+        variations: metafield(namespace: "custom", key: "variations") { value }
+        weight: metafield(namespace: "custom", key: "metadata_weight") { value }
+      }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+""".strip()
+
+LIVE_CONFIGS_QUERY = """
+query FetchLiveConfigurations($type: String!, $first: Int!, $after: String) {
+  metaobjects(type: $type, first: $first, after: $after) {
+    nodes {
+      id
+      configurations: field(key: "configurations") { value }
+    }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+""".strip()
+
+
+class FetchError(RuntimeError):
+    """A query failed or returned no connection."""
+
+
+def _dig(data, path):
+    for key in path:
+        data = (data or {}).get(key)
+    return data
+
+
+async def paginate(client, query, variables, path, page_size=PAGE_SIZE):
+    """``(edges, nodes, pages)`` of the connection at ``path`` across every page."""
+    edges, nodes, after, pages = [], [], None, 0
+    while True:
+        resp = await client.execute(query, dict(variables, first=page_size, after=after))
+        if resp.get("errors"):
+            raise FetchError("; ".join(e.get("message", "") for e in resp["errors"]))
+        conn = _dig(resp.get("data"), path)
+        if conn is None:
+            raise FetchError(f"no {'.'.join(path)} in response")
+        edges += conn.get("edges") or []
+        nodes += conn.get("nodes") or []
+        pages += 1
+        info = conn.get("pageInfo") or {}
+        if not info.get("hasNextPage"):
+            count("pages fetched", pages)
+            return edges, nodes, pages
+        after = info["endCursor"]
+
+
+async def fetch_metaobjects(client, product_id, group_types=GROUP_TYPES, page_size=PAGE_SIZE):
+    search = f'fields.product:"{product_id}"' if product_id else None
+
+    async def group(name, type_):
+        edges, _, _ = await paginate(client, GROUP_QUERY, {"type": type_, "query": search},
+                                     ["metaobjects"], page_size)
+        return name, {"edges": [{"node": e["node"]} for e in edges]}
+
+    groups = await asyncio.gather(*(group(n, t) for n, t in group_types.items()))
+    return {"data": dict(groups)}
+
+
+async def fetch_definition(client, type_, page_size=PAGE_SIZE):
+    edges, nodes, _ = await paginate(client, DEFINITION_QUERY, {"type": type_},
+                                     ["metaobjectDefinition", "metaobjects"], page_size)
+    if nodes and len(nodes) != len(edges):
+        raise FetchError(f"{type_}: {len(edges)} edges but {len(nodes)} nodes")
+    return {"data": {"metaobjectDefinition": {
+        "type": type_, "metaobjects": {"edges": edges, "nodes": nodes}}}}
+
+
+async def fetch_live_state(client, product_id, definition=CONFIG_TYPE, page_size=PAGE_SIZE):
+    (_, variants, _), (_, configs, _) = await asyncio.gather(
+        paginate(client, LIVE_VARIANTS_QUERY, {"productId": product_id},
+                 ["product", "variants"], page_size),
+        paginate(client, LIVE_CONFIGS_QUERY, {"type": definition}, ["metaobjects"], page_size))
+    return {"data": {"product": {"variants": {"nodes": variants}},
+                     "configurations": {"nodes": configs}}}
+
+
+def write_atomic(path, doc):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        json.dump(doc, out, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    count_file(path)
+
+
+TARGETS = ("metaobjects", "values", "options", "live")
+FILENAMES = {
+    "metaobjects": "metaobjects.json",
+    "values":      "configuration_value.json",
+    "options":     "configuration_option.json",
+    "live":        "live_state.json",
+}
+
+
+async def fetch_all(url, token, product_id, out_dir=".", targets=TARGETS, pool_size=4,
+                    definition=CONFIG_TYPE, page_size=PAGE_SIZE):
+    """Fetch ``targets`` concurrently and write them to ``out_dir``; returns ``{file: entries}``."""
+    async with AdminClient(url, token, pool_size=pool_size) as client:
+        jobs = {
+            "metaobjects": lambda: fetch_metaobjects(client, product_id, GROUP_TYPES, page_size),
+            "values":      lambda: fetch_definition(client, VALUE_TYPE, page_size),
+            "options":     lambda: fetch_definition(client, OPTION_TYPE, page_size),
+            "live":        lambda: fetch_live_state(client, product_id, definition, page_size),
+        }
+        with stage("fetch", targets=list(targets)):
+            docs = await asyncio.gather(*(jobs[t]() for t in targets))
+
+    os.makedirs(out_dir, exist_ok=True)
+    written = {}
+    for target, doc in zip(targets, docs):
+        path = os.path.join(out_dir, FILENAMES[target])
+        write_atomic(path, doc)
+        written[path] = _entries(doc)
+        print(f"Wrote {path} ({written[path]} entries)", file=sys.stderr)
+    return written
+
+
+def _entries(doc):
+    data = doc["data"]
+    if "metaobjectDefinition" in data:
+        return len(data["metaobjectDefinition"]["metaobjects"]["edges"])
+    if "product" in data:
+        return (len(data["product"]["variants"]["nodes"])
+                + len(data["configurations"]["nodes"]))
+    return sum(len(g["edges"]) for g in data.values())
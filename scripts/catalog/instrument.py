@@ -0,0 +1,176 @@
+"""Per-stage timers, counters and peak memory for the generators.
+
+Off by default: ``stage()`` hands back one shared no-op context manager and
+``count()`` returns after a single flag check, so the hooks can stay in the
+hot paths.  ``configure(trace_path)`` switches recording on — the scripts and
+``python -m catalog`` call it for ``--trace PATH`` or ``CATALOG_TRACE=PATH``::
+
+    with stage("parse", file=path):
+        cat = Catalog.from_metaobjects(data)
+    count("combinations", n)
+    count_file(path)                 # bytes written
+
+    @timed("configs")
+    def make_config_mutation(...): ...
+
+At exit a per-stage table (calls, inclusive wall time, peak RSS) and the
+counters go to stderr, and the trace is written as Chrome trace-event JSON
+(open it in ``chrome://tracing`` or https://ui.perfetto.dev).  Work done in
+``products.py`` worker processes is not recorded.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+TRACE_ENV = "CATALOG_TRACE"
+
+_recorder = None
+
+
+def _peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class _Stage:
+    __slots__ = ("recorder", "name", "args", "start")
+
+    def __init__(self, recorder, name, args):
+        self.recorder = recorder
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.finish(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Recorder:
+    def __init__(self, trace_path=None):
+        self.trace_path = trace_path
+        self.origin = time.perf_counter_ns()
+        self.stages = {}     # name → [calls, total ns, peak rss kB]
+        self.counters = {}
+        self.events = []
+        self.pid = os.getpid()
+
+    def finish(self, name, start, end, args):
+        rss = _peak_rss_kb()
+        s = self.stages.setdefault(name, [0, 0, 0])
+        s[0] += 1
+        s[1] += end - start
+        s[2] = max(s[2], rss)
+        event = {"name": name, "ph": "X", "pid": self.pid, "tid": threading.get_ident(),
+                 "ts": (start - self.origin) / 1000, "dur": (end - start) / 1000,
+                 "args": dict(args, peak_rss_kb=rss)}
+        self.events.append(event)
+        if self.counters:
+            self.events.append({"name": "counters", "ph": "C", "pid": self.pid,
+                                "ts": (end - self.origin) / 1000, "args": dict(self.counters)})
+
+    def summary(self):
+        return {
+            "stages": {name: {"calls": c, "seconds": round(ns / 1e9, 6), "peak_rss_kb": rss}
+                       for name, (c, ns, rss) in self.stages.items()},
+            "counters": dict(self.counters),
+            "wall_s": round((time.perf_counter_ns() - self.origin) / 1e9, 6),
+            "peak_rss_kb": _peak_rss_kb(),
+        }
+
+    def write_trace(self, path):
+        meta = {"name": "process_name", "ph": "M", "pid": self.pid,
+                "args": {"name": " ".join([os.path.basename(sys.argv[0])] + sys.argv[1:])[:200]}}
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump({"traceEvents": [meta] + self.events, "displayTimeUnit": "ms",
+                       "otherData": self.summary()}, out)
+
+    def report(self, stream=sys.stderr):
+        s = self.summary()
+        width = max([len(n) for n in s["stages"]] + [5])
+        print(f"{'stage':<{width}}  calls   seconds  peak RSS kB", file=stream)
+        for name, st in sorted(s["stages"].items(), key=lambda kv: -kv[1]["seconds"]):
+            print(f"{name:<{width}}  {st['calls']:>5}  {st['seconds']:>8.4f}  {st['peak_rss_kb']:>11}",
+                  file=stream)
+        for name, n in sorted(s["counters"].items()):
+            print(f"{name}: {n}", file=stream)
+        print(f"total {s['wall_s']:.4f}s, peak RSS {s['peak_rss_kb']} kB", file=stream)
+
+
+def enabled():
+    return _recorder is not None
+
+
+def stage(name, **args):
+    """Time the ``with`` block as ``name`` (``args`` end up in the trace event)."""
+    if _recorder is None:
+        return _NO_STAGE
+    return _Stage(_recorder, name, args)
+
+
+def timed(name):
+    """Decorator form of ``stage``."""
+    def wrap(func):
+        @functools.wraps(func)
+        def inner(*a, **kw):
+            if _recorder is None:
+                return func(*a, **kw)
+            with _Stage(_recorder, name, {}):
+                return func(*a, **kw)
+        return inner
+    return wrap
+
+
+def count(name, n=1):
+    if _recorder is not None:
+        _recorder.counters[name] = _recorder.counters.get(name, 0) + n
+
+
+def count_file(path, name="bytes written"):
+    if _recorder is not None and path != "-" and os.path.exists(path):
+        count(name, os.path.getsize(path))
+
+
+def configure(trace_path=None, report=True):
+    """Start recording if ``trace_path`` or ``$CATALOG_TRACE`` is set; returns the recorder.
+
+    At exit the summary goes to stderr (``report``) and the trace to the path.
+    """
+    global _recorder
+    trace_path = trace_path or os.environ.get(TRACE_ENV)
+    if not trace_path or _recorder is not None:
+        return _recorder
+    _recorder = Recorder(trace_path)
+
+    def finish():
+        if report:
+            _recorder.report()
+        _recorder.write_trace(trace_path)
+        print(f"Wrote trace ➞ {trace_path}", file=sys.stderr)
+
+    atexit.register(finish)
+    return _recorder
@@ -0,0 +1,143 @@
+"""Append-only outcome journal for the two-step config → variant workflow.
+
+Every config alias and every variant gets one JSON line per outcome as the
+responses come in; lines are flushed and fsynced, so the alias → config id
+mapping survives a crash between step 1 and step 2.  Replaying the file gives
+the current state: the latest outcome per key wins, except that a success is
+never downgraded by a later failure (a resent alias that now collides still
+has its original config)::
+
+    {"kind": "config",  "key": "conf_017", "status": "ok", "id": "gid://...", "refs": [...]}
+    {"kind": "config",  "key": "conf_018", "status": "failed", "errors": [...]}
+    {"kind": "variant", "key": "40 × 80 cm | Front | No Hangloop | No Bag", "status": "ok", "id": "gid://..."}
+
+A rerun asks ``pending(...)`` which keys still need sending.
+"""
+import json
+import os
+import time
+
+CONFIG = "config"
+VARIANT = "variant"
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.state = {CONFIG: {}, VARIANT: {}}
+        self.by_refs = {}   # refs → config id of every config recorded ok with its refs
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._apply(json.loads(line))
+        self._out = open(path, "a", encoding="utf-8")
+
+    def close(self):
+        self._out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _apply(self, entry):
+        if entry["kind"] == CONFIG and entry["status"] == "ok" and entry.get("refs") is not None:
+            self.by_refs[tuple(entry["refs"])] = entry["id"]
+        seen = self.state[entry["kind"]]
+        prev = seen.get(entry["key"])
+        if prev and prev["status"] == "ok" and entry["status"] != "ok":
+            return
+        seen[entry["key"]] = entry
+
+    def record(self, kind, key, status, **data):
+        entry = {"kind": kind, "key": key, "status": status, "t": round(time.time(), 3), **data}
+        self._out.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._out.flush()
+        os.fsync(self._out.fileno())
+        self._apply(entry)
+
+    def ok(self, kind, key):
+        entry = self.state[kind].get(key)
+        return entry is not None and entry["status"] == "ok"
+
+    def config_id(self, alias):
+        entry = self.state[CONFIG].get(alias)
+        return entry["id"] if entry and entry["status"] == "ok" else None
+
+    def config_ids(self):
+        """Alias → config id for every alias that succeeded."""
+        return {k: e["id"] for k, e in self.state[CONFIG].items() if e["status"] == "ok"}
+
+    def config_ids_by_refs(self, refs_of):
+        """``({refs: config id}, stale)`` from the successful config entries.
+
+        Ids are keyed by the refs they were recorded with, so an id stays with
+        its combination when a catalog edit renumbers ``conf_NNN``; ``stale``
+        lists the aliases whose latest recorded refs differ from ``refs_of``
+        (alias → refs of the current catalog).  Entries recorded without refs
+        can only be taken at their alias.
+        """
+        ids, stale = dict(self.by_refs), []
+        for alias, e in self.state[CONFIG].items():
+            if e["status"] != "ok":
+                continue
+            if e.get("refs") is None:
+                if alias in refs_of:
+                    ids.setdefault(refs_of[alias], e["id"])
+            elif refs_of.get(alias) != tuple(e["refs"]):
+                stale.append(alias)
+        return ids, stale
+
+    def pending(self, kind, keys):
+        """``keys`` (in order) that have no successful outcome yet."""
+        return [k for k in keys if not self.ok(kind, k)]
+
+    def failed(self, kind):
+        return {k: e for k, e in self.state[kind].items() if e["status"] != "ok"}
+
+    def record_config_response(self, resp, sent=None):
+        """Record a ``conf_NNN`` aliased response.
+
+        ``sent`` optionally maps the aliases that were in the request to their
+        refs; aliases sent but absent from the response are recorded as failed.
+        """
+        data = resp.get("data") or {}
+        top_errors = [e.get("message", "") for e in resp.get("errors") or []]
+        counts = {"ok": 0, "failed": 0}
+        for alias in (sent if sent is not None else data):
+            result = data.get(alias) or {}
+            refs = list(sent[alias]) if sent is not None else None
+            extra = {"refs": refs} if refs is not None else {}
+            metaobject = result.get("metaobject")
+            if metaobject and metaobject.get("id"):
+                self.record(CONFIG, alias, "ok", id=metaobject["id"], **extra)
+                counts["ok"] += 1
+            else:
+                errors = result.get("userErrors") or top_errors or ["missing from response"]
+                self.record(CONFIG, alias, "failed", errors=errors, **extra)
+                counts["failed"] += 1
+        return counts
+
+    def record_variant_response(self, resp, sent_titles=()):
+        """Record a ``productVariantsBulkCreate`` response by variant title.
+
+        Titles in ``sent_titles`` without a created variant are recorded as failed.
+        """
+        payload = (resp.get("data") or {}).get("productVariantsBulkCreate") or {}
+        errors = [e.get("message", "") for e in payload.get("userErrors") or []]
+        errors += [e.get("message", "") for e in resp.get("errors") or []]
+        counts = {"ok": 0, "failed": 0}
+        created = set()
+        for variant in payload.get("productVariants") or []:
+            title = variant.get("title")
+            if title:
+                created.add(title)
+                self.record(VARIANT, title, "ok", id=variant.get("id"))
+                counts["ok"] += 1
+        for title in sent_titles:
+            if title not in created:
+                self.record(VARIANT, title, "failed", errors=errors or ["missing from response"])
+                counts["failed"] += 1
+        return counts
@@ -0,0 +1,81 @@
+"""Streaming writers for variant payloads.
+
+Nothing here holds more than one record in memory: records come from a
+generator and go straight to the sink, so peak memory does not grow with
+the number of combinations.
+"""
+import gzip
+import io
+import json
+import sys
+
+from .instrument import count, count_file, stage
+
+
+def open_sink(path):
+    """Open ``path`` for text output; ``.gz`` paths are gzip-compressed, ``-`` is stdout.
+
+    Gzip headers carry ``mtime=0`` so identical input gives identical bytes.
+    """
+    if path == "-":
+        return _Stdout()
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.GzipFile(path, "wb", compresslevel=6, mtime=0),
+                                encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+class _Stdout:
+    def __enter__(self):
+        return sys.stdout
+
+    def __exit__(self, *exc):
+        sys.stdout.flush()
+
+
+def dumps_line(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def bulk_variant_lines(product_id, variants):
+    """One ``productVariantsBulkCreate`` variables object per variant.
+
+    This is the line format ``bulkOperationRunMutation`` expects in the
+    staged-upload JSONL file.
+    """
+    for variant in variants:
+        yield {"productId": product_id, "variants": [variant]}
+
+
+def write_jsonl(records, path):
+    """Write one compact JSON document per line; returns the record count."""
+    n = 0
+    with stage("write jsonl", file=path), open_sink(path) as out:
+        for rec in records:
+            out.write(dumps_line(rec))
+            out.write("\n")
+            n += 1
+    count("records written", n)
+    count_file(path)
+    return n
+
+
+def write_variables_json(out, product_id, variants, indent=2, ensure_ascii=True):
+    """Stream ``{"productId": ..., "variants": [...]}`` to ``out``.
+
+    The output is identical to ``json.dump(..., indent=indent,
+    ensure_ascii=ensure_ascii)`` of the full object, but variants are
+    serialized one at a time.
+    """
+    pad = " " * indent
+    out.write("{\n")
+    out.write(f'{pad}"productId": {json.dumps(product_id, ensure_ascii=ensure_ascii)},\n')
+    out.write(f'{pad}"variants": [')
+    n = 0
+    for variant in variants:
+        body = json.dumps(variant, indent=indent, ensure_ascii=ensure_ascii)
+        out.write(",\n" if n else "\n")
+        out.write("\n".join(pad * 2 + line for line in body.split("\n")))
+        n += 1
+    out.write(f"\n{pad}]\n}}" if n else "]\n}")
+    return n
@@ -0,0 +1,261 @@
+"""End-to-end load test of the config → variant pipeline against the local simulator.
+
+One run generates the config batches for a ``metaobjects.json`` (literal or
+``--params``), sends them through ``catalog.runner`` / ``AdminClient`` —
+the same code paths as ``python -m catalog send`` — then builds the variant
+inputs from the returned config ids and creates them with
+``productVariantsBulkCreate`` calls.  ``catalog.fakeadmin`` runs in-process
+with its cost bucket, latency and error injection set from the flags (or
+``--url`` points at an already running endpoint)::
+
+    python -m catalog.loadtest create-varients-v3/metaobjects.json
+    python -m catalog.loadtest --scale 32400 --params --restore-rate 1000 --out loadtest.json
+    python -m catalog.loadtest metaobjects.json --latency 0.2 --jitter 0.1 --error-rate 0.05
+
+The report has one row per phase — requests, objects created, failures,
+client retries, server throttles and injected errors, wall time and
+throughput — and the end-to-end completion time.  Against the in-process
+simulator every created variant's ``variations`` metafield is followed back
+to its config and checked against the variant's own combination.  The exit
+status is 1 if anything was left uncreated or any variant points at the
+wrong config.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stderr
+from io import StringIO
+
+from .adminapi import AdminClient
+from .batching import alias_name, merge_responses
+from .bulkops import VARIANT_MUTATION
+from .fakeadmin import FakeAdmin, serve
+from .metaobjects import Catalog
+from .pipeline import Product, make_config_mutation
+from .runner import send_all, send_manifest, summarize
+from .workflow import (config_ids_by_refs, config_space, decode_options, iter_combinations,
+                       variant_input, variant_space)
+
+# ——— CONFIG ———
+PRODUCT_ID = "gid://shopify/Product/15391530385753"
+OPTION_ID  = "gid://shopify/ProductOption/17750055289177"
+VARIANTS_PER_REQUEST = 100   # variants per productVariantsBulkCreate call
+# ————————
+
+SERVER_COUNTERS = ("requests", "throttled", "injectedErrors", "costSpent")
+
+
+@contextmanager
+def _inside(path):
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def load_catalog(path=None, scale=None):
+    """``metaobjects.json`` document from ``path`` or a synthetic one of ~``scale`` configs."""
+    if scale:
+        from .bench import HANGS, PACKS, SIDES, synth_metaobjects
+        return synth_metaobjects(max(1, -(-scale // (SIDES * HANGS * PACKS))))
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def generate(doc, work_dir, product, params=False):
+    """Write the config batches into ``work_dir``; returns ``(options, manifest path)``."""
+    with redirect_stderr(StringIO()):
+        options = decode_options(Catalog.from_metaobjects(doc["data"]))
+        with _inside(work_dir):
+            make_config_mutation(options, product.definition, params=params)
+    return options, os.path.join(work_dir, "create_configs.manifest.json")
+
+
+def variant_jobs(options, product, configs_resp, per_request=VARIANTS_PER_REQUEST):
+    """``(jobs, waiting)``: variables per request and aliases without a config id."""
+    configs = config_space(options)
+    config_ids = config_ids_by_refs(options, configs_resp)
+    variants, waiting = [], []
+    for refs, total, weight, title in iter_combinations(variant_space(options)):
+        config_id = config_ids.get(refs)
+        if config_id is None:
+            waiting.append(alias_name(configs.index(refs) + 1))
+            continue
+        variants.append(variant_input(product.option_id, title, total, weight, config_id))
+    jobs = [(f"variants_{n:03}", {"productId": product.product_id,
+                                  "variants": variants[k:k + per_request]})
+            for n, k in enumerate(range(0, len(variants), per_request), start=1)]
+    return jobs, waiting
+
+
+def mislinked(options, links):
+    """Titles in ``links`` (``FakeAdmin.variant_links``) whose config has other refs."""
+    expected = {title: refs for refs, _, _, title in iter_combinations(variant_space(options))}
+    return [title for title, refs in links if expected.get(title) != refs]
+
+
+class Phase:
+    """Wall time, client summary and server counter deltas of one phase."""
+
+    def __init__(self, name, state=None):
+        self.name, self.state = name, state
+        self.row = {"phase": name}
+
+    def __enter__(self):
+        self.before = self.state.stats() if self.state else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.row["seconds"] = time.perf_counter() - self.start
+        if self.state:
+            after = self.state.stats()
+            self.row["server"] = {k: after[k] - self.before[k] for k in SERVER_COUNTERS}
+
+    def record(self, summary, expected):
+        objects = sum(len(r.get("ids") or []) for r in summary["results"] if r["status"] == "ok")
+        self.row.update({k: summary[k] for k in ("sent", "ok", "user_errors", "failed", "retries")},
+                        objects=objects, expected=expected,
+                        errors=[f"{r['name']}: {r['error']}" for r in summary["results"]
+                                if r["status"] == "failed"][:10])
+
+
+async def drive(url, token, doc, work_dir, product, params=False, concurrency=4, pool_size=4,
+                per_request=VARIANTS_PER_REQUEST, state=None):
+    """Run every phase against ``url``; returns the report."""
+    started = time.perf_counter()
+    rows = []
+
+    with Phase("generate") as phase:
+        options, manifest = generate(doc, work_dir, product, params)
+        with open(manifest) as f:
+            batches = json.load(f)
+        phase.row.update(objects=batches["total_aliases"], sent=len(batches["batches"]))
+    rows.append(phase.row)
+
+    with Phase("configs", state) as phase:
+        async with AdminClient(url, token, pool_size=pool_size) as client:
+            results = await send_manifest(client, manifest, os.path.join(work_dir, "configs"),
+                                          concurrency)
+            phase.record(summarize(results, client.retries), batches["total_aliases"])
+    rows.append(phase.row)
+
+    responses = []
+    for r in results:
+        if os.path.exists(r["name"]):
+            with open(r["name"]) as f:
+                responses.append(json.load(f))
+    jobs, waiting = variant_jobs(options, product, merge_responses(responses), per_request)
+
+    with Phase("variants", state) as phase:
+        async with AdminClient(url, token, pool_size=pool_size) as client:
+            summary = await send_all(client, VARIANT_MUTATION, jobs, concurrency)
+        phase.record(summary, len(variant_space(options)))
+        phase.row["waiting_for_config"] = len(waiting)
+    if state:
+        wrong = mislinked(options, state.variant_links(product.product_id))
+        phase.row["mislinked"] = len(wrong)
+        phase.row["errors"] += [f"{t}: linked to another combination's config" for t in wrong[:10]]
+    rows.append(phase.row)
+
+    elapsed = time.perf_counter() - started
+    for row in rows:
+        if row["seconds"] > 0 and row.get("objects"):
+            row["objects_per_s"] = row["objects"] / row["seconds"]
+    complete = (all(row["objects"] == row["expected"] for row in rows[1:])
+                and not rows[2].get("mislinked"))
+    return {"mode": "params" if params else "literal", "url": url, "phases": rows,
+            "end_to_end_s": elapsed, "complete": complete,
+            "server": state.stats() if state else None}
+
+
+def print_report(report, log=print):
+    log(f"{'phase':10} {'requests':>8} {'failed':>6} {'objects':>9} {'retries':>7} "
+        f"{'throttled':>9} {'errors':>6} {'seconds':>8} {'objects/s':>10}")
+    for row in report["phases"]:
+        server = row.get("server") or {}
+        log(f"{row['phase']:10} {row.get('sent', 0):>8} {row.get('failed', 0):>6} "
+            f"{row.get('objects', 0):>9} {row.get('retries', 0):>7} "
+            f"{server.get('throttled', '-'):>9} {server.get('injectedErrors', '-'):>6} "
+            f"{row['seconds']:>8.3f} {row.get('objects_per_s', 0):>10.1f}")
+        for err in row.get("errors") or []:
+            log(f"  {err}")
+    configs, variants = report["phases"][1], report["phases"][2]
+    log(f"end-to-end {report['end_to_end_s']:.3f}s, "
+        f"{'complete' if report['complete'] else 'INCOMPLETE'}: "
+        f"{configs['objects']}/{configs['expected']} configs, "
+        f"{variants['objects']}/{variants['expected']} variants"
+        f"{_links(variants)} ({report['mode']} batches)")
+
+
+def _links(row):
+    if "mislinked" not in row:
+        return ""
+    return f", {row['mislinked']} linked to the wrong config" if row["mislinked"] else ", links ok"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("metaobjects", nargs="?", help="metaobjects.json export")
+    ap.add_argument("--scale", type=int, help="synthetic catalog of about this many configs instead")
+    ap.add_argument("--params", action="store_true", help="parameterized config batches")
+    ap.add_argument("--url", help="send to this endpoint instead of an in-process simulator")
+    ap.add_argument("--token", default=os.environ.get("SHOPIFY_ADMIN_TOKEN"))
+    ap.add_argument("--concurrency", type=int, default=4, help="requests in flight per phase")
+    ap.add_argument("--pool-size", type=int, default=4, help="keep-alive connections")
+    ap.add_argument("--variants-per-request", type=int, default=VARIANTS_PER_REQUEST)
+    ap.add_argument("--product-id", default=PRODUCT_ID)
+    ap.add_argument("--option-id", default=OPTION_ID)
+    ap.add_argument("--definition", default="mft_configuration")
+    ap.add_argument("--work-dir", help="keep the generated batches and responses here")
+    ap.add_argument("--out", help="also write the report as JSON")
+    sim = ap.add_argument_group("simulator (ignored with --url)")
+    sim.add_argument("--bucket", type=int, default=2000)
+    sim.add_argument("--restore-rate", type=int, default=100)
+    sim.add_argument("--latency", type=float, default=0.0)
+    sim.add_argument("--jitter", type=float, default=0.0)
+    sim.add_argument("--error-rate", type=float, default=0.0)
+    sim.add_argument("--error-status", type=int, default=503)
+    sim.add_argument("--random-seed", type=int)
+    args = ap.parse_args()
+    if not args.metaobjects and not args.scale:
+        ap.error("a metaobjects.json or --scale is required")
+
+    doc = load_catalog(args.metaobjects, args.scale)
+    product = Product(args.product_id, args.option_id, args.definition)
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="catalog-loadtest-")
+    os.makedirs(work_dir, exist_ok=True)
+    server = state = None
+    url = args.url
+    if not url:
+        state = FakeAdmin(args.bucket, args.restore_rate, latency=args.latency,
+                          jitter=args.jitter, error_rate=args.error_rate,
+                          error_status=args.error_status, seed=args.random_seed)
+        server, _ = serve(state=state)
+        url = f"{state.base_url}/graphql.json"
+    try:
+        report = asyncio.run(drive(url, args.token, doc, work_dir, product, args.params,
+                                   args.concurrency, args.pool_size,
+                                   args.variants_per_request, state))
+    finally:
+        if server:
+            server.shutdown()
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    print_report(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+    sys.exit(0 if report["complete"] else 1)
+
+
+if __name__ == "__main__":
+    main()
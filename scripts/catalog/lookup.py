@@ -0,0 +1,144 @@
+"""Selection → variant lookup index for the storefront studio steps.
+
+The studio knows one metaobject per option step (size, printed sides,
+hangloop, packaging) and needs the variant to add to the cart.  Instead of
+shipping every variant and scanning its option title, the generators emit
+one compact JSON index::
+
+    {"version": 1,
+     "idPrefix": "gid://shopify/Metaobject/",
+     "dims":    [{"group": "sizeOptions", "ids": [344...], "labels": ["40 × 80 cm", ...]}, ...],
+     "strides": [54, 27, 3, 1],
+     "variant": [0, 0, 1, ...],           # one entry per exact selection, mixed-radix order
+     "variantPrefix": "gid://shopify/ProductVariant/",
+     "ids":     [501..., null, ...],      # per variant, null until it exists
+     "cents":   [660, ...]}               # per variant
+
+A selection resolves in O(dimensions) with no search::
+
+    i = sum(dims[d].ids.indexOf(choice[d]) * strides[d])   # or a prebuilt position map
+    v = variant[i];  id = ids[v];  price = cents[v] / 100
+
+``variant`` covers the full configuration space (``config_groups`` order, the
+same order as ``conf_NNN``) while ``ids``/``cents`` only hold the compressed
+variants, so folded hangloop positions share one entry.  Variant ids are
+matched by title from a ``productVariantsBulkCreate`` response (inline or
+``bulk``) or a live-state export; without one the index still resolves prices.
+"""
+import json
+
+from .instrument import count, count_file, timed
+from .pricing import PriceMatrix
+
+VERSION = 1
+METAOBJECT_PREFIX = "gid://shopify/Metaobject/"
+VARIANT_PREFIX = "gid://shopify/ProductVariant/"
+
+
+def _number(gid, prefix):
+    if gid is None:
+        return None
+    if not gid.startswith(prefix):
+        raise ValueError(f"{gid!r} does not start with {prefix!r}")
+    return int(gid[len(prefix):])
+
+
+def variant_ids(resp):
+    """``{title: variant gid}`` from a variants response or a live-state export."""
+    data = (resp or {}).get("data") or {}
+    if "productVariantsBulkCreate" in data:
+        nodes = (data["productVariantsBulkCreate"] or {}).get("productVariants") or []
+    else:
+        nodes = (((data.get("product") or {}).get("variants")) or {}).get("nodes") or []
+    return {n["title"]: n["id"] for n in nodes if n.get("id") and n.get("title")}
+
+
+@timed("lookup index")
+def build_index(compressed, config_order, ids_by_title=None, matrix=None):
+    """JSON-ready index; ``config_order`` is the per-group option order of the full space."""
+    if matrix is None:
+        matrix = PriceMatrix.from_space(compressed.space)
+    ids_by_title = ids_by_title or {}
+
+    radices = [len(opts) for opts in config_order]
+    strides, stride = [], 1
+    for r in reversed(radices):
+        strides.append(stride)
+        stride *= r
+    strides.reverse()
+
+    # enumerate exact selections in mixed-radix order, odometer style
+    variant = []
+    pos = [0] * len(radices)
+    for _ in range(stride if radices else 0):
+        selection = [opts[p].id for opts, p in zip(config_order, pos)]
+        variant.append(compressed.resolve(selection)[0])
+        k = len(pos) - 1
+        while k >= 0:
+            pos[k] += 1
+            if pos[k] < radices[k]:
+                break
+            pos[k] = 0
+            k -= 1
+
+    ids, cents, missing = [], [], 0
+    for i, combo in enumerate(compressed.space):
+        gid = ids_by_title.get(" | ".join(o.label for o in combo))
+        missing += gid is None
+        ids.append(_number(gid, VARIANT_PREFIX))
+        cents.append(matrix.price(i))
+    count("lookup selections", len(variant))
+    return {
+        "version": VERSION,
+        "idPrefix": METAOBJECT_PREFIX,
+        "dims": [{"group": g, "ids": [_number(o.id, METAOBJECT_PREFIX) for o in opts],
+                  "labels": [o.label for o in opts]}
+                 for g, opts in zip(compressed.groups, config_order)],
+        "strides": strides,
+        "variant": variant,
+        "variantPrefix": VARIANT_PREFIX,
+        "ids": ids,
+        "cents": cents,
+        "missingIds": missing,
+    }
+
+
+def write_index(path, index):
+    """Compact JSON (no indentation) — the file is served to the storefront as is."""
+    with open(path, "w", encoding="utf-8") as out:
+        json.dump(index, out, ensure_ascii=False, separators=(",", ":"))
+    count_file(path)
+
+
+class Lookup:
+    """Python reader of a written index, mirroring what the storefront does."""
+
+    def __init__(self, index):
+        if index.get("version") != VERSION:
+            raise ValueError(f"unsupported lookup index version {index.get('version')!r}")
+        self.index = index
+        prefix = index["idPrefix"]
+        self._positions = [{f"{prefix}{n}": i for i, n in enumerate(d["ids"])}
+                           for d in index["dims"]]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.index["variant"])
+
+    def resolve(self, selection):
+        """``(variant gid or None, cents)`` for one metaobject gid per step."""
+        if len(selection) != len(self._positions):
+            raise ValueError(f"expected {len(self._positions)} ids, got {len(selection)}")
+        try:
+            i = sum(pos[gid] * s for pos, gid, s in
+                    zip(self._positions, selection, self.index["strides"]))
+        except KeyError as exc:
+            raise KeyError(f"{exc.args[0]} is not an option of this product") from None
+        v = self.index["variant"][i]
+        n = self.index["ids"][v]
+        return (f"{self.index['variantPrefix']}{n}" if n is not None else None,
+                self.index["cents"][v])
@@ -0,0 +1,143 @@
+"""Indexed, compact view of exported metaobject JSON.
+
+Two export shapes are supported:
+
+* ``metaobjects.json`` — ``data.<group>.edges[].node{id, fields[]}`` with one
+  group per option (``sizeOptions``, ``printedSides``, ...);
+* ``configuration_value.json`` — ``data.metaobjectDefinition.metaobjects``
+  with ``edges[].node{id, displayName}`` and positionally matching
+  ``nodes[].fields[]``.
+
+Each metaobject becomes a ``Record`` holding a tuple of field values plus a
+key→slot map shared by every record with the same field layout, so field
+access is a dict hit instead of a scan over ``fields`` and the parsed catalog
+is much smaller than the raw dicts.
+"""
+import json
+
+from .instrument import count, stage
+
+OPTION_GROUPS = ("sizeOptions", "printedSides", "hangloopOptions", "packagingOptions")
+
+
+class Record:
+    __slots__ = ("id", "display_name", "group", "_slots", "_values")
+
+    def __init__(self, id, display_name, group, slots, values):
+        self.id = id
+        self.display_name = display_name
+        self.group = group
+        self._slots = slots
+        self._values = values
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._slots[key]]
+        except KeyError:
+            raise KeyError(f"{key} missing in {self.id}") from None
+
+    def get(self, key, default=None):
+        i = self._slots.get(key)
+        return default if i is None else self._values[i]
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def keys(self):
+        return self._slots.keys()
+
+    def __repr__(self):
+        return f"Record({self.id!r}, {self.display_name!r})"
+
+
+class Catalog:
+    """Records grouped in export order and indexed by id and field value."""
+
+    def __init__(self):
+        self.groups = {}
+        self.by_id = {}
+        self._layouts = {}
+        self._field_index = {}
+
+    def _layout(self, keys):
+        # one shared key→slot dict per distinct field layout
+        slots = self._layouts.get(keys)
+        if slots is None:
+            slots = self._layouts[keys] = {k: i for i, k in enumerate(keys)}
+        return slots
+
+    def add(self, group, id, fields, display_name=None):
+        keys = tuple(f["key"] for f in fields)
+        rec = Record(id, display_name, group, self._layout(keys),
+                     tuple(f.get("value") for f in fields))
+        self.groups.setdefault(group, []).append(rec)
+        if id is not None:
+            self.by_id[id] = rec
+        self._field_index.clear()
+        return rec
+
+    @classmethod
+    def from_metaobjects(cls, data):
+        """Build from the ``data`` object of ``metaobjects.json``."""
+        cat = cls()
+        with stage("index metaobjects"):
+            for group, conn in data.items():
+                for edge in conn.get("edges", []):
+                    node = edge["node"]
+                    cat.add(group, node["id"], node.get("fields", []), node.get("displayName"))
+        count("metaobjects", len(cat.by_id))
+        return cat
+
+    @classmethod
+    def from_definition(cls, data, group="metaobjects"):
+        """Build from ``data`` of a ``metaobjectDefinition { metaobjects }`` export."""
+        conn = data["metaobjectDefinition"]["metaobjects"]
+        edges = conn.get("edges") or []
+        nodes = conn.get("nodes") or []
+        cat = cls()
+        with stage("index metaobjects"):
+            for i, node in enumerate(nodes):
+                head = edges[i]["node"] if i < len(edges) else {}
+                cat.add(group, node.get("id", head.get("id")), node.get("fields", []),
+                        node.get("displayName", head.get("displayName")))
+        count("metaobjects", len(cat.by_id))
+        return cat
+
+    def group(self, name):
+        return self.groups.get(name, [])
+
+    def ids(self, group):
+        return [r.id for r in self.group(group)]
+
+    def records(self):
+        for recs in self.groups.values():
+            yield from recs
+
+    def __getitem__(self, id):
+        return self.by_id[id]
+
+    def get(self, id, default=None):
+        return self.by_id.get(id, default)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def find(self, key, value):
+        """All records whose field ``key`` equals ``value``."""
+        index = self._field_index.get(key)
+        if index is None:
+            index = self._field_index[key] = {}
+            for rec in self.records():
+                if key in rec:
+                    index.setdefault(rec[key], []).append(rec)
+        return index.get(value, [])
+
+
+def load_metaobjects(path):
+    with stage("parse", file=path), open(path) as f:
+        return Catalog.from_metaobjects(json.load(f)["data"])
+
+
+def load_definition(path, group="metaobjects"):
+    with stage("parse", file=path), open(path) as f:
+        return Catalog.from_definition(json.load(f)["data"], group)
@@ -0,0 +1,346 @@
+"""The steps of the mft_configuration workflow, writing files like the v2 script.
+
+Each step takes decoded ``options`` (see ``catalog.workflow``) and, where it
+emits variants, a ``Product``.  Generated files go to the working directory;
+variant mutations without ``jsonl_path`` go to stdout, progress to stderr.
+"""
+import glob
+import json
+import os
+import sys
+from collections import namedtuple
+
+from . import bulkops, feed, sync
+from .cache import track
+from .batching import (alias_name, render_alias, render_delete,
+                       write_batches, write_param_batches)
+from .binary import write_catalog
+from .discounts import write_price_table
+from .instrument import count_file, timed
+from .journal import VARIANT
+from .jsonl import bulk_variant_lines, write_jsonl, write_variables_json
+from .lookup import build_index, variant_ids, write_index
+from .pricing import PriceMatrix
+from .space import parse_range
+from .workflow import (compressed_variants, config_groups, config_ids_by_refs, config_space,
+                       iter_catalog_rows, iter_combinations, iter_price_rows, iter_variants,
+                       option_labels, variant_input, variant_space)
+
+DEFINITION_HANDLE = "mft_configuration"
+
+Product = namedtuple("Product", "product_id option_id definition")
+Product.__new__.__defaults__ = (DEFINITION_HANDLE,)
+
+
+@timed("configs")
+def make_config_mutation(options, definition=DEFINITION_HANDLE, span=None, journal=None,
+                         params=False):
+    # one document per cost/size bounded batch; conf_NNN stays global
+    space = config_space(options)
+    start, stop = parse_range(span, len(space)) if span else (0, len(space))
+    entries = ((alias_name(i), refs)
+               for i, refs in enumerate(space.range(start, stop), start=start + 1))
+    prefix  = f"create_configs_{start + 1:03}-{stop:03}" if span else "create_configs"
+    if journal:
+        # resend only combinations without a recorded config id
+        done = journal_config_ids(options, journal)
+        entries = [(a, refs) for a, refs in entries if refs not in done]
+        print(f"{len(entries)} of {stop - start} configs still pending", file=sys.stderr)
+        prefix = prefix.replace("create_", "retry_", 1)
+        for stale in (glob.glob(f"{prefix}_[0-9][0-9][0-9].graphql")
+                      + glob.glob(f"{prefix}_[0-9][0-9][0-9].variables.json")
+                      + glob.glob(f"{prefix}.params_*.graphql")
+                      + glob.glob(f"{prefix}.manifest.json")):
+            os.remove(stale)  # never resend an outdated retry batch
+        if not entries:
+            return
+    if params:
+        # typed variables + one reusable document per batch size (catalog/batching.py)
+        manifest = write_param_batches(entries, definition, prefix=prefix)
+    else:
+        manifest = write_batches(((a, render_alias(a, definition, r)) for a, r in entries),
+                                 prefix=prefix)
+    unchanged = set(manifest["unchanged"])
+    for b in manifest["batches"]:
+        note = " unchanged" if b["file"] in unchanged else ""
+        print(f"Wrote {b['file']} ({b['first_alias']}..{b['last_alias']}){note}",
+              file=sys.stderr)
+    for doc in manifest.get("documents", []):
+        print(f"Wrote {doc}", file=sys.stderr)
+    print(f"Wrote {prefix}.manifest.json", file=sys.stderr)
+
+
+def make_variant_mutation(options, product, configs_resp, jsonl_path=None, span=None):
+    space = variant_space(options)
+    start, stop = parse_range(span, len(space)) if span else (0, None)
+    config_ids = config_ids_by_refs(options, configs_resp)
+    emit_variants(product, iter_variants(space, product.option_id, config_ids, start, stop),
+                  jsonl_path)
+
+
+@timed("record responses")
+def record_responses(options, journal, paths):
+    # configs_NNN.json and productVariantsBulkCreate responses → journal
+    refs_of = {alias_name(i): refs for i, refs in enumerate(config_space(options), start=1)}
+    for p in paths:
+        with open(p, encoding="utf-8") as f:
+            resp = json.load(f)
+        if "productVariantsBulkCreate" in (resp.get("data") or {}):
+            counts = journal.record_variant_response(resp)
+        else:
+            data = resp.get("data") or {}
+            counts = journal.record_config_response(
+                resp, {a: refs_of[a] for a in data if a in refs_of})
+        print(f"Journal ⬅ {p}: {counts['ok']} ok, {counts['failed']} failed", file=sys.stderr)
+
+
+def journal_config_ids(options, journal):
+    """``{refs: config id}`` from ``journal``, warning about renumbered aliases."""
+    refs_of = {alias_name(i): refs for i, refs in enumerate(config_space(options), start=1)}
+    ids, stale = journal.config_ids_by_refs(refs_of)
+    if stale:
+        print(f"WARNING: {len(stale)} journaled configs now have other refs at their alias "
+              f"(catalog edited?): {', '.join(sorted(stale)[:10])}{' …' if len(stale) > 10 else ''}"
+              f" — their ids are matched by refs", file=sys.stderr)
+    return ids
+
+
+def pending_variants(options, product, journal, start=0, stop=None, waiting=None, done=None):
+    """Variant inputs not yet created whose config has a recorded id.
+
+    Titles already created go to ``done``, the aliases of configs still
+    missing to ``waiting``.  Configs are matched by refs, not position.
+    """
+    config_ids = journal_config_ids(options, journal)
+    configs = config_space(options)
+    waiting = [] if waiting is None else waiting
+    done = [] if done is None else done
+    for refs, total, weight, title in iter_combinations(variant_space(options), start, stop):
+        if journal.ok(VARIANT, title):
+            done.append(title)
+            continue
+        config_id = config_ids.get(refs)
+        if not config_id:
+            waiting.append(alias_name(configs.index(refs) + 1))
+            continue
+        yield variant_input(product.option_id, title, total, weight, config_id)
+
+
+def _report_skipped(done, waiting):
+    print(f"Skipped {len(done)} already created variants; {len(waiting)} wait for configs"
+          + (f" ({', '.join(waiting[:10])}{' …' if len(waiting) > 10 else ''})" if waiting else ""),
+          file=sys.stderr)
+
+
+def make_resumable_variants(options, product, journal, jsonl_path=None, span=None):
+    # only variants not yet created whose config has a recorded id
+    space = variant_space(options)
+    start, stop = parse_range(span, len(space)) if span else (0, None)
+    waiting, done = [], []
+    emit_variants(product, pending_variants(options, product, journal, start, stop, waiting, done),
+                  jsonl_path)
+    _report_skipped(done, waiting)
+
+
+@timed("bulk configs")
+def make_bulk_configs(options, definition, url, token, out_path, journal=None, span=None):
+    # every config as one bulk operation → configs response at out_path
+    space = config_space(options)
+    start, stop = parse_range(span, len(space)) if span else (0, len(space))
+    aliased = [(alias_name(i), refs)
+               for i, refs in enumerate(space.range(start, stop), start=start + 1)]
+    if journal:
+        # resend only combinations without a recorded config id
+        done = journal_config_ids(options, journal)
+        aliased = [(a, refs) for a, refs in aliased if refs not in done]
+        print(f"{len(aliased)} of {stop - start} configs still pending", file=sys.stderr)
+        if not aliased:
+            return None
+    resp = bulkops.bulk_configs(url, token, definition, aliased, out_path, journal)
+    ok = sum(1 for r in resp["data"].values() if (r or {}).get("metaobject"))
+    print(f"Bulk configs: {ok} created, {len(aliased) - ok} failed ➞ {out_path}", file=sys.stderr)
+    return resp
+
+
+@timed("bulk variants")
+def make_bulk_variants(options, product, configs_resp, url, token, out_path, journal=None,
+                       span=None):
+    # variants as one bulk operation; config ids from the responses (or the journal)
+    space = variant_space(options)
+    start, stop = parse_range(span, len(space)) if span else (0, None)
+    waiting, done = [], []
+    if journal:
+        variants = pending_variants(options, product, journal, start, stop, waiting, done)
+    else:
+        config_ids = config_ids_by_refs(options, configs_resp)
+        variants = iter_variants(space, product.option_id, config_ids, start, stop)
+    resp = bulkops.bulk_variants(url, token, bulk_variant_lines(product.product_id, variants),
+                                 out_path, journal)
+    if journal:
+        _report_skipped(done, waiting)
+    if resp is None:
+        print("Bulk variants: nothing to create", file=sys.stderr)
+        return None
+    payload = resp["data"]["productVariantsBulkCreate"]
+    print(f"Bulk variants: {len(payload['productVariants'])} created, "
+          f"{len(payload['userErrors'])} userErrors ➞ {out_path}", file=sys.stderr)
+    return resp
+
+
+@timed("emit variants")
+def emit_variants(product, variants, jsonl_path=None):
+    if jsonl_path:
+        # staged-upload JSONL for bulkOperationRunMutation (.gz → gzip)
+        n = write_jsonl(bulk_variant_lines(product.product_id, variants),
+                        jsonl_path)
+        track(jsonl_path)
+        print(f"Wrote {n} variants ➞ {jsonl_path}", file=sys.stderr)
+        return
+
+    # 4) print the bulk-create mutation + variables
+    print("""
+mutation ProductVariantsCreate($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
+  productVariantsBulkCreate(productId: $productId, variants: $variants) {
+    productVariants { id title selectedOptions { name value } metafields(first:5){ edges{ node{namespace key value}}}}
+    userErrors { field message }
+  }
+}
+""".strip())
+    print()
+    write_variables_json(sys.stdout, product.product_id, variants)
+    print()
+
+
+@timed("prices")
+def make_price_table(options, path):
+    # unit price per variant × bulk tier × customer class (catalog/discounts.py)
+    n = write_price_table(iter_price_rows(variant_space(options)), path)
+    print(f"Wrote {n} variant price rows ➞ {path}", file=sys.stderr)
+
+
+@timed("binary catalog")
+def make_binary_catalog(options, path, configs_resp=None):
+    # mmap-able variant columns + id tables (catalog/binary.py)
+    n = write_catalog(path, iter_catalog_rows(variant_space(options),
+                                              config_ids_by_refs(options, configs_resp)),
+                      option_labels(options))
+    print(f"Wrote {n} variants ➞ {path}", file=sys.stderr)
+
+
+@timed("variant map")
+def make_variant_map(options, path):
+    # exact selection → variant class table (catalog/compress.py)
+    table = compressed_variants(options).mapping()
+    with open(path, "w") as out:
+        json.dump(table, out, indent=2, ensure_ascii=False)
+    count_file(path)
+    print(f"Wrote {path}: {table['exact_selections']} selections ➞ {table['variants']} variants",
+          file=sys.stderr)
+
+
+def make_lookup_index(options, path, variants_resp=None):
+    # selection → variant id / price index for the studio (catalog/lookup.py)
+    index = build_index(compressed_variants(options), config_groups(options),
+                        variant_ids(variants_resp))
+    write_index(path, index)
+    print(f"Wrote {path}: {len(index['variant'])} selections ➞ {len(index['ids'])} variants"
+          f" ({index['missingIds']} without id)", file=sys.stderr)
+
+
+@timed("feed")
+def make_feed(options, cat, out_dir, site, fmt="xml", variants_resp=None, sitemap=True,
+              max_bytes=feed.MAX_BYTES, max_items=feed.MAX_ITEMS):
+    # merchant feed + variant sitemap, size-split gzip parts (catalog/feed.py)
+    space = variant_space(options)
+    items = feed.catalog_items(space, cat, PriceMatrix.from_space(space),
+                               variant_ids(variants_resp))
+    _report_feed(feed.write_feed(items, out_dir, site, fmt, sitemap, max_bytes, max_items),
+                 out_dir)
+
+
+@timed("feed")
+def make_value_feed(config_values, config_options, out_dir, site, fmt="xml", variants_resp=None,
+                    sitemap=True, max_bytes=feed.MAX_BYTES, max_items=feed.MAX_ITEMS):
+    # the same feed for the configuration-value variants (catalog/product_variants.py)
+    from .product_variants import price_matrix, variant_dimensions
+    dimensions = variant_dimensions(config_values, config_options, log=None)
+    items = feed.value_items(dimensions, price_matrix(dimensions), variant_ids(variants_resp))
+    _report_feed(feed.write_feed(items, out_dir, site, fmt, sitemap, max_bytes, max_items),
+                 out_dir)
+
+
+def _report_feed(index, out_dir):
+    print(f"Wrote {index['items']} feed items in {len(index['parts'])} part(s), "
+          f"{sum(p['items'] for p in index['sitemap'])} sitemap URLs in "
+          f"{len(index['sitemap'])} part(s) ➞ {out_dir}", file=sys.stderr)
+    if index["without_variant_id"]:
+        print(f"  {index['without_variant_id']} variants have no id yet (not in the sitemap)",
+              file=sys.stderr)
+
+
+def write_operation(name, query, variables):
+    with open(f"{name}.graphql", "w") as out:
+        out.write(query + "\n")
+    with open(f"{name}.json", "w") as out:
+        json.dump(variables, out, indent=2, ensure_ascii=False)
+    count_file(f"{name}.json")
+    print(f"Wrote {name}.graphql + {name}.json", file=sys.stderr)
+
+
+@timed("sync plan")
+def make_sync_plan(options, product, live_resp, configs_resp, prune_configs=False):
+    combos   = list(config_space(options))
+    desired  = [sync.Desired(refs, total, weight, title)
+                for refs, total, weight, title in iter_combinations(variant_space(options))]
+    live_configs, live_variants, unmanaged = sync.parse_live_state(live_resp)
+
+    # configs created by an earlier sync_configs run count as live
+    for refs, config_id in config_ids_by_refs(options, configs_resp).items():
+        live_configs.setdefault(refs, config_id)
+
+    # stale configs are only deleted on request, and only this product's
+    own = [o.id for opts in options.values() for o in opts] if prune_configs else None
+    plan = sync.diff(combos, desired, live_configs, live_variants, own)
+
+    # 1) configs: create missing combinations (global conf_NNN), delete stale ones
+    entries  = [(alias_name(i), render_alias(alias_name(i), product.definition, refs))
+                for i, refs in plan["config_creates"]]
+    entries += [(f"del_{n:03}", render_delete(f"del_{n:03}", cid))
+                for n, cid in enumerate(plan["config_deletes"], start=1)]
+    if entries:
+        manifest = write_batches(entries, prefix="sync_configs", operation="SyncConfigurations")
+        for b in manifest["batches"]:
+            print(f"Wrote {b['file']} ({b['first_alias']}..{b['last_alias']})", file=sys.stderr)
+
+    # 2) variants: new ones need a config id that already exists
+    creates, pending = [], []
+    for d in plan["variant_creates"]:
+        config_id = live_configs.get(d.refs)
+        if config_id:
+            creates.append(variant_input(product.option_id, d.title, d.price, d.weight, config_id))
+        else:
+            pending.append(d.title)
+    updates = []
+    for live, d in plan["variant_updates"]:
+        v = variant_input(product.option_id, d.title, d.price, d.weight, live.config_id)
+        v["id"] = live.id
+        updates.append(v)
+
+    if creates:
+        write_operation("sync_variants_create", sync.VARIANT_CREATE_MUTATION,
+                        {"productId": product.product_id, "variants": creates})
+    if updates:
+        write_operation("sync_variants_update", sync.VARIANT_UPDATE_MUTATION,
+                        {"productId": product.product_id, "variants": updates})
+    if plan["variant_deletes"]:
+        write_operation("sync_variants_delete", sync.VARIANT_DELETE_MUTATION,
+                        {"productId": product.product_id, "variantsIds": plan["variant_deletes"]})
+
+    summary = sync.summary(plan, unmanaged)
+    summary["pending_config"] = pending
+    with open("sync_plan.json", "w") as out:
+        json.dump(summary, out, indent=2, ensure_ascii=False)
+    print(f"Sync: {summary['config_creates']} config creates, {summary['config_deletes']} config deletes, "
+          f"{len(creates)} variant creates ({len(pending)} waiting for configs), "
+          f"{summary['variant_updates']} updates, {summary['variant_deletes']} deletes, "
+          f"{summary['unchanged']} unchanged ➞ sync_plan.json", file=sys.stderr)
@@ -0,0 +1,101 @@
+"""Exact integer price/weight matrix over a combination space.
+
+Every option's price is converted once to integer cents and its weight to
+integer grams.  Totals for *all* combinations are then one broadcast sum per
+dimension, flattened in the same mixed-radix order as ``CombinationSpace``,
+so ``matrix.cents[i]`` is the price of ``space[i]`` with no float drift.
+
+NumPy is used when installed; otherwise the same sums are built into
+``array("q")`` columns in pure Python.
+"""
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
+
+from .instrument import stage
+
+GRAMS_PER_UNIT = {
+    "GRAMS":     Decimal(1),
+    "KILOGRAMS": Decimal(1000),
+    "OUNCES":    Decimal("28.349523125"),
+    "POUNDS":    Decimal("453.59237"),
+}
+
+
+def price_cents(price):
+    """``6.6``, ``"6.60"`` and ``Decimal("6.6")`` all become ``660``."""
+    return int((Decimal(str(price)) * 100).quantize(Decimal(1), ROUND_HALF_UP))
+
+
+def weight_grams(value, unit="GRAMS"):
+    if value is None:
+        return 0
+    try:
+        factor = GRAMS_PER_UNIT[unit]
+    except KeyError:
+        raise ValueError(f"unknown weight unit {unit!r}") from None
+    return int((Decimal(str(value)) * factor).quantize(Decimal(1), ROUND_HALF_UP))
+
+
+def format_cents(cents):
+    """``660`` → ``"6.60"``."""
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{frac:02}"
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _outer_sum(columns, np):
+    """Flat row-major sum over the cartesian product of ``columns``."""
+    if np is not None:
+        total = np.zeros((), dtype=np.int64)
+        for col in columns:
+            total = np.add.outer(total, np.asarray(col, dtype=np.int64))
+        return total.ravel()
+    total = array("q", [0])
+    for col in columns:
+        total = array("q", (t + c for t in total for c in col))
+    return total
+
+
+class PriceMatrix:
+    """``cents`` / ``grams`` columns indexed like the space they were built from."""
+    __slots__ = ("radices", "cents", "grams", "backend")
+
+    def __init__(self, dim_cents, dim_grams=None, use_numpy=None):
+        np = _numpy() if use_numpy in (None, True) else None
+        if use_numpy and np is None:
+            raise ImportError("numpy is not installed")
+        dim_cents = [list(d) for d in dim_cents]
+        if dim_grams is None:
+            dim_grams = [[0] * len(d) for d in dim_cents]
+        self.radices = tuple(len(d) for d in dim_cents)
+        with stage("price matrix", radices=list(self.radices)):
+            self.cents = _outer_sum(dim_cents, np)
+            self.grams = _outer_sum(dim_grams, np)
+        self.backend = "numpy" if np is not None else "python"
+
+    @classmethod
+    def from_space(cls, space, use_numpy=None):
+        """Build from a space whose dimension values carry ``cents``/``grams``."""
+        return cls([[o.cents for o in d] for d in space.dims],
+                   [[o.grams for o in d] for d in space.dims], use_numpy)
+
+    def __len__(self):
+        return len(self.cents)
+
+    def price(self, index):
+        return int(self.cents[index])
+
+    def weight(self, index):
+        return int(self.grams[index])
+
+    def prices(self, start=0, stop=None):
+        """Plain ints for ``start..stop-1``."""
+        return [int(c) for c in self.cents[start:stop]]
@@ -0,0 +1,370 @@
+"""Variants from the ``configuration_value`` / ``configuration_option`` exports.
+
+The logic behind ``helper-scripts/create-product-variables/generate_product-varients.py``
+as functions: nothing is read or written at import time, so the steps can be
+reused (and timed) from ``python -m catalog`` or other scripts.  Progress goes
+through ``log`` (``print`` by default; pass ``None`` to stay quiet).
+"""
+import itertools
+import json
+from decimal import Decimal
+
+from . import codecs
+from .cache import track, write_text
+from .compress import equivalence_classes
+from .instrument import count, count_file, stage, timed
+from .jsonl import bulk_variant_lines, write_jsonl, write_variables_json
+from .metaobjects import Catalog
+from .pricing import PriceMatrix, format_cents, price_cents
+from .resolve import Resolver
+
+# Known name variations that share no normalized key with their entry
+# ("40 × 80 cm" / "40 X 80 Cm" or "Mesh Bag" / "mesh-bag" already do)
+NAME_MAP = {
+    'No Bag': 'none',
+    'No Hangloop': 'Hangloop None'
+}
+
+
+def _silent(*args, **kwargs):
+    pass
+
+
+@timed("group values")
+def collect_values(config_values, config_options, log=print):
+    """``(values_by_option, resolver)`` from the two parsed exports.
+
+    Names are resolved to metaobject ids through a ``Resolver`` over display
+    names and ``name`` fields (``resolver.report()`` lists what did not match).
+    """
+    log = log or _silent
+    # Parse both exports once into indexed records
+    values = Catalog.from_definition(config_values['data'])
+    options = Catalog.from_definition(config_options['data'])
+
+    # Create a mapping of option_id to option_type
+    option_id_to_type = {r.id: r.display_name for r in options.records()}
+
+    log("Option ID to Type Mapping:")
+    for option_id, option_type in option_id_to_type.items():
+        log(f"- {option_id}: {option_type}")
+
+    # Index display names, names and known variations once
+    resolver = Resolver(((r.id, (r.display_name, r.get('name'))) for r in values.records()), NAME_MAP)
+
+    log("\nMetaobject Display Names to IDs:")
+    for r in values.records():
+        log(f"- {r.display_name}: {r.id}")
+
+    # Group configuration values by option type
+    values_by_option = {
+        'Towel Size': [],
+        'Printed Sides': [],
+        'Hangloop Position': [],
+        'Packaging': []
+    }
+
+    for problem in codecs.unit_problems((rec.id, rec) for rec in values.records()):
+        log(f"WARNING: {problem}")
+
+    # Process each configuration value record
+    for rec in values.records():
+        value_data = {}
+        option_id = None
+        option_type = None
+
+        # Basic information: name → metaobject ID, option_id → option type
+        if 'name' in rec:
+            value_data['name'] = rec['name']
+
+            match = resolver.lookup(value_data['name'])
+            if match:
+                value_data['metaobject_id'] = match.id
+                if match.via != 'key':
+                    log(f"Matched '{value_data['name']}' by {match.via} (score {match.score})")
+
+        if 'option_id' in rec:
+            option_id = rec['option_id']
+            value_data['option_id'] = option_id
+
+            # Get option type from option ID
+            if option_id in option_id_to_type:
+                option_type = option_id_to_type[option_id]
+
+        # Prices, weights and additional metadata to help determine the option type
+        if 'price' in rec:
+            if rec['price']:
+                value_data['price'] = codecs.money(rec['price']).amount
+            else:
+                value_data['price'] = Decimal('0.0')
+
+        if 'weight' in rec:
+            if rec['weight']:
+                # normalized to grams whatever unit the entry was saved in
+                value_data['weight'] = Decimal(codecs.weight(rec['weight']).grams)
+            else:
+                value_data['weight'] = Decimal('0.0')
+
+        # Sizes also carry their dimensions (millimetres) for the product feed
+        for key in codecs.DIMENSION_KEYS:
+            if rec.get(key):
+                value_data[f'{key}_mm'] = codecs.dimension(rec[key]).mm
+
+        if rec.get('print_sides'):
+            value_data['print_sides'] = rec['print_sides']
+            if not option_type:
+                option_type = 'Printed Sides'
+
+        if rec.get('hangloop_position'):
+            value_data['hangloop_position'] = rec['hangloop_position']
+            if not option_type:
+                option_type = 'Hangloop Position'
+
+        if rec.get('packaging'):
+            value_data['packaging'] = rec['packaging']
+            if not option_type:
+                option_type = 'Packaging'
+
+        # Additional inferences based on data patterns
+        if not option_type:
+            # For towel sizes
+            size_indicators = ['× ', 'x ', 'cm']
+            if 'name' in value_data and any(indicator in value_data['name'] for indicator in size_indicators):
+                option_type = 'Towel Size'
+            # For packaging
+            elif 'name' in value_data and any(bag_name in value_data['name'].lower() for bag_name in ['bag', 'textile', 'mesh', 'no bag']):
+                option_type = 'Packaging'
+            # For hangloop positions
+            elif 'name' in value_data and any(pos in value_data['name'].lower() for pos in ['top', 'bottom', 'left', 'right', 'center', 'side']):
+                option_type = 'Hangloop Position'
+            # For printed sides
+            elif 'name' in value_data and any(side in value_data['name'].lower() for side in ['front', 'both sides', 'side']):
+                option_type = 'Printed Sides'
+
+        # Check for "No Hangloop" option specifically
+        if 'name' in value_data and ('no hangloop' in value_data['name'].lower() or 'hangloop none' in value_data['name'].lower()):
+            option_type = 'Hangloop Position'
+
+        # Add value to appropriate category if we have all required data
+        if option_type and 'name' in value_data and 'metaobject_id' in value_data:
+            if option_type in values_by_option:
+                # Ensure we've got a price
+                if 'price' not in value_data:
+                    value_data['price'] = Decimal('0.0')
+
+                # Towel sizes carry the variant weight; never guess one
+                if option_type == 'Towel Size' and 'weight' not in value_data:
+                    raise ValueError(f"towel size {value_data['name']!r} ({value_data['metaobject_id']}) "
+                                     f"has no weight")
+
+                values_by_option[option_type].append(value_data)
+                log(f"Added value '{value_data['name']}' to option type '{option_type}'")
+        else:
+            # Debug info for items we couldn't categorize
+            if 'name' in value_data:
+                if 'metaobject_id' not in value_data:
+                    log(f"WARNING: Could not find metaobject ID for '{value_data['name']}'")
+                if not option_type:
+                    log(f"WARNING: Could not determine option type for '{value_data['name']}'")
+
+    report = resolver.report()
+    for entry in report['ambiguous']:
+        log(f"WARNING: '{entry['name']}' is ambiguous: {', '.join(entry['candidates'])}")
+    for name in report['unmatched']:
+        log(f"WARNING: no metaobject matches '{name}'")
+
+    # Check values for each option type
+    log("\nValues collected for each option type:")
+    for option_type, values in values_by_option.items():
+        log(f"{option_type}: {len(values)} values")
+        for val in values:
+            log(f"  - {val['name']}")
+
+    # A missing category would link every variant to a metaobject that does not exist
+    missing = [option_type for option_type, values in values_by_option.items() if not values]
+    if missing:
+        raise ValueError(f"no configuration values found for {', '.join(missing)}")
+
+    return values_by_option, resolver
+
+
+def is_no_hangloop(hangloop):
+    return ('no hangloop' in hangloop['name'].lower() or 'hangloop none' in hangloop['name'].lower()
+            or hangloop.get('hangloop_position') == 'none')
+
+
+@timed("fold hangloops")
+def fold_hangloops(hangloops, resolver):
+    """Fold hangloop positions into equivalence classes.
+
+    Positions with the same price become one option carrying every member ID
+    (the exact position is resolved at cart time), so no price is averaged
+    across different positions.  "Hangloop" classes come first, then "No Hangloop".
+    """
+    hangloop_classes = sorted(
+        equivalence_classes(hangloops, key=lambda h: (is_no_hangloop(h), h['price'])),
+        key=lambda kv: kv[0])
+    paid_classes = sum(1 for (without, _), _ in hangloop_classes if not without)
+
+    hangloop_options = []
+    for (without, price), members in hangloop_classes:
+        if without:
+            name = 'No Hangloop'
+        else:
+            name = 'Hangloop' if paid_classes == 1 else f"Hangloop (+{price})"
+        hangloop_options.append({
+            'name': name,
+            'price': price,
+            'metaobject_ids': [h['metaobject_id'] for h in members],
+            'is_combined': len(members) > 1
+        })
+
+    # If no explicit "No Hangloop" found, create default
+    if not any(without for (without, _), _ in hangloop_classes):
+        # Look for "Hangloop None"
+        no_hangloop_id = resolver.resolve('Hangloop None')
+        if not no_hangloop_id:
+            raise ValueError("no 'No Hangloop' / 'Hangloop None' configuration value found")
+
+        hangloop_options.append({
+            'name': 'No Hangloop',
+            'price': Decimal('0.0'),
+            'metaobject_ids': [no_hangloop_id],
+            'is_combined': False
+        })
+
+    return hangloop_options
+
+
+def variant_dimensions(config_values, config_options, log=print):
+    """``[towel_sizes, printed_sides, hangloop_options, packaging_options]``."""
+    log = log or _silent
+    values_by_option, resolver = collect_values(config_values, config_options, log)
+    dimensions = [
+        values_by_option['Towel Size'],
+        values_by_option['Printed Sides'],
+        fold_hangloops(values_by_option['Hangloop Position'], resolver),
+        values_by_option['Packaging'],
+    ]
+
+    log(f"\nNumber of variations in each category:")
+    for label, dim in zip(("Towel Sizes", "Printed Sides", "Hangloop Options", "Packaging Options"),
+                          dimensions):
+        log(f"{label}: {len(dim)}")
+    return dimensions
+
+
+def price_matrix(dimensions):
+    """Exact cent/gram totals for every combination, computed once."""
+    return PriceMatrix(
+        [[price_cents(v['price']) for v in dim] for dim in dimensions],
+        [[int(v.get('weight', 0)) for v in dim] for dim in dimensions],
+    )
+
+
+def iter_variants(dimensions, matrix, option_id, log=None):
+    """Variant inputs in combination order; nothing holds the full variant list."""
+    for i, combo in enumerate(itertools.product(*dimensions)):
+        towel_size, printed_side, hangloop, packaging = combo
+
+        # Total price (sum of all option prices) from the precomputed matrix
+        total_price = format_cents(matrix.price(i))
+
+        # Get weight from towel size (other options don't affect weight)
+        weight = towel_size.get('weight', Decimal('0.0'))
+
+        # Generate a descriptive title for debugging (not used in the API call)
+        variant_title = f"{towel_size['name']} | {printed_side['name']} | {hangloop['name']} | {packaging['name']}"
+        if log:
+            log(f"Creating variant: {variant_title}")
+
+        # Collect all metaobject IDs; "Hangloop" carries every position of its class
+        metaobject_ids = [towel_size['metaobject_id'], printed_side['metaobject_id']]
+        metaobject_ids.extend(hangloop['metaobject_ids'])
+        metaobject_ids.append(packaging['metaobject_id'])
+
+        # Create variant according to Shopify API format
+        yield {
+            "price": total_price,
+            "optionValues": [
+                {
+                    "optionId": option_id,
+                    "name": variant_title
+                }
+            ],
+            "metafields": [
+                {
+                    "key": "metadata_weight",
+                    "namespace": "custom",
+                    "type": "weight",
+                    "value": json.dumps({"value": float(weight), "unit": "GRAMS"})
+                },
+                {
+                    "key": "configuration_value_ids",
+                    "namespace": "custom",
+                    "type": "list.metaobject_reference",
+                    "value": json.dumps(metaobject_ids)
+                }
+            ]
+        }
+
+
+MUTATION = """
+mutation productVariantsBulkCreate($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
+  productVariantsBulkCreate(productId: $productId, variants: $variants) {
+    productVariants {
+      id
+      selectedOptions {
+        name
+        value
+      }
+      price
+      metafields(first: 250) {
+        edges {
+          node {
+            key
+            type
+            value
+          }
+        }
+      }
+    }
+    userErrors {
+      field
+      message
+    }
+  }
+}
+"""
+
+MUTATION_FILENAME = "product_variants_mutation.graphql"
+VARIABLES_FILENAME = "product_variants_variables.json"
+
+
+def write_files(config_values, config_options, product_id, option_id,
+                jsonl_filename="product_variants.jsonl", log=print):
+    """Write the mutation, its variables and the bulk-operation JSONL; returns the count."""
+    log = log or _silent
+    dimensions = variant_dimensions(config_values, config_options, log)
+    matrix = price_matrix(dimensions)
+    log(f"Price matrix: {len(matrix)} combinations ({matrix.backend})")
+
+    write_text(MUTATION_FILENAME, MUTATION)
+
+    with stage("write variables"), open(VARIABLES_FILENAME, 'w', encoding='utf-8') as f:
+        n = write_variables_json(f, product_id, iter_variants(dimensions, matrix, option_id, log),
+                                 ensure_ascii=False)
+    count("combinations", n)
+    count_file(VARIABLES_FILENAME)
+
+    # One variables object per line for bulkOperationRunMutation staged uploads
+    write_jsonl(bulk_variant_lines(product_id, iter_variants(dimensions, matrix, option_id)),
+                jsonl_filename)
+    track(VARIABLES_FILENAME)
+    track(jsonl_filename)
+
+    log(f"\nGenerated {n} product variants.")
+    log(f"Mutation saved to {MUTATION_FILENAME}")
+    log(f"Variables saved to {VARIABLES_FILENAME}")
+    log(f"Bulk operation lines saved to {jsonl_filename}")
+    return n
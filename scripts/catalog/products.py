@@ -0,0 +1,154 @@
+"""Generate config and variant payloads for many products in parallel.
+
+A manifest lists the products and, per product, which options of the shared
+catalog it offers::
+
+    {
+      "catalog": "metaobjects.json",
+      "out_dir": "products",
+      "gzip": false,
+      "products": [
+        {
+          "handle": "microfiber-towel",
+          "product_id": "gid://shopify/Product/...",
+          "option_id": "gid://shopify/ProductOption/...",
+          "options": {"sizeOptions": ["gid://shopify/Metaobject/..."], "printedSides": "*"}
+        }
+      ]
+    }
+
+The catalog is parsed once in the parent and handed to each worker process
+once, through the pool initializer, as plain ``Option`` tuples.  Every product
+writes into ``<out_dir>/<handle>/`` and its output depends only on its own
+entry and the catalog, so results are identical whatever the worker count.
+
+Each product also gets ``prices.json`` + ``prices.bin``, its tier/reseller
+unit price table (see ``catalog.discounts``), ``variants.dlvc``, the
+memory-mapped variant catalog (see ``catalog.binary``), and
+``variant_map.json``, which resolves exact selections to variant classes
+(see ``catalog.compress``), and ``lookup.json``, the studio's selection →
+variant id/price index (see ``catalog.lookup``; ids are filled in from
+``<out_dir>/<handle>/live_state.json`` when present).
+
+If ``<out_dir>/<handle>/configs_*.json`` responses exist, the variant JSONL
+for ``bulkOperationRunMutation`` is written as well::
+
+    python -m catalog.products products.json --workers 8
+"""
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .batching import config_entries, merge_responses, write_batches
+from .binary import write_catalog
+from .discounts import write_price_table
+from .instrument import configure
+from .jsonl import bulk_variant_lines, write_jsonl
+from .lookup import build_index, variant_ids, write_index
+from .metaobjects import load_metaobjects
+from .workflow import (compressed_variants, config_groups, config_ids_by_refs, config_space,
+                       decode_options, iter_catalog_rows, iter_price_rows, iter_variants,
+                       option_labels, select, variant_space)
+
+DEFINITION_HANDLE = "mft_configuration"
+
+_options = None
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _init_worker(options):
+    global _options
+    _options = options
+
+
+def generate_product(spec, options, out_root, gzip=False):
+    handle = spec["handle"]
+    out_dir = os.path.join(out_root, handle)
+    opts = select(options, spec.get("options"))
+
+    entries = config_entries(config_space(opts), spec.get("definition", DEFINITION_HANDLE))
+    manifest = write_batches(entries, out_dir=out_dir)
+    result = {
+        "handle": handle,
+        "product_id": spec["product_id"],
+        "configs": manifest["total_aliases"],
+        "config_batches": [b["file"] for b in manifest["batches"]],
+        "prices": write_price_table(iter_price_rows(variant_space(opts)),
+                                    os.path.join(out_dir, "prices.json")),
+    }
+
+    with open(os.path.join(out_dir, "variant_map.json"), "w") as f:
+        json.dump(compressed_variants(opts).mapping(), f, indent=2, ensure_ascii=False)
+    live_path = os.path.join(out_dir, "live_state.json")
+    live = _load(live_path) if os.path.exists(live_path) else None
+    write_index(os.path.join(out_dir, "lookup.json"),
+                build_index(compressed_variants(opts), config_groups(opts), variant_ids(live)))
+
+    responses = sorted(glob.glob(os.path.join(out_dir, "configs_*.json")))
+    config_ids = config_ids_by_refs(opts, merge_responses(_load(p) for p in responses))
+    write_catalog(os.path.join(out_dir, "variants.dlvc"),
+                  iter_catalog_rows(variant_space(opts), config_ids), option_labels(opts))
+    if responses:
+        variants = iter_variants(variant_space(opts), spec["option_id"], config_ids)
+        name = "variants.jsonl.gz" if gzip else "variants.jsonl"
+        result["variants"] = write_jsonl(bulk_variant_lines(spec["product_id"], variants),
+                                         os.path.join(out_dir, name))
+        result["variants_file"] = name
+    return result
+
+
+def _generate(job):
+    spec, out_root, gzip = job
+    return generate_product(spec, _options, out_root, gzip)
+
+
+def run(manifest_path, workers=None):
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    manifest = _load(manifest_path)
+
+    specs = manifest["products"]
+    handles = [s["handle"] for s in specs]
+    dupes = sorted({h for h in handles if handles.count(h) > 1})
+    if dupes:
+        raise ValueError(f"duplicate product handles: {dupes}")
+
+    options = decode_options(load_metaobjects(os.path.join(base, manifest["catalog"])))
+    out_root = os.path.join(base, manifest.get("out_dir", "products"))
+    jobs = [(s, out_root, manifest.get("gzip", False)) for s in specs]
+
+    if workers == 1:
+        _init_worker(options)
+        results = [_generate(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(options,)) as pool:
+            results = list(pool.map(_generate, jobs))
+
+    os.makedirs(out_root, exist_ok=True)
+    with open(os.path.join(out_root, "index.json"), "w") as f:
+        json.dump({"products": results}, f, indent=2)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate payloads for every product in a manifest")
+    ap.add_argument("manifest")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="worker processes (default: CPU count, 1 = in-process)")
+    ap.add_argument("--trace", help="per-stage timings on stderr + Chrome trace JSON "
+                                    "(in-process work only; use --workers 1)")
+    args = ap.parse_args()
+    configure(args.trace)
+    for r in run(args.manifest, args.workers):
+        extra = f", {r['variants']} variants" if "variants" in r else ""
+        print(f"{r['handle']}: {r['configs']} configs in {len(r['config_batches'])} batches{extra}")
+
+
+if __name__ == "__main__":
+    main()
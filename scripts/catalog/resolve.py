@@ -0,0 +1,129 @@
+"""Resolve free-text option names to metaobject ids through prebuilt indexes.
+
+Names in the exports drift between spellings — ``"40 × 80 cm"`` vs the
+``"40 X 80 Cm"`` display name, ``"Mesh Bag"`` vs the ``mesh-bag`` handle.
+Instead of scanning every metaobject per name, ``Resolver`` builds three
+indexes once:
+
+* normalized key — casefolded, ``×`` → ``x``, punctuation collapsed, so
+  names and handles of the same entry share one key;
+* aliases — explicit spellings that share no key (``"No Bag"`` → ``none``);
+* character trigrams — only consulted when the first two miss.  Candidates
+  come from the query's *rarest* trigrams (a gram shared by thousands of
+  keys, like ``" x "``, says nothing), so a fuzzy lookup scores a few
+  hundred keys however large the catalog is.
+
+Lookups are dict hits; every miss or tie is kept for ``report()``::
+
+    resolver = Resolver([(rec.id, [rec.display_name, rec.get("name")]) ...], NAME_MAP)
+    resolver.resolve("40 × 80 cm")   # → "gid://shopify/Metaobject/..."
+    resolver.report()                # {"unmatched": [...], "ambiguous": [...], ...}
+"""
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+Match = namedtuple("Match", "id via score")
+
+# fraction of shared trigrams (Dice) a fuzzy match needs, and the lead it
+# needs over the runner-up to count as unambiguous
+MIN_SCORE = 0.6
+MIN_LEAD  = 0.1
+# candidate keys a fuzzy lookup may score
+MAX_CANDIDATES = 256
+
+
+def normalize(name):
+    """``"40 × 80 cm"``, ``"40 X 80 Cm"`` and ``"40-x-80-cm"`` → ``"40 x 80 cm"``."""
+    s = unicodedata.normalize("NFKC", name).casefold().replace("×", "x")
+    return " ".join(re.split(r"[^0-9a-z]+", s)).strip()
+
+
+def _pad(key):
+    return f"  {key} "
+
+
+def trigrams(key):
+    padded = _pad(key)
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Resolver:
+    def __init__(self, entries, aliases=None):
+        """``entries`` yields ``(id, names)``; ``aliases`` maps name → known name."""
+        self._keys = {}        # normalized key → {id}
+        self._grams = {}       # trigram → [key]
+        self._sizes = {}       # key → number of distinct trigrams
+        for id, names in entries:
+            for name in names:
+                if name:
+                    self._keys.setdefault(normalize(name), set()).add(id)
+        for key in self._keys:
+            grams = trigrams(key)
+            self._sizes[key] = len(grams)
+            for g in grams:
+                self._grams.setdefault(g, []).append(key)
+        self._aliases = {}
+        for name, target in (aliases or {}).items():
+            ids = self._keys.get(normalize(target))
+            if ids:
+                self._aliases[normalize(name)] = ids
+        self._seen = {}        # name → Match or None
+        self.ambiguous = {}    # name → [candidate ids]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def lookup(self, name):
+        """``Match`` for ``name`` or ``None``; ambiguous names are recorded."""
+        if name in self._seen:
+            return self._seen[name]
+        key = normalize(name)
+        ids, via = self._keys.get(key), "key"
+        if not ids:
+            ids, via = self._aliases.get(key), "alias"
+        match = self._unique(name, ids, via, 1.0) if ids else self._fuzzy(name, key)
+        self._seen[name] = match
+        return match
+
+    def resolve(self, name, default=None):
+        match = self.lookup(name)
+        return match.id if match else default
+
+    def _unique(self, name, ids, via, score):
+        if len(ids) > 1:
+            self.ambiguous[name] = sorted(ids)
+            return None
+        return Match(next(iter(ids)), via, score)
+
+    def _fuzzy(self, name, key):
+        query = trigrams(key)
+        candidates = set()
+        for postings in sorted((self._grams.get(g, ()) for g in query), key=len):
+            if candidates and len(candidates) + len(postings) > MAX_CANDIDATES:
+                break
+            candidates.update(postings[:MAX_CANDIDATES])
+        # shared grams by substring test on the padded key — no per-key gram sets
+        scored = sorted(((2 * sum(g in padded for g in query) / (len(query) + self._sizes[k]), k)
+                         for k, padded in ((k, _pad(k)) for k in candidates)), reverse=True)
+        if not scored or scored[0][0] < MIN_SCORE:
+            return None
+        best = scored[0][0]
+        ids = set()
+        for score, k in scored:
+            if best - score >= MIN_LEAD:
+                break
+            ids |= self._keys[k]
+        return self._unique(name, ids, "trigram", round(best, 3))
+
+    def report(self):
+        """Structured summary of every name looked up so far."""
+        matches = [m for m in self._seen.values() if m]
+        return {
+            "matched": len(matches),
+            "by": dict(Counter(m.via for m in matches)),
+            "fuzzy": sorted((n, m.id, m.score) for n, m in self._seen.items()
+                            if m and m.via == "trigram"),
+            "ambiguous": [{"name": n, "candidates": ids} for n, ids in sorted(self.ambiguous.items())],
+            "unmatched": sorted(n for n, m in self._seen.items() if m is None and n not in self.ambiguous),
+        }
@@ -0,0 +1,122 @@
+"""Send many variable payloads for one GraphQL document concurrently."""
+import asyncio
+import json
+import os
+
+from .adminapi import TIMEOUT, AdminClient, user_errors
+from .batching import remap_response
+
+
+def _outcome(name, resp):
+    if resp.get("errors"):
+        return {"name": name, "status": "failed",
+                "error": "; ".join(e.get("message", "") for e in resp["errors"])}
+    errs = user_errors(resp)
+    ids = []
+    for r in (resp.get("data") or {}).values():
+        if r and r.get("metaobject"):
+            ids.append(r["metaobject"]["id"])
+        ids += [v["id"] for v in (r or {}).get("productVariants") or []]
+    return {"name": name, "status": "user_error" if errs else "ok",
+            "ids": ids, "userErrors": errs}
+
+
+async def _send_one(client, query, name, variables, cost=None):
+    try:
+        resp = await client.execute(query, variables, cost)
+    except Exception as exc:  # reported in the summary, never fatal for the batch
+        return {"name": name, "status": "failed", "error": str(exc)}
+    return _outcome(name, resp)
+
+
+async def send_all(client, query, jobs, concurrency=8, on_result=None):
+    """Run ``(name, variables)`` jobs with at most ``concurrency`` in flight.
+
+    ``on_result`` is called with each result as soon as it arrives (e.g. to
+    append it to a journal before the whole batch is done).
+    """
+    gate = asyncio.Semaphore(concurrency)
+
+    async def guarded(name, variables):
+        async with gate:
+            result = await _send_one(client, query, name, variables)
+        if on_result:
+            on_result(result)
+        return result
+
+    results = await asyncio.gather(*(guarded(n, v) for n, v in jobs))
+    return summarize(results, client.retries)
+
+
+def summarize(results, retries=0):
+    return {
+        "sent": len(results),
+        "ok": sum(r["status"] == "ok" for r in results),
+        "user_errors": sum(r["status"] == "user_error" for r in results),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "retries": retries,
+        "results": sorted(results, key=lambda r: r["name"]),
+    }
+
+
+def variable_jobs(var_dir):
+    for filename in sorted(os.listdir(var_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(var_dir, filename)) as f:
+                yield filename[:-len(".json")], json.load(f)
+
+
+async def send_variable_dir(url, token, gql_path, var_dir, concurrency=8, pool_size=4,
+                            timeout=TIMEOUT):
+    with open(gql_path) as f:
+        query = f.read()
+    async with AdminClient(url, token, pool_size=pool_size, timeout=timeout) as client:
+        return await send_all(client, query, list(variable_jobs(var_dir)), concurrency)
+
+
+async def send_manifest(client, manifest_path, out_prefix="configs", concurrency=4):
+    """Send every batch of a configs manifest, literal or ``--params``.
+
+    Each response is written to ``<out_prefix>_NNN.json`` — parameterized
+    ones remapped from slots to ``conf_NNN`` aliases, so they merge and
+    journal exactly like responses to the literal documents.  The batch's
+    estimated cost is handed to the client bucket up front.  Returns one
+    ``_send_one``-style result per batch, named by its response path.
+    """
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    params = manifest.get("mode") == "params"
+    documents = {}
+    for name in manifest.get("documents", []):
+        with open(os.path.join(base, name)) as f:
+            documents[name] = f.read()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def send(n, batch):
+        with open(os.path.join(base, batch["file"])) as f:
+            if params:
+                query, variables = documents[batch["document"]], json.load(f)
+            else:
+                query, variables = f.read(), None
+        path = f"{out_prefix}_{n:03}.json"
+        async with gate:
+            try:
+                resp = await client.execute(query, variables, batch.get("estimated_cost"))
+            except Exception as exc:
+                return {"name": path, "status": "failed", "error": str(exc)}
+        if params:
+            resp = remap_response(resp, batch["slots"])
+        with open(path, "w") as out:
+            json.dump(resp, out, indent=2, ensure_ascii=False)
+        return _outcome(path, resp)
+
+    return await asyncio.gather(*(send(n, b) for n, b in enumerate(manifest["batches"], start=1)))
+
+
+async def send_config_batches(url, token, manifest_path, out_prefix="configs", concurrency=4,
+                              pool_size=4, timeout=TIMEOUT):
+    """``send_manifest`` over a fresh client; returns the ``summarize`` of the batches."""
+    async with AdminClient(url, token, pool_size=pool_size, timeout=timeout) as client:
+        results = await send_manifest(client, manifest_path, out_prefix, concurrency)
+        return summarize(results, client.retries)
@@ -0,0 +1,276 @@
+"""Local shipping-rate service (weight bracket × country zone).
+
+Checkout prices shipping through an external carrier-service call based on
+cart weight and destination country.  This module is a local stand-in:
+
+* ``build`` precomputes the full rate table — every service × zone × weight
+  bracket in integer cents — together with the gram weight of every variant
+  of the catalog, and writes it to one JSON file;
+* ``RateService`` answers requests from that table through an LRU cache keyed
+  on ``(cart grams, country code)``, so a request never recomputes anything;
+* ``serve`` exposes it with Shopify's carrier-service callback shape
+  (``{"rate": {"destination": {...}, "items": [...]}}`` → ``{"rates": [...]}``).
+
+::
+
+    python -m catalog.shipping build create-varients-v2/metaobjects.json --tariff tariff.json
+    python -m catalog.shipping serve shipping_rates.json --port 8788
+    python -m catalog.shipping bench shipping_rates.json
+
+There are no built-in prices: ``build`` reads the carrier's tariff from the
+JSON file given by ``--tariff`` (or ``SHIPPING_TARIFF``) and refuses to run
+without one.  It maps every zone to every service's base price and price per
+started kg, both in integer cents::
+
+    {"DE":    {"standard": [base, per_kg], "express": [base, per_kg]},
+     "EU":    {...}, "EUROPE": {...}, "WORLD": {...}}
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .metaobjects import load_metaobjects
+from .pricing import PriceMatrix
+from .workflow import decode_options, variant_space
+
+# ——— CONFIG ———
+CURRENCY = "EUR"
+SERVICES = {
+    "standard": "Standard Shipping & Production",
+    "express":  "Express Shipping & Production",
+}
+# upper bound (grams, inclusive) of each bracket; heavier carts add OVERFLOW_STEP_G steps
+BRACKETS_G = (500, 1000, 2000, 5000, 10000, 20000, 31500)
+OVERFLOW_STEP_G = 10000
+ZONES = {
+    "DE": ("DE",),
+    "EU": ("AT", "BE", "BG", "CY", "CZ", "DK", "EE", "ES", "FI", "FR", "GR", "HR", "HU",
+           "IE", "IT", "LT", "LU", "LV", "MT", "NL", "PL", "PT", "RO", "SE", "SI", "SK"),
+    "EUROPE": ("CH", "GB", "IS", "LI", "NO"),
+}
+DEFAULT_ZONE = "WORLD"
+TARIFF_ENV = "SHIPPING_TARIFF"   # tariff JSON used when --tariff is not given
+CACHE_SIZE = 65536
+# ——————————
+
+
+def normalize_country(country):
+    return (country or "").strip().upper()
+
+
+def _bracket_cents(base, per_kg, grams):
+    return base + per_kg * -(-grams // 1000)
+
+
+def load_tariff(path):
+    """Zone → service → ``(base cents, cents per started kg)`` from a tariff JSON file.
+
+    Raises ``ValueError`` unless every zone (``ZONES`` and ``DEFAULT_ZONE``)
+    prices every service with two non-negative integers.
+    """
+    if not path:
+        raise ValueError(f"no shipping tariff configured: pass --tariff or set {TARIFF_ENV}")
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    tariff, missing = {}, []
+    for zone in (*ZONES, DEFAULT_ZONE):
+        for service in SERVICES:
+            price = (raw.get(zone) or {}).get(service)
+            if (not isinstance(price, list) or len(price) != 2
+                    or not all(isinstance(c, int) and c >= 0 for c in price)):
+                missing.append(f"{zone}.{service}")
+                continue
+            tariff.setdefault(zone, {})[service] = tuple(price)
+    if missing:
+        raise ValueError(f"{path}: no [base cents, cents per kg] for {', '.join(missing)}")
+    return tariff
+
+
+def build_table(options, tariff):
+    """The rate table for a decoded catalog and ``load_tariff`` prices, ready for ``json.dump``."""
+    space = variant_space(options)
+    matrix = PriceMatrix.from_space(space)
+    variants = {" | ".join(o.label for o in combo): matrix.weight(i)
+                for i, combo in enumerate(space)}
+    rates = {
+        service: {
+            zone: {
+                "brackets": [_bracket_cents(*tariff[zone][service], g) for g in BRACKETS_G],
+                "overflow": tariff[zone][service][1] * (OVERFLOW_STEP_G // 1000),
+            }
+            for zone in tariff
+        }
+        for service in SERVICES
+    }
+    return {
+        "currency": CURRENCY,
+        "services": SERVICES,
+        "brackets_g": list(BRACKETS_G),
+        "overflow_step_g": OVERFLOW_STEP_G,
+        "zones": {country: zone for zone, countries in ZONES.items() for country in countries},
+        "default_zone": DEFAULT_ZONE,
+        "rates": rates,
+        "variant_grams": variants,
+    }
+
+
+class RateService:
+    def __init__(self, table, cache_size=CACHE_SIZE):
+        self.currency = table["currency"]
+        self.services = table["services"]
+        self.brackets = table["brackets_g"]
+        self.step = table["overflow_step_g"]
+        self.zones = table["zones"]
+        self.default_zone = table["default_zone"]
+        self.rates = table["rates"]
+        self.variant_grams = table["variant_grams"]
+        self._cached_quote = lru_cache(maxsize=cache_size)(self._quote)
+
+    @classmethod
+    def load(cls, path, cache_size=CACHE_SIZE):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), cache_size)
+
+    def zone(self, country):
+        return self.zones.get(normalize_country(country), self.default_zone)
+
+    def quote(self, grams, country):
+        """``((service, cents), ...)`` for a cart of ``grams`` shipped to ``country``."""
+        # " de", "de" and "DE" share one cache entry
+        return self._cached_quote(grams, normalize_country(country))
+
+    def cache_info(self):
+        return self._cached_quote.cache_info()
+
+    def _quote(self, grams, country):
+        zone = self.zone(country)
+        k = bisect.bisect_left(self.brackets, grams)
+        quotes = []
+        for service in self.services:
+            table = self.rates[service][zone]
+            if k < len(self.brackets):
+                cents = table["brackets"][k]
+            else:
+                extra = -(-(grams - self.brackets[-1]) // self.step)
+                cents = table["brackets"][-1] + extra * table["overflow"]
+            quotes.append((service, cents))
+        return tuple(quotes)
+
+    def item_grams(self, item):
+        """Weight of one carrier-service line; falls back to the variant title in ``name``."""
+        grams = item.get("grams")
+        if grams is None:
+            title = item.get("name", "").rpartition(" - ")[2]
+            grams = self.variant_grams.get(title, 0)
+        return grams * item.get("quantity", 1)
+
+    def carrier_response(self, body):
+        rate = body["rate"]
+        grams = sum(self.item_grams(i) for i in rate.get("items", ())
+                    if i.get("requires_shipping", True))
+        country = (rate.get("destination") or {}).get("country")
+        return {"rates": [
+            {"service_name": self.services[service], "service_code": service,
+             "total_price": str(cents), "currency": rate.get("currency", self.currency),
+             "description": f"{grams} g to {country}"}
+            for service, cents in self.quote(grams, country)
+        ]}
+
+
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                resp, status = service.carrier_response(json.loads(self.rfile.read(length))), 200
+            except (KeyError, TypeError, ValueError) as exc:
+                resp, status = {"errors": [f"bad rate request: {exc}"]}, 400
+            resp = json.dumps(resp).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(resp)))
+            self.end_headers()
+            self.wfile.write(resp)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(service, host="127.0.0.1", port=0):
+    """Start the service on a background thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench(service, requests=200_000, carts=5000, seed=1):
+    """Latency percentiles (µs) of ``quote`` over a realistic mix of repeated carts."""
+    rng = random.Random(seed)
+    weights = list(service.variant_grams.values()) or [120]
+    countries = list(service.zones) + ["US", "JP"]
+    pool = [(rng.choice(weights) * rng.randint(1, 8000), rng.choice(countries))
+            for _ in range(carts)]
+    samples = []
+    for _ in range(requests):
+        grams, country = rng.choice(pool)
+        t = time.perf_counter_ns()
+        service.quote(grams, country)
+        samples.append(time.perf_counter_ns() - t)
+    samples.sort()
+    pct = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))] / 1000
+    info = service.cache_info()
+    return {"requests": requests, "p50_us": pct(0.50), "p99_us": pct(0.99),
+            "max_us": samples[-1] / 1000, "hits": info.hits, "misses": info.misses}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="precompute the rate table from metaobjects.json")
+    b.add_argument("catalog")
+    b.add_argument("--tariff", default=os.environ.get(TARIFF_ENV),
+                   help=f"carrier tariff JSON (or {TARIFF_ENV}); required")
+    b.add_argument("--out", default="shipping_rates.json")
+    s = sub.add_parser("serve", help="answer carrier-service rate requests")
+    s.add_argument("table")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8788)
+    n = sub.add_parser("bench", help="measure in-process quote latency")
+    n.add_argument("table")
+    n.add_argument("--requests", type=int, default=200_000)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        try:
+            tariff = load_tariff(args.tariff)
+        except ValueError as exc:
+            ap.error(str(exc))
+        table = build_table(decode_options(load_metaobjects(args.catalog)), tariff)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(table, f, indent=2, ensure_ascii=False)
+        print(f"Wrote {args.out} ({len(table['variant_grams'])} variants, "
+              f"{len(BRACKETS_G)} brackets × {len(tariff)} zones × {len(SERVICES)} services)")
+    elif args.cmd == "serve":
+        server = serve(RateService.load(args.table), args.host, args.port)
+        print(f"Shipping rates on http://{args.host}:{server.server_port}/")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        print(json.dumps(bench(RateService.load(args.table), args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
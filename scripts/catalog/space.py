@@ -0,0 +1,113 @@
+"""Random access into the cartesian product of option dimensions.
+
+``itertools.product(a, b, c)`` enumerates in mixed-radix order: the last
+dimension changes fastest.  ``CombinationSpace`` maps any 0-based index to
+the same combination (and back) in O(dimensions), so workers can generate
+arbitrary index ranges — or rebuild a single failed ``conf_NNN`` — without
+enumerating everything before it.
+"""
+import itertools
+
+
+class CombinationSpace:
+    __slots__ = ("dims", "radices", "strides", "size", "_positions")
+
+    def __init__(self, *dims):
+        self.dims = tuple(tuple(d) for d in dims)
+        self.radices = tuple(len(d) for d in self.dims)
+        strides, stride = [], 1
+        for radix in reversed(self.radices):
+            strides.append(stride)
+            stride *= radix
+        self.strides = tuple(reversed(strides))
+        self.size = stride if self.dims else 0
+        self._positions = None
+
+    def __len__(self):
+        return self.size
+
+    def digits(self, index):
+        """Per-dimension positions of the combination at ``index``."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(f"combination {index} out of range 0..{self.size - 1}")
+        return tuple((index // s) % r for s, r in zip(self.strides, self.radices))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step == 1:
+                return list(self.range(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        return tuple(d[i] for d, i in zip(self.dims, self.digits(index)))
+
+    def rank(self, digits):
+        """Inverse of ``digits``."""
+        index = 0
+        for pos, stride, radix in zip(digits, self.strides, self.radices):
+            if not 0 <= pos < radix:
+                raise IndexError(f"position {pos} out of range 0..{radix - 1}")
+            index += pos * stride
+        return index
+
+    def index(self, combo):
+        """Index of ``combo`` (a tuple of dimension values)."""
+        if self._positions is None:
+            # values must be hashable; the first occurrence wins like list.index
+            self._positions = [{} for _ in self.dims]
+            for positions, dim in zip(self._positions, self.dims):
+                for i, v in enumerate(dim):
+                    positions.setdefault(v, i)
+        try:
+            return self.rank([p[v] for p, v in zip(self._positions, combo)])
+        except KeyError as exc:
+            raise ValueError(f"{exc.args[0]!r} is not an option value") from None
+
+    def range(self, start, stop=None):
+        """Combinations ``start..stop-1`` in product order.
+
+        Only ``start`` is unranked; after that the digits are carried like an
+        odometer, so each further combination costs O(1) amortised.
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        if start >= stop:
+            return
+        pos = list(self.digits(start))
+        last = len(self.dims) - 1
+        for _ in range(stop - start):
+            yield tuple(d[p] for d, p in zip(self.dims, pos))
+            k = last
+            while k >= 0:
+                pos[k] += 1
+                if pos[k] < self.radices[k]:
+                    break
+                pos[k] = 0
+                k -= 1
+
+    def __iter__(self):
+        return itertools.product(*self.dims)
+
+    def shards(self, count):
+        """Split ``0..size`` into ``count`` contiguous ``(start, stop)`` ranges."""
+        step, extra = divmod(self.size, count)
+        start = 0
+        for k in range(count):
+            stop = start + step + (k < extra)
+            if stop > start:
+                yield start, stop
+            start = stop
+
+
+
+def parse_range(text, size):
+    """``"17:40"`` (1-based, inclusive, like ``conf_017..conf_040``) → 0-based ``(start, stop)``.
+
+    Either end may be omitted: ``"250:"``, ``":10"``, or a single ``"17"``.
+    """
+    first, sep, last = text.partition(":")
+    start = int(first) - 1 if first else 0
+    stop = (int(last) if last else size) if sep else start + 1
+    if not 0 <= start < stop <= size:
+        raise ValueError(f"range {text!r} outside 1..{size}")
+    return start, stop
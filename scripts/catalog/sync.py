@@ -0,0 +1,224 @@
+"""Diff generated configurations/variants against live shop state.
+
+Every combination is identified by the tuple of option metaobject ids it
+references.  Desired and live entries are matched on that key and compared
+by a fingerprint over ids, price (in cents), weight and title, so a run only
+emits the creates, updates and deletes needed to converge.
+
+Live state is the response of ``live_state.graphql``::
+
+    data.product.variants      {id title price variations{value} weight{value}}
+    data.configurations        {id configurations{value}}
+
+``edges { node }`` and ``nodes`` connection shapes are both accepted.  A
+connection stops at 250 nodes, so an export may be several pages (run the
+query again with the previous ``endCursor`` as ``$variantsAfter`` /
+``$configsAfter``); the last page must report ``hasNextPage: false`` for
+both connections, otherwise the state is refused as truncated.
+
+Stale configurations are only deleted on request (``prune_options``), and
+then only those built entirely from this product's option values: the
+``mft_configuration`` definition is shared with other products.
+"""
+import hashlib
+import json
+
+from . import codecs
+from .instrument import timed
+from .pricing import price_cents
+
+VARIANT_CREATE_MUTATION = """
+mutation SyncVariantsCreate($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
+  productVariantsBulkCreate(productId: $productId, variants: $variants) {
+    productVariants { id title }
+    userErrors { field message }
+  }
+}
+""".strip()
+
+VARIANT_UPDATE_MUTATION = """
+mutation SyncVariantsUpdate($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
+  productVariantsBulkUpdate(productId: $productId, variants: $variants) {
+    productVariants { id title }
+    userErrors { field message }
+  }
+}
+""".strip()
+
+VARIANT_DELETE_MUTATION = """
+mutation SyncVariantsDelete($productId: ID!, $variantsIds: [ID!]!) {
+  productVariantsBulkDelete(productId: $productId, variantsIds: $variantsIds) {
+    userErrors { field message }
+  }
+}
+""".strip()
+
+
+def normalize_weight(weight):
+    """``(value, unit)`` or the metafield JSON string → grams, so ``0.12 KILOGRAMS``
+    and ``120.0 GRAMS`` fingerprint the same."""
+    if weight is None or isinstance(weight, int):  # int: already grams
+        return weight
+    if isinstance(weight, str):
+        return codecs.weight(weight).grams
+    return codecs.weight_of(*weight).grams
+
+
+def fingerprint(refs, price, weight, title):
+    payload = json.dumps([list(refs), price_cents(price), normalize_weight(weight), title],
+                         ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+class Desired:
+    """One variant the generator wants to exist."""
+    __slots__ = ("refs", "price", "weight", "title")
+
+    def __init__(self, refs, price, weight, title):
+        self.refs = tuple(refs)
+        self.price = price
+        self.weight = weight
+        self.title = title
+
+    def fingerprint(self):
+        return fingerprint(self.refs, self.price, self.weight, self.title)
+
+
+class Live:
+    """One variant as it currently exists in the shop."""
+    __slots__ = ("id", "refs", "price", "weight", "title", "config_id")
+
+    def __init__(self, id, refs, price, weight, title, config_id):
+        self.id = id
+        self.refs = refs
+        self.price = price
+        self.weight = weight
+        self.title = title
+        self.config_id = config_id
+
+    def fingerprint(self):
+        return fingerprint(self.refs, self.price, self.weight, self.title)
+
+
+class TruncatedLiveState(ValueError):
+    """The export stops before the end of a connection."""
+
+
+def _nodes(conn):
+    if not conn:
+        return []
+    if conn.get("nodes") is not None:
+        return conn["nodes"]
+    return [e["node"] for e in conn.get("edges", [])]
+
+
+def _value(field):
+    return (field or {}).get("value")
+
+
+def _pages(resp):
+    return resp if isinstance(resp, list) else [resp]
+
+
+def _connections(data):
+    return {"product.variants": (data.get("product") or {}).get("variants"),
+            "configurations": data.get("configurations")}
+
+
+@timed("parse live state")
+def parse_live_state(resp):
+    """Return ``(configs, variants, unmanaged)`` from a live-state export.
+
+    ``resp`` is one response or the list of page responses in order.
+    ``configs`` maps refs → config id, ``variants`` is a list of ``Live`` and
+    ``unmanaged`` lists variant ids without a resolvable configuration.
+    Raises ``TruncatedLiveState`` if the last page has more to come.
+    """
+    pages = [page["data"] for page in _pages(resp)]
+    for name, conn in _connections(pages[-1]).items():
+        if ((conn or {}).get("pageInfo") or {}).get("hasNextPage"):
+            raise TruncatedLiveState(f"{name} continues after the last page; "
+                                     "export every page of live_state.graphql")
+
+    configs, refs_by_config = {}, {}
+    for data in pages:
+        for node in _nodes(data.get("configurations")):
+            raw = _value(node.get("configurations"))
+            if not raw:
+                continue
+            refs = tuple(json.loads(raw))
+            refs_by_config[node["id"]] = refs
+            configs.setdefault(refs, node["id"])
+
+    variants, unmanaged, seen = [], [], set()
+    for node in (n for data in pages for n in _nodes(_connections(data)["product.variants"])):
+        if node["id"] in seen:
+            continue
+        seen.add(node["id"])
+        config_id = _value(node.get("variations"))
+        refs = refs_by_config.get(config_id)
+        if refs is None:
+            unmanaged.append(node["id"])
+            continue
+        variants.append(Live(node["id"], refs, node.get("price"),
+                             normalize_weight(_value(node.get("weight"))),
+                             node.get("title"), config_id))
+    return configs, variants, unmanaged
+
+
+@timed("sync diff")
+def diff(desired_configs, desired_variants, live_configs, live_variants, prune_options=None):
+    """Compute the minimal plan.
+
+    ``desired_configs`` is the ordered list of config refs (its 1-based
+    position gives the stable ``conf_NNN`` alias).  Unwanted live configs
+    are deleted only when ``prune_options`` (this product's option ids) is
+    given and holds every id the config references.
+    """
+    wanted = set(desired_configs)
+    config_creates = [(i, refs) for i, refs in enumerate(desired_configs, start=1)
+                      if refs not in live_configs]
+    config_deletes = []
+    if prune_options is not None:
+        own = set(prune_options)
+        config_deletes = [cid for refs, cid in live_configs.items()
+                          if refs not in wanted and own.issuperset(refs)]
+
+    live_by_refs, variant_deletes = {}, []
+    for v in live_variants:
+        if v.refs in live_by_refs:
+            variant_deletes.append(v.id)  # duplicate of an earlier variant
+        else:
+            live_by_refs[v.refs] = v
+
+    creates, updates, unchanged = [], [], 0
+    for d in desired_variants:
+        live = live_by_refs.pop(d.refs, None)
+        if live is None:
+            creates.append(d)
+        elif live.fingerprint() != d.fingerprint():
+            updates.append((live, d))
+        else:
+            unchanged += 1
+    variant_deletes.extend(v.id for v in live_by_refs.values())
+
+    return {
+        "config_creates": config_creates,
+        "config_deletes": config_deletes,
+        "variant_creates": creates,
+        "variant_updates": updates,
+        "variant_deletes": variant_deletes,
+        "unchanged": unchanged,
+    }
+
+
+def summary(plan, unmanaged=()):
+    return {
+        "config_creates": len(plan["config_creates"]),
+        "config_deletes": len(plan["config_deletes"]),
+        "variant_creates": len(plan["variant_creates"]),
+        "variant_updates": len(plan["variant_updates"]),
+        "variant_deletes": len(plan["variant_deletes"]),
+        "unchanged": plan["unchanged"],
+        "unmanaged": list(unmanaged),
+    }
@@ -0,0 +1,180 @@
+"""``configuration_value`` metaobject entries (sizes, print sides, hangloops, packaging).
+
+``build_entries`` returns the ``metaobjectCreate`` inputs; ``write_values``
+writes the shared mutation plus one variables file per entry, as consumed by
+``send_bulk_create.py``.
+"""
+import json
+import os
+import re
+
+from . import codecs
+from .cache import write_text
+from .instrument import count_file, timed
+
+# Metaobject type for configuration_value
+TYPE_NAME = "configuration_value"
+# Existing configuration_option metaobject IDs
+OPTION_IDS = {
+    "towel_size":        "gid://shopify/Metaobject/344660902233",
+    "printed_sides":     "gid://shopify/Metaobject/344660803929",
+    "hangloop_position": "gid://shopify/Metaobject/344660935001",
+    "packaging":         "gid://shopify/Metaobject/344660967769",
+}
+
+# Helper to slugify strings for handles
+def slugify(s):
+    slug = s.lower().replace(' ', '-').replace('×', 'x')
+    return re.sub(r'[^a-z0-9\-]', '', slug)
+
+# Build all entries with only non-null fields
+def build_entries():
+    entries = []
+
+    # Common filter to drop null-valued fields
+    def filter_fields(fields):
+        return [f for f in fields if f.get('value') is not None]
+
+    # Towel sizes
+    for name, price, weight, width, height in [
+        ("40 × 80 cm",  "5.80", 120, 40, 80),
+        ("40 × 100 cm", "6.20", 160, 40, 100),
+        ("50 × 100 cm", "6.60", 200, 50, 100),
+        ("75 × 135 cm", "10.20", 300, 75, 135),
+        ("80 × 160 cm", "13.20", 470, 80, 160),
+        ("80 × 180 cm", "13.60", 470, 80, 180),
+    ]:
+        handle = slugify(name)
+        fields = [
+            {"key": "name",      "value": name},
+            {"key": "price",     "value": json.dumps({"amount": price, "currency_code": "EUR"})},
+            {"key": "weight",    "value": json.dumps({"value": weight,  "unit": "GRAMS"})},
+            {"key": "width",     "value": json.dumps({"value": width,   "unit": "CENTIMETERS"})},
+            {"key": "height",    "value": json.dumps({"value": height,  "unit": "CENTIMETERS"})},
+            {"key": "option_id", "value": OPTION_IDS["towel_size"]},
+            {"key": "print_sides",       "value": None},
+            {"key": "hangloop_position", "value": None},
+            {"key": "packaging",         "value": None},
+        ]
+        entries.append({
+            "handle": handle,
+            "input": {
+                "type": TYPE_NAME,
+                "handle": handle,
+                "fields": filter_fields(fields)
+            }
+        })
+
+    # Printed sides
+    for name, price, val in [("Front", "0.00", "Front"),
+                              ("Both sides", "0.40", "Both sides")]:
+        handle = slugify(name)
+        fields = [
+            {"key": "name",      "value": name},
+            {"key": "price",     "value": json.dumps({"amount": price, "currency_code": "EUR"})},
+            {"key": "weight",    "value": None},
+            {"key": "width",     "value": None},
+            {"key": "height",    "value": None},
+            {"key": "option_id", "value": OPTION_IDS["printed_sides"]},
+            {"key": "print_sides","value": val},
+            {"key": "hangloop_position", "value": None},
+            {"key": "packaging",         "value": None},
+        ]
+        entries.append({
+            "handle": handle,
+            "input": {
+                "type": TYPE_NAME,
+                "handle": handle,
+                "fields": filter_fields(fields)
+            }
+        })
+
+    # Hangloop positions
+    for pos in ["top-left","top-center","top-right",
+                "left-side","right-side",
+                "bottom-left","bottom-center","bottom-right",
+                "none"]:
+        handle = slugify(pos)
+        name = pos.replace('-', ' ').title()
+        price = "0.20" if pos != "none" else "0.00"
+        fields = [
+            {"key": "name",               "value": name},
+            {"key": "price",              "value": json.dumps({"amount": price, "currency_code": "EUR"})},
+            {"key": "weight",             "value": None},
+            {"key": "width",              "value": None},
+            {"key": "height",             "value": None},
+            {"key": "option_id",          "value": OPTION_IDS["hangloop_position"]},
+            {"key": "print_sides",        "value": None},
+            {"key": "hangloop_position",  "value": pos},
+            {"key": "packaging",          "value": None},
+        ]
+        entries.append({
+            "handle": handle,
+            "input": {
+                "type": TYPE_NAME,
+                "handle": handle,
+                "fields": filter_fields(fields)
+            }
+        })
+
+    # Packaging options
+    for name, price, val in [("Mesh Bag", "0.80", "mesh-bag"),
+                              ("Textile Bag","1.20","textile-bag"),
+                              ("No Bag",     "0.00","none")]:
+        handle = slugify(val)
+        fields = [
+            {"key": "name",      "value": name},
+            {"key": "price",     "value": json.dumps({"amount": price, "currency_code": "EUR"})},
+            {"key": "weight",    "value": None},
+            {"key": "width",     "value": None},
+            {"key": "height",    "value": None},
+            {"key": "option_id", "value": OPTION_IDS["packaging"]},
+            {"key": "print_sides",       "value": None},
+            {"key": "hangloop_position", "value": None},
+            {"key": "packaging",         "value": val},
+        ]
+        entries.append({
+            "handle": handle,
+            "input": {
+                "type": TYPE_NAME,
+                "handle": handle,
+                "fields": filter_fields(fields)
+            }
+        })
+
+    return entries
+
+CREATE_METAOBJECT_MUTATION = '''
+mutation CreateMetaobject($input: MetaobjectCreateInput!) {
+  metaobjectCreate(metaobject: $input) {
+    metaobject { id displayName }
+    userErrors { field message }
+  }
+}
+'''.strip()
+
+
+@timed("values")
+def write_values(gql_filename="create_metaobject.graphql", var_dir="variables", log=print):
+    """Write the universal mutation and ``<var_dir>/<handle>.json``; returns the entry count."""
+    # Ensure output directory exists
+    os.makedirs(var_dir, exist_ok=True)
+
+    # Write universal GraphQL mutation
+    write_text(gql_filename, CREATE_METAOBJECT_MUTATION + "\n")
+    log(f"Wrote universal mutation ➞ {gql_filename}")
+
+    # Generate per-entry variable JSON files; units must match the live entries
+    entries = build_entries()
+    problems = codecs.unit_problems(
+        (e['handle'], {f['key']: f['value'] for f in e['input']['fields']}) for e in entries)
+    if problems:
+        raise ValueError("unit mismatch in generated entries:\n  " + "\n  ".join(problems))
+    for e in entries:
+        path = os.path.join(var_dir, f"{e['handle']}.json")
+        # unchanged entries keep their file (see catalog.cache)
+        changed = write_text(path, json.dumps({"input": e['input']}, indent=2))
+        count_file(path)
+        log(f"Written variables ➞ {path}" if changed else f"Unchanged ➞ {path}")
+    log(f"Done: {len(entries)} files in '{var_dir}/'")
+    return len(entries)
@@ -0,0 +1,219 @@
+"""Configuration/variant combination logic of the mft_configuration workflow.
+
+Options are decoded once into small ``Option`` tuples (plain data, cheap to
+pickle), from which two spaces are built:
+
+* the *config* space — every hangloop position, zero-priced ones first;
+* the *variant* space — hangloops folded into price classes ("No Hangloop" /
+  "Hangloop", see ``catalog.compress``).
+
+Each option also carries its price in integer cents and weight in integer
+grams (decoded by ``catalog.codecs``, so weights in any unit are normalized
+to grams); variant totals come from a ``PriceMatrix`` over the space instead
+of summing floats per combination.
+"""
+import json
+import sys
+from collections import namedtuple
+
+from . import codecs
+from .batching import alias_number
+from .compress import compress
+from .instrument import count, timed
+from .metaobjects import OPTION_GROUPS
+from .pricing import PriceMatrix
+from .space import CombinationSpace
+
+Option = namedtuple("Option", "id price label weight cents grams")
+
+# field holding the human readable label of each option group
+LABEL_KEYS = {
+    "sizeOptions":      "name",
+    "printedSides":     "side",
+    "hangloopOptions":  "position",
+    "packagingOptions": "packaging",
+}
+
+METAFIELD_NS     = "custom"
+METAFLD_CFG_KEY  = "variations"
+METAFLD_CFG_TYPE = "metaobject_reference"
+METAFIELD_WT_KEY  = "metadata_weight"
+METAFIELD_WT_TYPE = "weight"
+
+
+def parse_money(s):
+    return float(codecs.money(s).amount)
+
+
+def parse_weight(s):
+    w = codecs.weight(s)
+    return float(w.value), w.unit
+
+
+def decode_option(rec, group):
+    price = codecs.money(rec["price"])
+    w = codecs.decode("weight", rec.get("weight"))
+    # the variant weight metafield is always written in grams
+    weight = (float(w.grams), "GRAMS") if w else None
+    return Option(rec.id, float(price.amount), rec.get(LABEL_KEYS.get(group, "name")), weight,
+                  price.cents, w.grams if w else 0)
+
+
+@timed("decode options")
+def decode_options(cat, groups=OPTION_GROUPS, stream=sys.stderr):
+    """``{group: (Option, ...)}`` in export order, each field decoded once.
+
+    Fields whose unit or currency differs from ``codecs.EXPECTED_UNITS`` are
+    reported on ``stream``; options priced in different currencies are an
+    error since their prices cannot be summed.
+    """
+    records = [r for g in groups for r in cat.group(g)]
+    for problem in codecs.unit_problems((r.id, r) for r in records):
+        print(f"WARNING: {problem}", file=stream)
+    currencies = {codecs.money(r["price"]).currency for r in records}
+    if len(currencies) > 1:
+        raise ValueError(f"options are priced in several currencies: {sorted(currencies)}")
+    return {g: tuple(decode_option(r, g) for r in cat.group(g)) for g in groups}
+
+
+def select(options, selection=None):
+    """Restrict each group to the ids listed in ``selection`` (in that order).
+
+    Groups missing from ``selection`` or mapped to ``"*"`` keep every option.
+    """
+    if not selection:
+        return options
+    picked = {}
+    for g, opts in options.items():
+        ids = selection.get(g, "*")
+        if ids == "*":
+            picked[g] = opts
+            continue
+        by_id = {o.id: o for o in opts}
+        missing = [i for i in ids if i not in by_id]
+        if missing:
+            raise KeyError(f"{g}: unknown option ids {missing}")
+        picked[g] = tuple(by_id[i] for i in ids)
+    return picked
+
+
+def config_groups(options):
+    """Option tuples per group in configuration-space order."""
+    hangs = options["hangloopOptions"]
+    # zero-priced hangloops first, then the priced ones
+    hangs = tuple(h for h in hangs if h.price == 0.0) + tuple(h for h in hangs if h.price > 0.0)
+    return [options["sizeOptions"], options["printedSides"], hangs, options["packagingOptions"]]
+
+
+def config_space(options):
+    return CombinationSpace(*[[o.id for o in opts] for opts in config_groups(options)])
+
+
+def hangloop_label(rep, members):
+    return "No Hangloop" if rep.cents == 0 else "Hangloop"
+
+
+# groups folded into price/weight classes; the exact value is resolved at cart time
+FOLDED_GROUPS = {"hangloopOptions": hangloop_label}
+
+
+def compressed_variants(options):
+    """Minimal variant space plus the exact-selection mapping (``catalog.compress``)."""
+    return compress(options, FOLDED_GROUPS, config_groups(options))
+
+
+def config_ids_by_refs(options, configs_resp):
+    """``{refs: config id}`` for every ``conf_NNN`` created in ``configs_resp``.
+
+    ``conf_NNN`` numbers the *config* space, so an alias is turned back into
+    its refs through ``config_space``.  A variant's config is the one with the
+    variant's own refs (a folded class is represented by one real member) —
+    never the config at the variant's position.
+    """
+    space = config_space(options)
+    ids = {}
+    for alias, result in ((configs_resp or {}).get("data") or {}).items():
+        n = alias_number(alias)
+        config_id = ((result or {}).get("metaobject") or {}).get("id")
+        if config_id and n and n <= len(space):
+            ids[space[n - 1]] = config_id
+    return ids
+
+
+def variant_space(options):
+    return compressed_variants(options).space
+
+
+def iter_combinations(space, start=0, stop=None, matrix=None):
+    """Yield ``(refs, price, (weight, unit), title)`` in variant order.
+
+    Prices are read from ``matrix`` (built from ``space`` when omitted).
+    """
+    if matrix is None:
+        matrix = PriceMatrix.from_space(space)
+    n = 0
+    try:
+        for i, (size, side, hang, pack) in enumerate(space.range(start, stop), start=start):
+            title = " | ".join([size.label, side.label, hang.label, pack.label])
+            n += 1
+            yield (size.id, side.id, hang.id, pack.id), matrix.price(i) / 100, size.weight, title
+    finally:
+        count("combinations", n)
+
+
+def iter_price_rows(space, matrix=None):
+    """``(title, base cents)`` per variant, the input of ``discounts.write_price_table``."""
+    if matrix is None:
+        matrix = PriceMatrix.from_space(space)
+    for i, combo in enumerate(space):
+        yield " | ".join(o.label for o in combo), matrix.price(i)
+
+
+def iter_catalog_rows(space, config_ids=None, matrix=None):
+    """``(refs, cents, grams, title, config id)`` per variant, for ``binary.write_catalog``.
+
+    ``config_ids`` is a ``config_ids_by_refs`` map; variants without a
+    created config get ``None``.
+    """
+    if matrix is None:
+        matrix = PriceMatrix.from_space(space)
+    config_ids = config_ids or {}
+    for i, (refs, _, _, title) in enumerate(iter_combinations(space, matrix=matrix)):
+        yield refs, matrix.price(i), matrix.weight(i), title, config_ids.get(refs)
+
+
+def option_labels(options):
+    return {o.id: o.label for opts in options.values() for o in opts}
+
+
+def variant_input(option_id, title, total, weight, config_id):
+    wt_val, wt_unit = weight
+    return {
+      "price": total,
+      "optionValues": [{
+         "optionId": option_id,
+         "name": title
+      }],
+      "metafields":[
+        {
+          "namespace": METAFIELD_NS,
+          "key": METAFLD_CFG_KEY,
+          "type": METAFLD_CFG_TYPE,
+          "value": config_id
+        },
+        {
+          "namespace": METAFIELD_NS,
+          "key": METAFIELD_WT_KEY,
+          "type": METAFIELD_WT_TYPE,
+          "value": json.dumps({ "value": wt_val, "unit": wt_unit })
+        }
+      ]
+    }
+
+
+def iter_variants(space, option_id, config_ids, start=0, stop=None, matrix=None):
+    """Variant inputs, each pointing at the config with its own refs."""
+    for refs, total, weight, title in iter_combinations(space, start, stop, matrix):
+        if refs not in config_ids:
+            raise KeyError(f"no config created for {title!r} (refs {list(refs)})")
+        yield variant_input(option_id, title, total, weight, config_ids[refs])
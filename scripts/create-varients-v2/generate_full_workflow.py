@@ -1,162 +1,118 @@
 #!/usr/bin/env python3
-import sys, json, itertools
+import sys, os, json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from catalog.batching import merge_responses
+from catalog.instrument import configure
+from catalog.metaobjects import load_metaobjects
+from catalog.workflow import decode_options
+from catalog.journal import Journal
+from catalog.sync import TruncatedLiveState
+from catalog.pipeline import (Product, make_config_mutation, make_variant_mutation,
+                              record_responses, make_resumable_variants, make_price_table,
+                              make_binary_catalog, make_variant_map, make_sync_plan)
 
 # ——— CONFIG ———
 PRODUCT_ID       = "gid://shopify/Product/15391530385753"
 OPTION_ID        = "gid://shopify/ProductOption/17750055289177"
-# Metafield for pointing at a configuration metaobject:
-METAFIELD_NS        = "custom"
-METAFLD_CFG_KEY     = "variations"
-METAFLD_CFG_TYPE    = "metaobject_reference"
-# Metafield for storing the towel weight:
-METAFIELD_WT_KEY    = "metadata_weight"
-METAFIELD_WT_TYPE   = "weight"
+DEFINITION_HANDLE   = "mft_configuration"
+# metafield keys/types live in catalog/workflow.py, the steps in catalog/pipeline.py
 # ——————————
 
-def extract_ids(edge_list):
-    return [n["node"]["id"] for n in edge_list]
+PRODUCT = Product(PRODUCT_ID, OPTION_ID, DEFINITION_HANDLE)
 
-def extract_field(node, key):
-    for f in node["fields"]:
-        if f["key"] == key:
-            return f["value"]
-    raise KeyError(f"{key} missing in {node['id']}")
 
-def parse_money(s):
-    return float(json.loads(s)["amount"])
+def pop_option(args, name):
+    if name not in args:
+        return None
+    i = args.index(name)
+    value = args[i + 1] if i + 1 < len(args) else None
+    del args[i:i + 2]
+    return value
 
-def parse_weight(s):
-    j = json.loads(s)
-    return j["value"], j["unit"]
-
-def make_config_mutation(data):
-    sizes  = extract_ids(data["sizeOptions"]["edges"])
-    sides  = extract_ids(data["printedSides"]["edges"])
-    hangs  = extract_ids(data["hangloopOptions"]["edges"])
-    packs  = extract_ids(data["packagingOptions"]["edges"])
-
-    # collapse hangs to two
-    # (price 0.0 vs >0.0)
-    def price_of(id_):
-        node = next(n for n in data["hangloopOptions"]["edges"] if n["node"]["id"]==id_)["node"]
-        return parse_money(extract_field(node,"price"))
-    zero = [h for h in hangs if price_of(h)==0.0]
-    one  = [h for h in hangs if price_of(h)>0.0]
-    hangs = zero + one
-
-    aliases=[]
-    for i, combo in enumerate(itertools.product(sizes, sides, hangs, packs), start=1):
-        alias = f"conf_{i:03}"
-        refs  = json.dumps(list(combo))
-        aliases.append(f'''
-  {alias}: metaobjectCreate(metaobject: {{
-    type: "mft_configuration",
-    fields: [
-      {{ key: "configurations", value: "{refs}" }}
-    ]
-  }}) {{
-    metaobject {{ id }}
-    userErrors {{ field message }}
-  }}''')
-
-    print("mutation BulkCreateConfigurations {")
-    print("\n".join(aliases))
-    print("}")
-
-def make_variant_mutation(data, configs_resp):
-    # 1) reconstruct the same combo order:
-    sizes  = [n["node"] for n in data["sizeOptions"]["edges"]]
-    sides  = [n["node"] for n in data["printedSides"]["edges"]]
-    hangsA = [n["node"] for n in data["hangloopOptions"]["edges"]]
-    packs  = [n["node"] for n in data["packagingOptions"]["edges"]]
-
-    # collapse hangs:
-    no_hang = next(n for n in hangsA if parse_money(extract_field(n,"price"))==0.0)
-    yes_hang= next(n for n in hangsA if parse_money(extract_field(n,"price"))>0.0)
-    hangs    = [no_hang, yes_hang]
-
-    # 2) pull the created config IDs by alias:
-    created = configs_resp["data"]
-    config_ids = [ created[f"conf_{i:03}"]["metaobject"]["id"]
-                   for i in range(1, len(sizes)*len(sides)*len(hangs)*len(packs) + 1) ]
-
-    # 3) build all variants in same order:
-    variants=[]
-    idx=0
-    for size, side, hang, pack in itertools.product(sizes, sides, hangs, packs):
-        base_price = parse_money(extract_field(size,"price"))
-        side_price = parse_money(extract_field(side,"price"))
-        hang_price = parse_money(extract_field(hang,"price"))
-        pack_price = parse_money(extract_field(pack,"price"))
-        total = round(base_price+side_price+hang_price+pack_price,2)
-
-        wt_val, wt_unit = parse_weight(extract_field(size,"weight"))
-        hang_lbl = "Hangloop" if hang_price>0 else "No Hangloop"
-        title = " | ".join([
-          extract_field(size,"name"),
-          extract_field(side,"side"),
-          hang_lbl,
-          extract_field(pack,"packaging")
-        ])
-
-        variants.append({
-          "price": total,
-          "optionValues": [{
-             "optionId": OPTION_ID,
-             "name": title
-          }],
-          "metafields":[
-            {
-              "namespace": METAFIELD_NS,
-              "key": METAFL_CFG_KEY,
-              "type": METAFL_CFG_TYPE,
-              "value": config_ids[idx]
-            },
-            {
-              "namespace": METAFIELD_NS,
-              "key": METAFIELD_WT_KEY,
-              "type": METAFIELD_WT_TYPE,
-              "value": json.dumps({ "value": wt_val, "unit": wt_unit })
-            }
-          ]
-        })
-        idx += 1
-
-    # 4) print the bulk-create mutation + variables
-    print("""
-mutation ProductVariantsCreate($productId: ID!, $variants: [ProductVariantsBulkInput!]!) {
-  productVariantsBulkCreate(productId: $productId, variants: $variants) {
-    productVariants { id title selectedOptions { name value } metafields(first:5){ edges{ node{namespace key value}}}}
-    userErrors { field message }
-  }
-}
-""".strip())
-    print()
-    print(json.dumps({
-      "productId": PRODUCT_ID,
-      "variants": variants
-    }, indent=2))
+def pop_flag(args, name):
+    if name not in args:
+        return False
+    args.remove(name)
+    return True
 
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
 
 def main():
-    if not (2 <= len(sys.argv) <= 3):
+    args = sys.argv[1:]
+    jsonl_path = pop_option(args, "--jsonl")
+    prune      = pop_flag(args, "--prune-configs")
+    # --sync once per page of the live-state export, in order
+    live_paths = []
+    while "--sync" in args:
+        live_paths.append(pop_option(args, "--sync"))
+    span       = pop_option(args, "--range")
+    prices     = pop_option(args, "--prices")
+    binary     = pop_option(args, "--bin")
+    journal_path = pop_option(args, "--journal")
+    map_path   = pop_option(args, "--map")
+    configure(pop_option(args, "--trace"))
+
+    if not args or (jsonl_path and len(args) < 2):
         print("Usage:\n"
               "  # Step 1: make configs\n"
               "  python generate_full_workflow.py metaobjects.json\n\n"
-              "  # Step 2: make variants\n"
-              "  python generate_full_workflow.py metaobjects.json configs.json",
+              "  # Step 2: make variants (one response per config batch)\n"
+              "  python generate_full_workflow.py metaobjects.json configs_001.json [configs_002.json ...]\n\n"
+              "  # Step 2 as bulk-operation JSONL (.jsonl or .jsonl.gz)\n"
+              "  python generate_full_workflow.py --jsonl variants.jsonl.gz metaobjects.json configs_001.json ...\n\n"
+              "  # Either step for a slice only, e.g. to rebuild conf_017..conf_040\n"
+              "  python generate_full_workflow.py --range 17:40 metaobjects.json [configs_001.json ...]\n\n"
+              "  # Sync: only the changes against a live_state.graphql export (one --sync per page;\n"
+              "  # --prune-configs also deletes this product's stale configs)\n"
+              "  python generate_full_workflow.py --sync live_state.json [--sync live_state_2.json ...]"
+              " [--prune-configs] metaobjects.json [sync_configs_001.json ...]\n\n"
+              "  # Any step can also write the tier/reseller price table\n"
+              "  python generate_full_workflow.py --prices variant_prices.json metaobjects.json ...\n\n"
+              "  # ... and the memory-mapped binary catalog (config ids filled in when given)\n"
+              "  python generate_full_workflow.py --bin variants.dlvc metaobjects.json [configs_001.json ...]\n\n"
+              "  # ... and the selection → variant class mapping for the storefront\n"
+              "  python generate_full_workflow.py --map variant_map.json metaobjects.json ...\n\n"
+              "  # Resumable: record responses in a journal, resend only what failed or is missing\n"
+              "  python generate_full_workflow.py --journal workflow.journal.jsonl metaobjects.json\n"
+              "  python generate_full_workflow.py --journal workflow.journal.jsonl metaobjects.json configs_001.json ...\n"
+              "  python generate_full_workflow.py --journal workflow.journal.jsonl metaobjects.json variants_response.json\n\n"
+              "  # Per-stage timings/counters on stderr + a Chrome trace (or set CATALOG_TRACE)\n"
+              "  python generate_full_workflow.py --trace trace.json metaobjects.json ...",
               file=sys.stderr)
         sys.exit(1)
 
-    meta = json.load(open(sys.argv[1]))["data"]
-
-    if len(sys.argv) == 2:
-        # only metaobjects.json → print config mutation
-        make_config_mutation(meta)
+    options = decode_options(load_metaobjects(args[0]))
+    if prices:
+        make_price_table(options, prices)
+    if map_path:
+        make_variant_map(options, map_path)
+    if binary:
+        make_binary_catalog(options, binary, merge_responses(load_json(p) for p in args[1:]))
+
+    if journal_path:
+        with Journal(journal_path) as journal:
+            # recorded outcomes → retry batches for missing configs (+ pending variants)
+            record_responses(options, journal, args[1:])
+            make_config_mutation(options, DEFINITION_HANDLE, span, journal)
+            if len(args) > 1:
+                make_resumable_variants(options, PRODUCT, journal, jsonl_path, span)
+    elif live_paths:
+        # metaobjects + live state (+ sync_configs responses) → minimal changes
+        configs = merge_responses(load_json(p) for p in args[1:])
+        try:
+            make_sync_plan(options, PRODUCT, [load_json(p) for p in live_paths], configs, prune)
+        except TruncatedLiveState as e:
+            sys.exit(f"Live state is incomplete: {e}")
+    elif len(args) == 1:
+        # only metaobjects.json → write batched config mutations
+        make_config_mutation(options, DEFINITION_HANDLE, span)
     else:
-        # metaobjects + configs response → print variant mutation
-        configs = json.load(open(sys.argv[2]))
-        make_variant_mutation(meta, configs)
+        # metaobjects + configs responses → print variant mutation
+        configs = merge_responses(load_json(p) for p in args[1:])
+        make_variant_mutation(options, PRODUCT, configs, jsonl_path, span)
 
 if __name__=="__main__":
     main()
\ No newline at end of file
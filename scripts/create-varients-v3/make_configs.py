@@ -1,40 +1,46 @@
 #!/usr/bin/env python3
-import json, itertools, sys
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from catalog.instrument import configure
+from catalog.batching import (alias_name, config_entries, write_batches, write_param_batches,
+                              MAX_QUERY_COST, MAX_BATCH_BYTES)
+from catalog.metaobjects import load_metaobjects
+from catalog.space import parse_range
+from catalog.workflow import config_space, decode_options
 
 # ——— CONFIG ———
 JSON_IN           = "metaobjects.json"     # your input file
 DEFINITION_HANDLE = "mft_configuration"    # your MetaobjectDefinition.type
+MAX_COST          = MAX_QUERY_COST         # estimated query cost per batch
+MAX_BYTES         = MAX_BATCH_BYTES        # document size per batch
 # ————————
 
-def extract_ids(edges):
-    return [n["node"]["id"] for n in edges]
-
-def main(path):
-    d = json.load(open(path))["data"]
-    sizes  = extract_ids(d["sizeOptions"]["edges"])
-    sides  = extract_ids(d["printedSides"]["edges"])
-    hangs  = extract_ids(d["hangloopOptions"]["edges"])
-    packs  = extract_ids(d["packagingOptions"]["edges"])
-
-    entries = []
-    for i, combo in enumerate(itertools.product(sizes, sides, hangs, packs), start=1):
-        alias     = f"conf_{i:03}"
-        refs_json = json.dumps(list(combo))
-        entries.append(f'''
-  {alias}: metaobjectCreate(metaobject: {{
-    type: "{DEFINITION_HANDLE}",
-    fields: [
-      {{ key: "configurations", value: "{refs_json}" }}
-    ]
-  }}) {{
-    metaobject {{ id }}
-    userErrors {{ field message }}
-  }}''')
+def main(path, span=None, params=False):
+    # the same config space as generate_full_workflow.py, so conf_NNN names
+    # the same combination in both scripts and their responses mix
+    space       = config_space(decode_options(load_metaobjects(path)))
 
-    mutation = "mutation BulkCreateConfigurations {" + "\n".join(entries) + "\n}"
-    with open("create_configs.graphql", "w") as out:
-        out.write(mutation)
-    print("Wrote create_configs.graphql")
+    # --range 17:40 regenerates conf_017..conf_040 only, with the same numbering
+    start, stop = parse_range(span, len(space)) if span else (0, len(space))
+    prefix      = f"create_configs_{start + 1:03}-{stop:03}" if span else "create_configs"
+    if params:
+        # --params: one reusable document per batch size + <prefix>_NNN.variables.json
+        refs = ((alias_name(i), r) for i, r in enumerate(space.range(start, stop), start=start + 1))
+        manifest = write_param_batches(refs, DEFINITION_HANDLE, prefix=prefix,
+                                       max_cost=MAX_COST, max_bytes=MAX_BYTES)
+    else:
+        manifest = write_batches(config_entries(space.range(start, stop), DEFINITION_HANDLE, start=start + 1),
+                                 prefix=prefix, max_cost=MAX_COST, max_bytes=MAX_BYTES)
+    for b in manifest["batches"]:
+        print(f"Wrote {b['file']} ({b['first_alias']}..{b['last_alias']}, "
+              f"cost≈{b['estimated_cost']}, {b['bytes']} bytes)")
+    for doc in manifest.get("documents", []):
+        print(f"Wrote {doc}")
+    print(f"Wrote {prefix}.manifest.json ({manifest['total_aliases']} aliases)")
 
 if __name__=="__main__":
-    main(JSON_IN)
\ No newline at end of file
+    args = sys.argv[1:]
+    configure(args[args.index("--trace") + 1] if "--trace" in args[:-1] else None)
+    main(JSON_IN, args[args.index("--range") + 1] if "--range" in args[:-1] else None,
+         params="--params" in args)
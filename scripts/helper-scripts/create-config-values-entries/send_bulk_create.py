@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from catalog.runner import send_variable_dir
+
+# Files written by generate_bulk_create.py
+gql_filename = "create_metaobject.graphql"
+var_dir = "variables"
+summary_filename = "send_summary.json"
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Send every variables/<handle>.json through create_metaobject.graphql")
+    ap.add_argument("--url", default=os.environ.get("SHOPIFY_ADMIN_URL"),
+                    help="Admin GraphQL endpoint (or SHOPIFY_ADMIN_URL)")
+    ap.add_argument("--token", default=os.environ.get("SHOPIFY_ADMIN_TOKEN"),
+                    help="Admin API access token (or SHOPIFY_ADMIN_TOKEN)")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--pool-size", type=int, default=4)
+    ap.add_argument("--timeout", type=float, default=30.0,
+                    help="seconds to wait for a connection or a response before retrying")
+    args = ap.parse_args()
+    if not args.url:
+        ap.error("--url or SHOPIFY_ADMIN_URL is required")
+
+    summary = asyncio.run(send_variable_dir(args.url, args.token, gql_filename, var_dir,
+                                            args.concurrency, args.pool_size, args.timeout))
+    with open(summary_filename, "w") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    for r in summary["results"]:
+        if r["status"] == "user_error":
+            for err in r["userErrors"]:
+                print(f"userError {r['name']}: {err.get('field')} {err.get('message')}")
+        elif r["status"] == "failed":
+            print(f"FAILED {r['name']}: {r['error']}")
+    print(f"Sent {summary['sent']}: {summary['ok']} ok, {summary['user_errors']} with userErrors, "
+          f"{summary['failed']} failed, {summary['retries']} retries ➞ {summary_filename}")
+    sys.exit(1 if summary["failed"] or summary["user_errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS)
+
+from catalog.batching import alias_name  # noqa: E402
+from catalog.fakeadmin import FakeAdmin, serve  # noqa: E402
+from catalog.metaobjects import load_metaobjects  # noqa: E402
+from catalog.workflow import config_space, decode_options  # noqa: E402
+
+CATALOG = os.path.join(SCRIPTS, "create-varients-v3", "metaobjects.json")
+
+
+@pytest.fixture(scope="session")
+def options():
+    """The real 6 × 2 × 9 × 3 catalog: 324 configs, 72 variants."""
+    return decode_options(load_metaobjects(CATALOG))
+
+
+def configs_response(options, skip=()):
+    """A ``conf_NNN`` response over the whole config space; aliases in ``skip`` failed."""
+    return {"data": {
+        alias_name(i): ({"metaobject": None, "userErrors": [{"message": "failed"}]}
+                        if alias_name(i) in skip else
+                        {"metaobject": {"id": f"gid://shopify/Metaobject/{700000000000 + i}"},
+                         "userErrors": []})
+        for i in range(1, len(config_space(options)) + 1)}}
+
+
+def refs_by_config_id(options, configs_resp):
+    space = config_space(options)
+    return {r["metaobject"]["id"]: space[int(a[5:]) - 1]
+            for a, r in configs_resp["data"].items() if r["metaobject"]}
+
+
+def config_id_of(variant):
+    return next(m["value"] for m in variant["metafields"] if m["key"] == "variations")
+
+
+@pytest.fixture
+def assert_linked(options):
+    """Assert that config ``refs`` are the options named by the variant ``title``."""
+    labels = {o.id: o.label for opts in options.values() for o in opts}
+    hangs = {o.id: o for o in options["hangloopOptions"]}
+
+    def check(title, refs):
+        size, side, hang, pack = refs
+        hang_label = "Hangloop" if hangs[hang].price > 0.0 else "No Hangloop"
+        expected = [labels[size], labels[side], hang_label, labels[pack]]
+        assert title.split(" | ") == expected, f"{title!r} linked to config {expected}"
+    return check
+
+
+@pytest.fixture
+def fake_admin():
+    """``fake_admin(**settings)`` serves a ``FakeAdmin`` in-process; returns ``(url, state)``."""
+    servers = []
+
+    def start(**settings):
+        server, state = serve(state=FakeAdmin(**settings))
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/graphql.json", state
+    yield start
+    for server in servers:
+        server.shutdown()
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from catalog.adminapi import AdminClient, LeakyBucket, TransientError, user_errors
+from catalog.runner import send_all
+
+QUERY = ("mutation CreateValue($input: MetaobjectCreateInput!) { metaobjectCreate(metaobject: $input)"
+         " { metaobject { id } userErrors { field message } } }")
+
+
+def jobs(n):
+    return [(f"value_{i:02}", {"input": {"type": "configuration_value", "handle": f"value-{i}"}})
+            for i in range(n)]
+
+
+def send(url, job_list, concurrency=4, **client):
+    async def main():
+        async with AdminClient(url, **client) as c:
+            return await send_all(c, QUERY, job_list, concurrency)
+    return asyncio.run(main())
+
+
+def reply(status=200, payload=b'{"data": {}}', headers=()):
+    head = [f"HTTP/1.1 {status} X", f"Content-Length: {len(payload)}", *headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + payload
+
+
+class CannedServer:
+    """Answers the n-th request with ``replies[n]``; ``None`` never answers."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = 0
+        self.closed = threading.Event()     # set when the client closes a connection
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}/graphql.json"
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        while True:
+            conn, _ = self.sock.accept()
+            threading.Thread(target=self.serve, args=(conn,), daemon=True).start()
+
+    def serve(self, conn):
+        with conn, conn.makefile("rb") as f:
+            while True:
+                length = None
+                for line in iter(f.readline, b"\r\n"):
+                    if not line:
+                        self.closed.set()
+                        return
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                f.read(length or 0)
+                self.requests += 1
+                answer = self.replies.pop(0) if self.replies else None
+                if answer is not None:
+                    conn.sendall(answer)
+
+
+def test_throttled_requests_are_retried_until_they_fit(fake_admin):
+    # the client starts out assuming a 2000-point bucket; the server has 30
+    url, fake = fake_admin(capacity=30, restore_rate=300)
+    summary = send(url, jobs(12), bucket=LeakyBucket(2000, 100), backoff_base=0.01)
+    assert fake.throttled > 0
+    assert summary["retries"] >= fake.throttled
+    assert summary["ok"] == 12
+    assert len({i for r in summary["results"] for i in r["ids"]}) == 12
+
+
+def test_client_bucket_follows_the_reported_throttle_status(fake_admin):
+    url, state = fake_admin(capacity=500, restore_rate=250)
+    bucket = LeakyBucket()
+    send(url, jobs(1), bucket=bucket)
+    assert (bucket.capacity, bucket.restore_rate) == (500, 250)
+    assert state.spent > 0 and bucket.available == 500 - state.spent
+
+
+def test_user_errors_are_collected(fake_admin):
+    url, _ = fake_admin()
+    summary = send(url, jobs(2) + [("dupe", jobs(1)[0][1])])
+    [dupe] = [r for r in summary["results"] if r["status"] == "user_error"]
+    assert dupe["userErrors"][0]["message"] == "Value is already taken"
+    assert user_errors({"data": {"a": {"userErrors": [{"message": "m"}]}}}) == [
+        {"alias": "a", "message": "m"}]
+
+
+def test_server_errors_are_retried_after_retry_after():
+    server = CannedServer([reply(503, b"", ["Retry-After: 0"]),
+                           reply(payload=json.dumps({"data": {"metaobjectCreate": {}}}).encode())])
+    summary = send(server.url, jobs(1), backoff_base=0.001)
+    assert (summary["ok"], summary["retries"], server.requests) == (1, 1, 2)
+
+
+def test_a_stalled_endpoint_times_out_and_is_retried():
+    server = CannedServer([None, reply()])
+    summary = send(server.url, jobs(1), timeout=0.2, backoff_base=0.001)
+    assert (summary["ok"], summary["retries"]) == (1, 1)
+    assert server.closed.wait(1)
+
+
+def test_retries_give_up_after_max_attempts():
+    server = CannedServer([])
+    with pytest.raises(TransientError, match="no response within"):
+        asyncio.run(AdminClient(server.url, timeout=0.1, max_attempts=2,
+                                backoff_base=0.001).execute(QUERY))
+    assert server.requests == 2
+
+
+def test_a_connection_that_fails_mid_response_is_closed():
+    bad_chunk = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n"
+    server = CannedServer([bad_chunk])
+
+    async def main():
+        client = AdminClient(server.url)
+        with pytest.raises(ValueError) as failure:   # keeps the failed request's frames alive
+            await client.execute(QUERY)
+        assert client.pool.idle == []
+        closed = await asyncio.to_thread(server.closed.wait, 1)
+        del failure
+        return closed
+    assert asyncio.run(main())
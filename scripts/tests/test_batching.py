@@ -0,0 +1,74 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from catalog.batching import (MAX_BATCH_BYTES, MAX_QUERY_COST, alias_cost, chunk_entries,
+                              config_entries, merge_responses, render_alias, write_batches)
+
+from conftest import SCRIPTS
+
+COMBOS = [(f"gid://shopify/Metaobject/{i}", "gid://shopify/Metaobject/2") for i in range(1, 325)]
+VALUE = re.compile(r'value: ("(?:[^"\\]|\\.)*")')
+
+
+def test_batches_stay_within_the_cost_and_byte_budgets(tmp_path):
+    for max_cost, max_bytes in ((MAX_QUERY_COST, MAX_BATCH_BYTES), (100, MAX_BATCH_BYTES),
+                                (MAX_QUERY_COST, 4000)):
+        manifest = write_batches(config_entries(COMBOS, "mft_configuration"), out_dir=str(tmp_path),
+                                 max_cost=max_cost, max_bytes=max_bytes)
+        for b in manifest["batches"]:
+            text = (tmp_path / b["file"]).read_text(encoding="utf-8")
+            assert b["estimated_cost"] == b["aliases"] * alias_cost() <= max_cost
+            assert b["bytes"] == len(text.encode("utf-8")) <= max_bytes
+        assert manifest["total_aliases"] == 324
+
+
+def test_alias_numbers_stay_global_across_batches(tmp_path):
+    manifest = write_batches(config_entries(COMBOS, "mft_configuration"), out_dir=str(tmp_path),
+                             max_cost=100)
+    numbers = []
+    for b in manifest["batches"]:
+        text = (tmp_path / b["file"]).read_text(encoding="utf-8")
+        aliases = re.findall(r"(conf_\d+): metaobjectCreate", text)
+        assert (aliases[0], aliases[-1]) == (b["first_alias"], b["last_alias"])
+        numbers += [int(a[5:]) for a in aliases]
+    assert numbers == list(range(1, 325))
+    assert manifest.pop("unchanged") == []  # no cache configured
+    with open(tmp_path / "create_configs.manifest.json") as f:
+        assert json.load(f) == manifest
+
+
+def test_an_oversized_alias_gets_a_batch_of_its_own():
+    entries = [("conf_001", "x" * 50), ("conf_002", "y" * 500), ("conf_003", "z" * 50)]
+    batches = list(chunk_entries(entries, max_bytes=300))
+    assert [[a for a, _ in b] for b in batches] == [["conf_001"], ["conf_002"], ["conf_003"]]
+
+
+def test_configurations_value_is_an_escaped_graphql_string():
+    refs = ['gid://shopify/Metaobject/1', 'quote " and \\ backslash', "40 × 80 cm"]
+    [literal] = VALUE.findall(render_alias("conf_001", "mft_configuration", refs))
+    assert json.loads(json.loads(literal)) == refs
+
+
+def test_merge_responses_joins_batches_by_alias():
+    merged = merge_responses([{"data": {"conf_001": 1}}, {"data": None}, {"data": {"conf_002": 2}}])
+    assert merged == {"data": {"conf_001": 1, "conf_002": 2}}
+
+
+def first_refs(workdir, script, *args):
+    subprocess.run([sys.executable, script, *args], cwd=workdir, check=True,
+                   capture_output=True)
+    with open(os.path.join(workdir, "create_configs_001.graphql"), encoding="utf-8") as f:
+        return [json.loads(json.loads(v)) for v in VALUE.findall(f.read())]
+
+
+def test_v2_and_v3_number_the_same_combinations(tmp_path):
+    for name in ("catalog", "create-varients-v2", "create-varients-v3"):
+        shutil.copytree(os.path.join(SCRIPTS, name), tmp_path / name,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    v2 = first_refs(tmp_path / "create-varients-v2", "generate_full_workflow.py", "metaobjects.json")
+    v3 = first_refs(tmp_path / "create-varients-v3", "make_configs.py")
+    assert v2 == v3
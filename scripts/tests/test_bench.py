@@ -0,0 +1,28 @@
+from catalog.bench import (HANGS, PACKS, SIDES, STAGES, compare, run, synth_configs_response,
+                           synth_metaobjects)
+from catalog.metaobjects import Catalog
+from catalog.workflow import config_ids_by_refs, decode_options, iter_variants, variant_space
+
+
+def test_synthetic_configs_cover_every_variant():
+    options = decode_options(Catalog.from_metaobjects(synth_metaobjects(2)["data"]))
+    resp = synth_configs_response(2 * SIDES * HANGS * PACKS)
+    ids = config_ids_by_refs(options, resp)
+    assert len(ids) == 2 * SIDES * HANGS * PACKS
+    variants = list(iter_variants(variant_space(options), "gid://shopify/ProductOption/1", ids))
+    assert len(variants) == len(variant_space(options))
+
+
+def test_every_stage_runs_at_the_smallest_scale():
+    rows = run(scales=(324,), log=lambda *a: None)
+    assert [r["stage"] for r in rows] == list(STAGES)
+    assert all(r["ok"] for r in rows), [r.get("error") for r in rows if not r["ok"]]
+    assert all(r["output_bytes"] > 0 for r in rows)
+
+
+def test_compare_flags_only_regressions_past_the_threshold():
+    old = [{"stage": "s", "scale": 1, "ok": True, "wall_s": 1.0, "peak_rss_kb": 100,
+            "output_bytes": 10}]
+    new = [dict(old[0], wall_s=1.05, peak_rss_kb=200)]
+    assert compare(new, old, 0.1) == [("s", 1, "peak_rss_kb", 100, 200)]
+    assert compare([dict(old[0], ok=False)], old, 0.1) == [("s", 1, "ok", True, False)]
@@ -0,0 +1,42 @@
+from catalog.binary import VariantCatalog, write_catalog
+from catalog.pricing import PriceMatrix
+from catalog.workflow import config_ids_by_refs, iter_catalog_rows, option_labels, variant_space
+
+from conftest import configs_response, refs_by_config_id
+
+
+def write(tmp_path, options, resp):
+    path = str(tmp_path / "variants.dlvc")
+    rows = iter_catalog_rows(variant_space(options), config_ids_by_refs(options, resp))
+    assert write_catalog(path, rows, option_labels(options)) == 72
+    return path
+
+
+def test_columns_round_trip(tmp_path, options):
+    space = variant_space(options)
+    matrix = PriceMatrix.from_space(space)
+    with VariantCatalog(write(tmp_path, options, configs_response(options))) as cat:
+        assert len(cat) == 72
+        for i, (refs, _, _, title, _) in enumerate(iter_catalog_rows(space)):
+            assert (cat.refs(i), cat.title(i)) == (refs, title)
+            assert (cat.price(i), cat.grams(i)) == (matrix.price(i), matrix.weight(i))
+            assert cat.find(refs) == i
+        size = options["sizeOptions"][0]
+        assert cat.label(size.id) == size.label
+        assert cat.find(("gid://shopify/Metaobject/1",) * 4) == -1
+        assert cat.label("gid://shopify/Metaobject/1") is None
+
+
+def test_config_column_holds_each_variants_own_config(tmp_path, options, assert_linked):
+    resp = configs_response(options)
+    refs_of = refs_by_config_id(options, resp)
+    with VariantCatalog(write(tmp_path, options, resp)) as cat:
+        for i in range(len(cat)):
+            assert refs_of[cat.config_id(i)] == cat.refs(i)
+            assert_linked(cat.title(i), cat.refs(i))
+
+
+def test_missing_configs_stay_empty(tmp_path, options):
+    with VariantCatalog(write(tmp_path, options, configs_response(options, skip={"conf_028"}))) as cat:
+        empty = [cat.title(i) for i in range(len(cat)) if cat.config_id(i) is None]
+    assert empty == ["40 × 80 cm | Both sides | No Hangloop | Mesh Bag"]
@@ -0,0 +1,43 @@
+import io
+from contextlib import redirect_stderr
+
+import pytest
+
+from catalog.fakeadmin import FakeAdmin, serve
+from catalog.journal import Journal
+from catalog.pipeline import Product, make_bulk_configs, make_bulk_variants
+
+PRODUCT = Product("gid://shopify/Product/1", "gid://shopify/ProductOption/1")
+
+
+@pytest.fixture
+def admin():
+    server, state = serve(state=FakeAdmin(bulk_seconds=0.0))
+    yield f"{state.base_url}/graphql.json", state
+    server.shutdown()
+
+
+def test_bulk_variants_link_to_their_configs(tmp_path, monkeypatch, options, admin,
+                                             assert_linked):
+    url, state = admin
+    monkeypatch.chdir(tmp_path)
+    with redirect_stderr(io.StringIO()):
+        configs = make_bulk_configs(options, "mft_configuration", url, None, "configs.json")
+        make_bulk_variants(options, PRODUCT, configs, url, None, "variants.json")
+    links = state.variant_links(PRODUCT.product_id)
+    assert len(links) == 72
+    for title, refs in links:
+        assert refs is not None, f"{title!r} has no config"
+        assert_linked(title, refs)
+
+
+def test_journal_rerun_sends_nothing(tmp_path, monkeypatch, options, admin):
+    url, state = admin
+    monkeypatch.chdir(tmp_path)
+    with redirect_stderr(io.StringIO()), Journal(str(tmp_path / "journal.jsonl")) as journal:
+        assert make_bulk_configs(options, "mft_configuration", url, None, "configs.json", journal)
+        make_bulk_variants(options, PRODUCT, None, url, None, "variants.json", journal)
+        assert make_bulk_configs(options, "mft_configuration", url, None, "again.json", journal) is None
+        assert make_bulk_variants(options, PRODUCT, None, url, None, "again.json", journal) is None
+    assert sum(len(nodes) for nodes in state.metaobjects.values()) == 324
+    assert len(state.variants[PRODUCT.product_id]) == 72
@@ -0,0 +1,56 @@
+import io
+import os
+
+import pytest
+
+from catalog import cache
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_cache", None)
+    monkeypatch.setattr(cache, "_configured", False)
+    monkeypatch.chdir(tmp_path)
+    return cache.configure(str(tmp_path / "store"))
+
+
+def test_unchanged_shards_keep_their_file(store, tmp_path):
+    assert cache.write_text("a.graphql", "query A") is True
+    before = os.stat("a.graphql").st_mtime_ns
+    assert cache.write_text("a.graphql", "query A") is False
+    assert os.stat("a.graphql").st_mtime_ns == before
+    assert cache.write_text("a.graphql", "query B") is True
+    assert open("a.graphql").read() == "query B"
+
+
+def test_identical_runs_are_restored_without_building(store, tmp_path):
+    (tmp_path / "input.json").write_text("{}")
+    builds = []
+
+    def build():
+        builds.append(1)
+        cache.write_text("out.graphql", "mutation")
+        with open("out.json", "w") as f:
+            f.write("[]")
+        cache.track("out.json")
+
+    stream = io.StringIO()
+    assert cache.cached_run("configs", ["input.json"], {"range": None}, build, stream) is False
+    os.remove("out.graphql")
+    os.remove("out.json")
+    assert cache.cached_run("configs", ["input.json"], {"range": None}, build, stream) is True
+    assert len(builds) == 1
+    assert open("out.graphql").read() == "mutation" and open("out.json").read() == "[]"
+
+    (tmp_path / "input.json").write_text('{"changed": true}')
+    assert cache.cached_run("configs", ["input.json"], {"range": None}, build, stream) is False
+    assert len(builds) == 2
+
+
+def test_eviction_drops_least_recently_used_first(store):
+    for i in range(3):
+        cache.write_text(f"f{i}.txt", str(i) * 100)
+    old = sorted(store.entries())[0][2]
+    assert store.evict(max_bytes=250) == 100
+    assert not os.path.exists(old)
+    assert store.stats()["objects"] == 2
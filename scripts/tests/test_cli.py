@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+
+from catalog import cli
+from catalog.metaobjects import load_metaobjects
+from catalog.product_variants import write_files
+from catalog.values import build_entries, write_values
+
+from conftest import SCRIPTS, configs_response
+
+META = os.path.join(SCRIPTS, "create-varients-v2", "metaobjects.json")
+HELPERS = os.path.join(SCRIPTS, "helper-scripts", "create-product-variables")
+
+
+def live_page(configs, has_next):
+    return {"data": {
+        "configurations": {"nodes": [{"id": cid, "configurations": {"value": json.dumps(list(refs))}}
+                                     for cid, refs in configs.items()],
+                           "pageInfo": {"hasNextPage": has_next}},
+        "product": {"variants": {"nodes": [], "pageInfo": {"hasNextPage": has_next}}}}}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cli, "_cache", {})
+    return tmp_path
+
+
+def test_chained_commands_parse_each_input_once(workdir, capsys):
+    cli.main(["configs", META, "+", "check", META, "+", "configs", "--range", "1:10", META])
+    assert (workdir / "create_configs.manifest.json").exists()
+    assert (workdir / "create_configs_001-010.manifest.json").exists()
+    assert sorted(kind for kind, _, _ in cli._cache) == ["json", "options"]
+    assert "metaobjects export, sizeOptions=" in capsys.readouterr().out
+
+
+def test_sync_reads_every_page_and_prunes_only_on_request(workdir):
+    size, other = load_metaobjects(META).ids("sizeOptions")[:2]
+    (workdir / "p1.json").write_text(json.dumps(live_page({"own-stale": (size, other)}, True)))
+    (workdir / "p2.json").write_text(json.dumps(live_page({"foreign": (size, "gid://x")}, False)))
+
+    with pytest.raises(SystemExit, match="live state is incomplete"):
+        cli.main(["sync", "p1.json", META])
+
+    cli.main(["sync", "p1.json", META, "--page", "p2.json"])
+    assert json.loads((workdir / "sync_plan.json").read_text())["config_deletes"] == 0
+
+    cli.main(["sync", "p1.json", META, "--page", "p2.json", "--prune-configs"])
+    assert json.loads((workdir / "sync_plan.json").read_text())["config_deletes"] == 1
+
+
+def test_check_names_each_file_and_fails_on_invalid_ones(workdir, options, capsys):
+    (workdir / "configs.json").write_text(json.dumps(configs_response(options, skip={"conf_001"})))
+    (workdir / "bad.json").write_text(json.dumps({"data": {"nope": 1}}))
+    cli.main(["check", "configs.json"])
+    assert "configs response, 323 ok, 1 failed" in capsys.readouterr().out
+    with pytest.raises(SystemExit):
+        cli.main(["check", "configs.json", "bad.json"])
+    assert "bad.json: INVALID" in capsys.readouterr().out
+
+
+def test_values_and_product_variants_write_their_files(workdir):
+    assert write_values(log=lambda *a: None) == len(build_entries())
+    written = {p.stem for p in (workdir / "variables").glob("*.json")}
+    assert written == {e["handle"] for e in build_entries()}
+    assert (workdir / "create_metaobject.graphql").exists()
+
+    with open(os.path.join(HELPERS, "configuration_value.json")) as f:
+        values = json.load(f)
+    with open(os.path.join(HELPERS, "configuration_option.json")) as f:
+        config_options = json.load(f)
+    count = write_files(values, config_options, "gid://p", "gid://o", "pv.jsonl", log=None)
+    assert count == len((workdir / "pv.jsonl").read_text().splitlines()) > 0
+    variables = (workdir / "product_variants_variables.json").read_text(encoding="utf-8")
+    assert json.loads(variables)["productId"] == "gid://p"
+    assert "\\u" not in variables  # written with ensure_ascii=False, like before
@@ -0,0 +1,119 @@
+import io
+import json
+import os
+from decimal import Decimal
+
+import pytest
+
+from catalog import codecs, sync
+from catalog.metaobjects import Catalog, load_metaobjects
+from catalog.product_variants import variant_dimensions
+from catalog.workflow import decode_options
+
+from conftest import CATALOG, SCRIPTS
+
+HELPERS = os.path.join(SCRIPTS, "helper-scripts", "create-product-variables")
+
+
+def field(value, unit):
+    return json.dumps({"value": value, "unit": unit})
+
+
+def test_units_are_normalized():
+    assert codecs.money('{"amount":"5.80","currency_code":"EUR"}') == (Decimal("5.80"), "EUR", 580)
+    assert codecs.money('{"amount":0.125,"currency_code":"EUR"}').cents == 13
+    assert codecs.weight(field(0.12, "KILOGRAMS")).grams == 120
+    assert codecs.weight(field(120.0, "GRAMS")).grams == 120
+    assert codecs.weight(field(1, "POUNDS")).grams == 454
+    assert codecs.dimension(field(40.0, "CENTIMETERS")).mm == 400
+    assert codecs.dimension(field(1, "INCHES")).mm == 25
+    assert codecs.decode("weight", "") is None and codecs.decode("name", "x") is None
+
+
+def test_bad_values_raise_value_error():
+    with pytest.raises(ValueError, match="unknown weight unit"):
+        codecs.weight(field(1, "STONES"))
+    with pytest.raises(ValueError, match="unknown dimension unit"):
+        codecs.dimension(field(1, "FURLONGS"))
+    with pytest.raises(ValueError, match="cannot decode"):
+        codecs.money('{"amount":"1"}')
+
+
+def test_equal_strings_are_decoded_once():
+    raw = field(321.0, "GRAMS")
+    before = codecs.weight.cache_info()
+    assert codecs.weight(raw) is codecs.weight(raw)
+    after = codecs.weight.cache_info()
+    assert (after.misses - before.misses, after.hits - before.hits) == (1, 1)
+
+
+def test_unit_problems_reports_mismatches_and_garbage():
+    records = [
+        ("ok", {"price": '{"amount":"1","currency_code":"EUR"}', "width": field(40, "CENTIMETERS")}),
+        ("mm", {"width": field(400, "MILLIMETERS"), "weight": field(1, "KILOGRAMS")}),
+        ("usd", {"price": '{"amount":"1","currency_code":"USD"}', "height": "{nope"}),
+    ]
+    problems = codecs.unit_problems(records)
+    assert "mm: width is MILLIMETERS, expected CENTIMETERS" in problems
+    assert "mm: weight is KILOGRAMS, expected GRAMS" in problems
+    assert "usd: price is USD, expected EUR" in problems
+    assert any(p.startswith("usd: height cannot decode") for p in problems)
+    assert not [p for p in problems if p.startswith("ok:")]
+
+
+def test_live_weights_in_other_units_fingerprint_the_same():
+    refs = ("a", "b")
+    assert (sync.fingerprint(refs, 6.6, (120.0, "GRAMS"), "t")
+            == sync.fingerprint(refs, 6.6, field(0.12, "KILOGRAMS"), "t")
+            == sync.fingerprint(refs, 6.6, 120, "t"))
+
+
+def test_decode_options_warns_and_refuses_mixed_currencies():
+    export = load_metaobjects(CATALOG)
+    stream = io.StringIO()
+    decode_options(export, stream=stream)
+    assert "WARNING" not in stream.getvalue()
+
+    with open(CATALOG) as f:
+        data = json.load(f)["data"]
+    node = data["sizeOptions"]["edges"][0]["node"]
+    price = next(f for f in node["fields"] if f["key"] == "price")
+    price["value"] = json.dumps({"amount": "1.00", "currency_code": "USD"})
+    with pytest.raises(ValueError, match="several currencies"):
+        decode_options(Catalog.from_metaobjects(data), stream=stream)
+    assert "price is USD, expected EUR" in stream.getvalue()
+
+
+def _value_exports():
+    with open(os.path.join(HELPERS, "configuration_value.json")) as f:
+        values = json.load(f)
+    with open(os.path.join(HELPERS, "configuration_option.json")) as f:
+        return values, json.load(f)
+
+
+def _edited(export, drop=lambda fields: False, strip=()):
+    """A copy of a definition export without some records and fields."""
+    export = json.loads(json.dumps(export))
+    conn = export["data"]["metaobjectDefinition"]["metaobjects"]
+    pairs = [(e, n) for e, n in zip(conn["edges"], conn["nodes"])
+             if not drop({f["key"]: f["value"] for f in n["fields"]})]
+    for _, n in pairs:
+        n["fields"] = [f for f in n["fields"] if f["key"] not in strip]
+    conn["edges"], conn["nodes"] = [e for e, _ in pairs], [n for _, n in pairs]
+    return export
+
+
+def test_product_variants_weights_are_grams():
+    values, config_options = _value_exports()
+    sizes = variant_dimensions(values, config_options, log=None)[0]
+    assert sizes and all(isinstance(s["weight"], Decimal) and s["weight"] > 0 for s in sizes)
+
+
+def test_product_variants_never_invent_weights_or_ids():
+    values, config_options = _value_exports()
+    with pytest.raises(ValueError, match="has no weight"):
+        variant_dimensions(_edited(values, strip={"weight"}), config_options, log=None)
+
+    no_bags = _edited(values, drop=lambda f: "bag" in f.get("name", "").lower())
+    with pytest.raises(ValueError, match="no configuration values found for Packaging"):
+        variant_dimensions(no_bags, config_options, log=None)
@@ -0,0 +1,50 @@
+import itertools
+
+import pytest
+
+from catalog.compress import compress, equivalence_classes
+from catalog.workflow import compressed_variants, config_space, hangloop_label, variant_space
+
+
+def test_classes_keep_first_appearance_order():
+    assert equivalence_classes([3, 1, 4, 1, 5, 9], key=lambda v: v % 2) == [
+        (1, [3, 1, 1, 5, 9]), (0, [4])]
+
+
+def test_catalog_folds_hangloops_into_free_and_paid(options):
+    compressed = compressed_variants(options)
+    assert len(compressed.space) == len(variant_space(options)) == 72
+    assert compressed.exact_size == len(config_space(options)) == 324
+    [hangs] = [g for g in compressed.mapping()["groups"] if g["group"] == "hangloopOptions"]
+    assert [c["label"] for c in hangs["classes"]] == ["No Hangloop", "Hangloop"]
+    assert sorted(m for c in hangs["classes"] for m in c["members"]) == sorted(
+        o.id for o in options["hangloopOptions"])
+
+
+def test_every_exact_selection_resolves_to_its_variant_and_config(options):
+    compressed = compressed_variants(options)
+    configs = config_space(options)
+    groups = [[o.id for o in opts] for opts in options.values()]
+    for selection in itertools.product(*groups):
+        variant, config = compressed.resolve(selection)
+        assert configs[config] == selection
+        rep = compressed.space[variant]
+        assert [o.cents for o in rep] == [option_cents(options, i) for i in selection]
+
+
+def option_cents(options, option_id):
+    return next(o.cents for opts in options.values() for o in opts if o.id == option_id)
+
+
+def test_unknown_ids_and_wrong_arity_are_rejected(options):
+    compressed = compressed_variants(options)
+    with pytest.raises(ValueError, match="expected 4 ids"):
+        compressed.resolve(("a",))
+    with pytest.raises(KeyError, match="not an option of this product"):
+        compressed.resolve(("a", "b", "c", "d"))
+
+
+def test_class_labels_must_be_unique(options):
+    with pytest.raises(ValueError, match="class labels are not unique"):
+        compress(options, {"hangloopOptions": lambda rep, members: "Hangloop"})
+    assert hangloop_label(options["hangloopOptions"][0]._replace(cents=0), []) == "No Hangloop"
@@ -0,0 +1,38 @@
+import pytest
+
+from catalog.discounts import PriceTable, discounted_cents, price_row, write_price_table
+from catalog.workflow import iter_price_rows, variant_space
+
+
+def test_discounts_stack_one_after_the_other():
+    assert discounted_cents(1000) == 1000
+    assert discounted_cents(1000, 16) == 840
+    assert discounted_cents(1000, 16, 15) == 714        # 0.84 * 0.85, not 31% off
+    assert discounted_cents(5, 10) == 5                  # 4.5 rounds half up
+    assert price_row(1000) == [1000, 850, 960, 816, 920, 782, 880, 748, 840, 714]
+
+
+def test_table_answers_by_tier_and_class(tmp_path):
+    path = str(tmp_path / "prices.json")
+    assert write_price_table([("a", 1000), ("b", 2000)], path) == 2
+    table = PriceTable.load(path)
+    assert len(table) == 2 and "a" in table and "c" not in table
+    assert table.unit_cents("a") == 1000
+    assert table.unit_cents("a", 999) == 1000
+    assert table.unit_cents("a", 1000) == 960
+    assert table.unit_cents("b", 7500, "reseller") == 1428
+    assert table.row("a")["reseller"] == [850, 816, 782, 748, 714]
+
+
+def test_duplicate_keys_are_refused(tmp_path):
+    with pytest.raises(ValueError, match="duplicate variant key"):
+        write_price_table([("a", 1), ("a", 2)], str(tmp_path / "prices.json"))
+
+
+def test_catalog_table_has_every_variant(tmp_path, options):
+    space = variant_space(options)
+    path = str(tmp_path / "variant_prices.json")
+    assert write_price_table(iter_price_rows(space), path) == 72
+    table = PriceTable.load(path)
+    for key, base in iter_price_rows(space):
+        assert table.unit_cents(key) == base
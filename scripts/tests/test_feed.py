@@ -0,0 +1,57 @@
+import gzip
+import io
+import json
+from contextlib import redirect_stderr
+
+from catalog import feed
+from catalog.metaobjects import load_metaobjects
+from catalog.pipeline import make_feed
+from catalog.workflow import iter_combinations, variant_space
+
+from conftest import CATALOG
+
+
+def read_part(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_feed_is_split_into_complete_gzip_parts(tmp_path, options):
+    titles = [t for _, _, _, t in iter_combinations(variant_space(options))]
+    resp = {"data": {"productVariantsBulkCreate": {"productVariants": [
+        {"id": f"gid://shopify/ProductVariant/{500 + i}", "title": t}
+        for i, t in enumerate(titles) if i % 2]}}}
+    site = feed.Site("https://shop.example/", "towel")
+    with redirect_stderr(io.StringIO()):
+        make_feed(options, load_metaobjects(CATALOG), str(tmp_path), site, "xml", resp,
+                  max_bytes=8000)
+
+    index = json.loads((tmp_path / "feed_index.json").read_text())
+    assert index["items"] == 72 and index["without_variant_id"] == 36
+    assert len(index["parts"]) > 1
+    items = 0
+    for part in index["parts"]:
+        text = read_part(tmp_path / part["file"])
+        assert text.startswith("<?xml") and text.endswith("</rss>\n")
+        assert len(text.encode("utf-8")) == part["bytes"] <= 8000
+        assert text.count("<item>") == part["items"]
+        items += part["items"]
+    assert items == 72
+    assert "<g:price>" in text and "cm</g:product_width>" in text
+
+    urls = sum(read_part(tmp_path / p["file"]).count("<url>") for p in index["sitemap"])
+    assert urls == 36
+    sitemap_index = (tmp_path / "sitemap_index.xml").read_text()
+    assert sitemap_index.count("<sitemap>") == len(index["sitemap"])
+    assert "https://shop.example/sitemap-001.xml.gz" in sitemap_index
+
+
+def test_item_ids_are_stable_and_csv_has_one_row_per_item(tmp_path, options):
+    refs = ("gid://a", "gid://b")
+    assert feed.item_id(refs) == feed.item_id(list(refs)) != feed.item_id(refs[::-1])
+    with redirect_stderr(io.StringIO()):
+        make_feed(options, load_metaobjects(CATALOG), str(tmp_path), feed.Site("https://s", "t"),
+                  "csv", sitemap=False)
+    rows = read_part(tmp_path / "feed-001.csv.gz").splitlines()
+    assert rows[0] == ",".join(feed.CSV_COLUMNS) and len(rows) == 73
+    assert not (tmp_path / "sitemap_index.xml").exists()
@@ -0,0 +1,41 @@
+import asyncio
+import io
+import json
+import os
+from contextlib import redirect_stderr
+
+from catalog import fetch
+from catalog.fakeadmin import FakeAdmin, serve
+
+from conftest import CATALOG, SCRIPTS
+
+HELPERS = os.path.join(SCRIPTS, "helper-scripts", "create-product-variables")
+EXPORTS = {
+    "metaobjects": CATALOG,
+    "values": os.path.join(HELPERS, "configuration_value.json"),
+    "options": os.path.join(HELPERS, "configuration_option.json"),
+}
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_fetched_exports_equal_the_originals(tmp_path):
+    state = FakeAdmin()
+    for path in EXPORTS.values():
+        state.seed(load(path))
+    server, _ = serve(state=state)
+    try:
+        with redirect_stderr(io.StringIO()):
+            written = asyncio.run(fetch.fetch_all(f"{state.base_url}/graphql.json", None, None,
+                                                  str(tmp_path), tuple(EXPORTS), page_size=3))
+    finally:
+        server.shutdown()
+
+    for target, original in EXPORTS.items():
+        path = str(tmp_path / fetch.FILENAMES[target])
+        assert written[path] > 3, f"{target} fits on one page"
+        assert load(path)["data"] == load(original)["data"], target
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
@@ -0,0 +1,34 @@
+import io
+import json
+
+from catalog import instrument
+from catalog.jsonl import write_jsonl
+from catalog.workflow import variant_space
+
+
+def test_disabled_hooks_record_nothing(monkeypatch):
+    monkeypatch.setattr(instrument, "_recorder", None)
+    assert not instrument.enabled()
+    assert instrument.stage("a") is instrument.stage("b")
+    instrument.count("combinations")
+
+
+def test_stages_and_counters_reach_the_trace(monkeypatch, tmp_path, options):
+    records = [{"i": i} for i in range(len(variant_space(options)))]
+    recorder = instrument.Recorder()
+    monkeypatch.setattr(instrument, "_recorder", recorder)
+    path = tmp_path / "variants.jsonl"
+    n = write_jsonl(records, str(path))
+
+    summary = recorder.summary()
+    assert summary["stages"]["write jsonl"]["calls"] == 1
+    assert summary["counters"] == {"records written": n, "bytes written": path.stat().st_size}
+
+    trace = tmp_path / "trace.json"
+    recorder.write_trace(trace)
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["write jsonl"]
+
+    stream = io.StringIO()
+    recorder.report(stream)
+    assert "write jsonl" in stream.getvalue() and f"records written: {n}" in stream.getvalue()
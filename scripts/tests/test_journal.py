@@ -0,0 +1,94 @@
+import io
+import json
+from contextlib import redirect_stderr
+
+from catalog.batching import alias_name
+from catalog.journal import CONFIG, VARIANT, Journal
+from catalog.pipeline import Product, make_config_mutation, make_resumable_variants
+from catalog.workflow import config_space
+
+from conftest import config_id_of, configs_response, refs_by_config_id
+
+PRODUCT = Product("gid://shopify/Product/1", "gid://shopify/ProductOption/1")
+
+
+def _record(journal, options, resp):
+    refs_of = {alias_name(i): refs for i, refs in enumerate(config_space(options), start=1)}
+    journal.record_config_response(resp, {a: refs_of[a] for a in resp["data"]})
+
+
+def _pending(options, journal, tmp_path):
+    """``(variant inputs, stderr)`` of a resumed step 2 written as JSONL."""
+    path, err = tmp_path / "variants.jsonl", io.StringIO()
+    with redirect_stderr(err):
+        make_resumable_variants(options, PRODUCT, journal, str(path))
+    return [json.loads(line)["variants"][0] for line in path.read_text().splitlines()], err.getvalue()
+
+
+def test_replay_keeps_the_latest_outcome_but_never_downgrades(tmp_path):
+    path = str(tmp_path / "j.jsonl")
+    with Journal(path) as journal:
+        journal.record(CONFIG, "conf_001", "failed", errors=["x"])
+        journal.record(CONFIG, "conf_001", "ok", id="gid://1", refs=["a"])
+        journal.record(CONFIG, "conf_001", "failed", errors=["taken"])
+        journal.record(VARIANT, "t", "failed", errors=["y"])
+    with Journal(path) as journal:
+        assert journal.config_id("conf_001") == "gid://1"
+        assert journal.pending(CONFIG, ["conf_001", "conf_002"]) == ["conf_002"]
+        assert list(journal.failed(VARIANT)) == ["t"]
+
+
+def test_responses_record_missing_aliases_and_titles_as_failed(tmp_path):
+    with Journal(str(tmp_path / "j.jsonl")) as journal:
+        counts = journal.record_config_response(
+            {"data": {"conf_001": {"metaobject": {"id": "gid://1"}}}},
+            {"conf_001": ("a",), "conf_002": ("b",)})
+        assert counts == {"ok": 1, "failed": 1}
+        assert journal.failed(CONFIG)["conf_002"]["errors"] == ["missing from response"]
+        counts = journal.record_variant_response(
+            {"data": {"productVariantsBulkCreate": {
+                "productVariants": [{"id": "gid://v1", "title": "one"}],
+                "userErrors": [{"message": "bad"}]}}}, ["one", "two"])
+        assert counts == {"ok": 1, "failed": 1}
+        assert journal.failed(VARIANT)["two"]["errors"] == ["bad"]
+
+
+def test_variant_waits_for_the_config_it_actually_needs(tmp_path, options, assert_linked):
+    # conf_028 = 40 × 80 cm | Both sides | first free hangloop | first packaging
+    resp = configs_response(options, skip={"conf_028"})
+    refs_of = refs_by_config_id(options, resp)
+    with Journal(str(tmp_path / "j.jsonl")) as journal:
+        _record(journal, options, resp)
+        variants, err = _pending(options, journal, tmp_path)
+    assert "1 wait for configs (conf_028)" in err
+    assert len(variants) == 71
+    for v in variants:
+        assert_linked(v["optionValues"][0]["name"], refs_of[config_id_of(v)])
+
+
+def test_renumbered_catalog_keeps_ids_with_their_refs(tmp_path, options, assert_linked):
+    resp = configs_response(options)
+    refs_of = refs_by_config_id(options, resp)
+    path = str(tmp_path / "j.jsonl")
+    with Journal(path) as journal:
+        _record(journal, options, resp)
+
+    # a catalog edit reorders the sizes: every conf_NNN now names other refs
+    edited = dict(options, sizeOptions=options["sizeOptions"][::-1])
+    with Journal(path) as journal:
+        variants, err = _pending(edited, journal, tmp_path)
+    assert "now have other refs" in err
+    assert len(variants) == 72
+    for v in variants:
+        assert_linked(v["optionValues"][0]["name"], refs_of[config_id_of(v)])
+
+
+def test_config_retry_sends_only_missing_refs(tmp_path, options, monkeypatch):
+    path = str(tmp_path / "j.jsonl")
+    with Journal(path) as journal:
+        _record(journal, options, configs_response(options, skip={"conf_005", "conf_300"}))
+    monkeypatch.chdir(tmp_path)
+    with Journal(path) as journal, redirect_stderr(io.StringIO()):
+        make_config_mutation(options, journal=journal)
+    batch = (tmp_path / "retry_configs_001.graphql").read_text()
+    assert "conf_005:" in batch and "conf_300:" in batch and batch.count("metaobjectCreate") == 2
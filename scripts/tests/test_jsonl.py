@@ -0,0 +1,45 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from catalog.jsonl import bulk_variant_lines, write_jsonl, write_variables_json
+
+VARIANTS = [{"price": 5.8, "optionValues": [{"optionId": "gid://shopify/ProductOption/1",
+                                             "name": f"40 × 80 cm | Front | {n}"}]}
+            for n in ("No Hangloop", "Hangloop")]
+
+
+@pytest.mark.parametrize("variants", [VARIANTS, []])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("indent", [2, 4])
+def test_streamed_variables_match_json_dump(variants, ensure_ascii, indent):
+    out = io.StringIO()
+    n = write_variables_json(out, "gid://shopify/Product/1", iter(variants), indent, ensure_ascii)
+    expected = json.dumps({"productId": "gid://shopify/Product/1", "variants": variants},
+                          indent=indent, ensure_ascii=ensure_ascii)
+    assert (out.getvalue(), n) == (expected, len(variants))
+
+
+def test_variables_json_escapes_non_ascii_by_default():
+    out = io.StringIO()
+    write_variables_json(out, "gid://shopify/Product/1", iter(VARIANTS))
+    assert "\\u00d7" in out.getvalue() and "×" not in out.getvalue()
+
+
+@pytest.mark.parametrize("name", ["variants.jsonl", "variants.jsonl.gz"])
+def test_bulk_jsonl_has_one_variables_object_per_line(tmp_path, name):
+    path = str(tmp_path / name)
+    assert write_jsonl(bulk_variant_lines("gid://shopify/Product/1", iter(VARIANTS)), path) == 2
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"productId": "gid://shopify/Product/1", "variants": [v]} for v in VARIANTS]
+    assert all(line.isascii() and ": " not in line for line in lines)
+
+
+def test_dash_writes_to_stdout(capsys):
+    write_jsonl(iter([{"a": 1}, {"b": 2}]), "-")
+    assert capsys.readouterr().out == '{"a":1}\n{"b":2}\n'
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from catalog.loadtest import drive, load_catalog, mislinked, variant_jobs
+from catalog.pipeline import Product
+from catalog.workflow import iter_combinations, variant_space
+
+from conftest import CATALOG, configs_response
+
+PRODUCT = Product("gid://shopify/Product/1", "gid://shopify/ProductOption/1", "mft_configuration")
+
+
+@pytest.mark.parametrize("params", [False, True])
+def test_every_created_variant_links_to_its_config(tmp_path, fake_admin, assert_linked, params):
+    url, fake = fake_admin(capacity=20000, restore_rate=20000)
+    report = asyncio.run(drive(url, None, load_catalog(CATALOG), str(tmp_path), PRODUCT, params,
+                               state=fake))
+    assert report["complete"]
+    assert report["phases"][2]["mislinked"] == 0
+    links = fake.variant_links(PRODUCT.product_id)
+    assert len(links) == 72
+    for title, refs in links:
+        assert_linked(title, refs)
+
+
+def test_variants_wait_for_their_own_config(options):
+    resp = configs_response(options, skip={"conf_001"})
+    jobs, waiting = variant_jobs(options, PRODUCT, resp)
+    assert waiting == ["conf_001"]
+    assert sum(len(v["variants"]) for _, v in jobs) == 71
+
+
+def test_mislinked_titles_are_reported(options):
+    (refs, _, _, title), (other, _, _, _) = list(iter_combinations(variant_space(options)))[:2]
+    assert mislinked(options, [(title, refs)]) == []
+    assert mislinked(options, [(title, other), (title, None)]) == [title, title]
@@ -0,0 +1,38 @@
+import pytest
+
+from catalog.lookup import Lookup, build_index, variant_ids, write_index
+from catalog.workflow import (compressed_variants, config_groups, config_space, iter_combinations,
+                              variant_space)
+
+
+def test_every_selection_resolves_to_its_variant(tmp_path, options):
+    combos = list(iter_combinations(variant_space(options)))
+    titles = [title for _, _, _, title in combos]
+    prices = {title: round(total * 100) for _, total, _, title in combos}
+    resp = {"data": {"productVariantsBulkCreate": {"productVariants": [
+        {"id": f"gid://shopify/ProductVariant/{500 + i}", "title": t} for i, t in enumerate(titles)]}}}
+    ids = variant_ids(resp)
+    index = build_index(compressed_variants(options), config_groups(options), ids)
+    assert index["missingIds"] == 0
+    path = tmp_path / "lookup.json"
+    write_index(path, index)
+    lookup = Lookup.load(path)
+
+    labels = {o.id: o for opts in options.values() for o in opts}
+    assert len(lookup) == len(config_space(options)) == 324
+    for size, side, hang, pack in config_space(options):
+        gid, cents = lookup.resolve((size, side, hang, pack))
+        hang_label = "Hangloop" if labels[hang].cents else "No Hangloop"
+        title = " | ".join([labels[size].label, labels[side].label, hang_label, labels[pack].label])
+        assert gid == ids[title]
+        assert cents == prices[title]
+
+
+def test_index_without_variant_ids_still_prices(options):
+    lookup = Lookup(build_index(compressed_variants(options), config_groups(options)))
+    gid, cents = lookup.resolve(config_space(options)[0])
+    assert gid is None and cents > 0
+    with pytest.raises(KeyError, match="not an option"):
+        lookup.resolve(("gid://shopify/Metaobject/1",) * 4)
+    with pytest.raises(ValueError, match="expected 4 ids"):
+        lookup.resolve(())
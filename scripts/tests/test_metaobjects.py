@@ -0,0 +1,50 @@
+import pytest
+
+from catalog.metaobjects import OPTION_GROUPS, Catalog, load_metaobjects
+
+from conftest import CATALOG
+
+
+@pytest.fixture(scope="module")
+def cat():
+    return load_metaobjects(CATALOG)
+
+
+def test_groups_keep_export_order(cat):
+    assert [len(cat.group(g)) for g in OPTION_GROUPS] == [6, 2, 9, 3]
+    assert cat.group("hangloopOptions")[-1]["position"] == "No Hangloop"
+    assert len(cat) == 20 and cat.group("nope") == []
+
+
+def test_fields_by_key(cat):
+    rec = cat[cat.ids("sizeOptions")[0]]
+    assert rec["name"] == "40 × 80 cm"
+    assert rec.get("missing", "x") == "x" and "price" in rec and "missing" not in rec
+    with pytest.raises(KeyError, match="missing in gid://"):
+        rec["missing"]
+
+
+def test_records_with_one_layout_share_their_slots(cat):
+    sizes = cat.group("sizeOptions")
+    assert all(r._slots is sizes[0]._slots for r in sizes)
+    assert cat.group("printedSides")[0]._slots is not sizes[0]._slots
+
+
+def test_find_indexes_field_values_and_sees_new_records(cat):
+    [no_hang] = cat.find("position", "No Hangloop")
+    assert no_hang.group == "hangloopOptions"
+    local = Catalog.from_metaobjects({"g": {"edges": []}})
+    assert local.find("position", "Top") == []
+    local.add("g", "gid://1", [{"key": "position", "value": "Top"}])
+    assert [r.id for r in local.find("position", "Top")] == ["gid://1"]
+
+
+def test_definition_export_pairs_edges_with_nodes():
+    data = {"metaobjectDefinition": {"metaobjects": {
+        "edges": [{"node": {"id": "gid://1", "displayName": "Towel Size: 40"}},
+                  {"node": {"id": "gid://2", "displayName": "Towel Size: 50"}}],
+        "nodes": [{"fields": [{"key": "name", "value": "40"}]},
+                  {"fields": [{"key": "name", "value": "50"}]}]}}}
+    cat = Catalog.from_definition(data, group="values")
+    assert [(r.id, r.display_name, r["name"]) for r in cat.group("values")] == [
+        ("gid://1", "Towel Size: 40", "40"), ("gid://2", "Towel Size: 50", "50")]
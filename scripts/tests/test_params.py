@@ -0,0 +1,48 @@
+import asyncio
+import glob
+import json
+
+from catalog.batching import (alias_name, config_entries, merge_responses, write_batches,
+                              write_param_batches)
+from catalog.runner import send_config_batches
+from catalog.workflow import config_ids_by_refs, config_space
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def aliased(options):
+    return [(alias_name(i), refs) for i, refs in enumerate(config_space(options), start=1)]
+
+
+def test_full_batches_share_one_document_and_are_smaller(tmp_path, options):
+    manifest = write_param_batches(aliased(options), "mft_configuration", out_dir=str(tmp_path))
+    assert manifest["mode"] == "params" and manifest["total_aliases"] == 324
+    sizes = [b["aliases"] for b in manifest["batches"]]
+    assert len(manifest["documents"]) == len(set(sizes))
+    assert [a for b in manifest["batches"] for a in b["slots"]] == [a for a, _ in aliased(options)]
+    variables = json.loads((tmp_path / manifest["batches"][0]["file"]).read_text())
+    assert variables["type"] == "mft_configuration"
+    assert json.loads(variables["c0"]) == list(config_space(options)[0])
+
+    literal = write_batches(config_entries(config_space(options), "mft_configuration"),
+                            out_dir=str(tmp_path / "literal"))
+    assert (sum(b["bytes"] for b in manifest["batches"])
+            < sum(b["bytes"] for b in literal["batches"]))
+
+
+def test_sent_batches_answer_like_literal_responses(tmp_path, monkeypatch, options, fake_admin):
+    url, state = fake_admin()
+    write_param_batches(aliased(options), "mft_configuration", out_dir=str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    summary = asyncio.run(send_config_batches(url, None, "create_configs.manifest.json"))
+    assert summary["failed"] == summary["user_errors"] == 0
+    resp = merge_responses(load(p) for p in sorted(glob.glob("configs_*.json")))
+    assert sorted(resp["data"]) == [a for a, _ in aliased(options)]
+    ids = config_ids_by_refs(options, resp)
+    assert len(ids) == 324
+    stored = {n["id"]: tuple(f["jsonValue"]) for n in state.metaobjects["mft_configuration"]
+              for f in n["fields"] if f["key"] == "configurations"}
+    assert all(stored[gid] == refs for refs, gid in ids.items())
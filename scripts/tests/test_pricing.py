@@ -0,0 +1,54 @@
+import itertools
+
+import pytest
+
+from catalog.pricing import PriceMatrix, format_cents, price_cents, weight_grams
+from catalog.workflow import iter_combinations, variant_space
+
+DIM_CENTS = [[100, 250, 1999], [0, 330], [0, 5, 7, 11], [1, 2, 3]]
+
+
+def brute_force(dims):
+    return [sum(c) for c in itertools.product(*dims)]
+
+
+def test_conversions_are_exact():
+    assert price_cents(6.6) == price_cents("6.60") == 660
+    assert price_cents("0.005") == 1                   # half up, not banker's rounding
+    assert weight_grams(0.12, "KILOGRAMS") == weight_grams("120.0") == 120
+    assert weight_grams(1, "OUNCES") == 28
+    assert weight_grams(None) == 0
+    with pytest.raises(ValueError, match="unknown weight unit"):
+        weight_grams(1, "STONES")
+    assert [format_cents(c) for c in (660, 5, -1234)] == ["6.60", "0.05", "-12.34"]
+
+
+def test_pure_python_matrix_matches_brute_force():
+    m = PriceMatrix(DIM_CENTS, DIM_CENTS, use_numpy=False)
+    assert m.backend == "python"
+    assert len(m) == 72
+    assert m.prices() == brute_force(DIM_CENTS)
+    assert [m.weight(i) for i in range(len(m))] == brute_force(DIM_CENTS)
+    assert m.prices(10, 20) == brute_force(DIM_CENTS)[10:20]
+
+
+def test_numpy_and_pure_python_agree():
+    pytest.importorskip("numpy")
+    fast = PriceMatrix(DIM_CENTS, DIM_CENTS, use_numpy=True)
+    slow = PriceMatrix(DIM_CENTS, DIM_CENTS, use_numpy=False)
+    assert fast.backend == "numpy"
+    assert fast.prices() == slow.prices()
+    assert [fast.weight(i) for i in range(len(fast))] == [slow.weight(i) for i in range(len(slow))]
+
+
+def test_catalog_prices_are_the_rounded_option_sums(options):
+    space = variant_space(options)
+    for (size, side, hang, pack), (_, total, _, _) in zip(space, iter_combinations(space)):
+        assert total == round(size.price + side.price + hang.price + pack.price, 2)
+
+
+def test_without_numpy_the_default_falls_back(monkeypatch):
+    monkeypatch.setattr("catalog.pricing._numpy", lambda: None)
+    assert PriceMatrix(DIM_CENTS).backend == "python"
+    with pytest.raises(ImportError, match="numpy is not installed"):
+        PriceMatrix(DIM_CENTS, use_numpy=True)
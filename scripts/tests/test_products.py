@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from catalog.products import run
+
+from conftest import CATALOG, config_id_of, configs_response, refs_by_config_id
+
+
+def write_manifest(tmp_path, products):
+    (tmp_path / "products.json").write_text(json.dumps({"catalog": CATALOG, "products": [
+        {"handle": h, "product_id": f"gid://shopify/Product/{n}",
+         "option_id": f"gid://shopify/ProductOption/{n}", **extra}
+        for n, (h, extra) in enumerate(products, start=1)]}))
+    return str(tmp_path / "products.json")
+
+
+def test_product_jsonl_links_each_variant_to_its_config(tmp_path, options, assert_linked):
+    resp = configs_response(options)
+    (tmp_path / "products" / "towel").mkdir(parents=True)
+    (tmp_path / "products" / "towel" / "configs_001.json").write_text(json.dumps(resp))
+
+    [result] = run(write_manifest(tmp_path, [("towel", {})]), workers=1)
+
+    assert result["variants"] == 72
+    refs_of = refs_by_config_id(options, resp)
+    with open(tmp_path / "products" / "towel" / "variants.jsonl", encoding="utf-8") as f:
+        for line in f:
+            [variant] = json.loads(line)["variants"]
+            assert_linked(variant["optionValues"][0]["name"], refs_of[config_id_of(variant)])
+
+
+def test_output_does_not_depend_on_the_worker_count(tmp_path, options):
+    sizes = [o.id for o in options["sizeOptions"]]
+    products = [("towel", {}), ("small-towel", {"options": {"sizeOptions": sizes[:2]}})]
+    outputs = []
+    for workers in (1, 2):
+        root = tmp_path / str(workers)
+        root.mkdir()
+        results = run(write_manifest(root, products), workers=workers)
+        assert [r["configs"] for r in results] == [324, 108]
+        outputs.append({p.relative_to(root).as_posix(): p.read_bytes()
+                        for p in sorted((root / "products").rglob("*.graphql"))})
+    assert outputs[0] == outputs[1]
+
+
+def test_duplicate_handles_are_refused(tmp_path):
+    with pytest.raises(ValueError, match="duplicate product handles"):
+        run(write_manifest(tmp_path, [("towel", {}), ("towel", {})]), workers=1)
@@ -0,0 +1,34 @@
+from catalog.resolve import Resolver, normalize
+
+
+def resolver(aliases=None):
+    return Resolver([
+        ("gid://1", ["40 × 80 cm", "40-x-80-cm"]),
+        ("gid://2", ["50 × 100 cm"]),
+        ("gid://3", ["Mesh Bag", "mesh-bag"]),
+        ("gid://4", ["none"]),
+    ], aliases)
+
+
+def test_spellings_share_one_key():
+    assert normalize("40 × 80 cm") == normalize("40 X 80 Cm") == normalize("40-x-80-cm") == "40 x 80 cm"
+    r = resolver()
+    assert len(r) == 4
+    assert r.lookup("40 X 80 Cm") == ("gid://1", "key", 1.0)
+    assert r.resolve("MESH BAG") == "gid://3"
+
+
+def test_aliases_and_trigrams():
+    r = resolver({"No Bag": "none"})
+    assert r.lookup("No Bag") == ("gid://4", "alias", 1.0)
+    match = r.lookup("Mesh Bags")
+    assert match.id == "gid://3" and match.via == "trigram" and match.score >= 0.6
+
+
+def test_misses_and_ties_are_reported():
+    r = Resolver([("gid://1", ["Front"]), ("gid://2", ["front"])])
+    assert r.resolve("front", "fallback") == "fallback"
+    assert r.resolve("Velvet Pouch") is None
+    report = r.report()
+    assert report["ambiguous"] == [{"name": "front", "candidates": ["gid://1", "gid://2"]}]
+    assert report["unmatched"] == ["Velvet Pouch"]
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from catalog.shipping import (BRACKETS_G, DEFAULT_ZONE, SERVICES, ZONES, RateService,
+                              build_table, load_tariff)
+
+
+def write_tariff(tmp_path, tariff):
+    path = tmp_path / "tariff.json"
+    path.write_text(json.dumps(tariff))
+    return str(path)
+
+
+def full_tariff():
+    return {zone: {service: [100 * z + s, 10 * z + s] for s, service in enumerate(SERVICES)}
+            for z, zone in enumerate((*ZONES, DEFAULT_ZONE), start=1)}
+
+
+def test_unset_tariff_fails_loudly():
+    with pytest.raises(ValueError, match="no shipping tariff configured"):
+        load_tariff(None)
+
+
+def test_incomplete_tariff_names_what_is_missing(tmp_path):
+    tariff = full_tariff()
+    del tariff["EU"]["express"]
+    tariff["WORLD"]["standard"] = [2490]
+    with pytest.raises(ValueError, match="EU.express, WORLD.standard"):
+        load_tariff(write_tariff(tmp_path, tariff))
+
+
+def test_rates_come_from_the_configured_tariff(tmp_path, options):
+    tariff = load_tariff(write_tariff(tmp_path, full_tariff()))
+    service = RateService(build_table(options, tariff))
+    base, per_kg = tariff["DE"]["standard"]
+    grams = BRACKETS_G[1]
+    assert dict(service.quote(grams, "de"))["standard"] == base + per_kg * grams // 1000
+    base, per_kg = tariff[DEFAULT_ZONE]["express"]
+    assert dict(service.quote(1, "US"))["express"] == base + per_kg
+
+
+@pytest.fixture
+def service(tmp_path, options):
+    return RateService(build_table(options, load_tariff(write_tariff(tmp_path, full_tariff()))))
+
+
+def test_country_spellings_share_one_cache_entry(service):
+    assert service.quote(700, " de") == service.quote(700, "DE") == service.quote(700, "de")
+    info = service.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+    assert service.zone("at ") == "EU"
+    assert service.zone(None) == DEFAULT_ZONE
+
+
+def test_heavy_carts_add_overflow_steps(service):
+    last = dict(service.quote(BRACKETS_G[-1], "DE"))["standard"]
+    step = service.rates["standard"]["DE"]["overflow"]
+    assert dict(service.quote(BRACKETS_G[-1] + 1, "DE"))["standard"] == last + step
+    assert dict(service.quote(BRACKETS_G[-1] + 10001, "DE"))["standard"] == last + 2 * step
+
+
+def test_carrier_response_weighs_items_by_grams_or_variant_title(service):
+    title = next(iter(service.variant_grams))
+    body = {"rate": {"destination": {"country": "FR"}, "currency": "EUR", "items": [
+        {"grams": 300, "quantity": 2},
+        {"name": f"Towel - {title}", "quantity": 3},
+        {"grams": 5000, "requires_shipping": False}]}}
+    grams = 600 + 3 * service.variant_grams[title]
+    rates = service.carrier_response(body)["rates"]
+    assert [r["service_code"] for r in rates] == list(SERVICES)
+    assert rates[0]["total_price"] == str(dict(service.quote(grams, "FR"))["standard"])
+    assert rates[0]["description"] == f"{grams} g to FR"
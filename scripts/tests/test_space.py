@@ -0,0 +1,39 @@
+import itertools
+
+import pytest
+
+from catalog.space import CombinationSpace, parse_range
+
+DIMS = (["s1", "s2", "s3"], ["front", "both"], ["h0", "h1", "h2", "h3"], ["bag", "box"])
+
+
+def test_indexing_matches_itertools_product():
+    space = CombinationSpace(*DIMS)
+    combos = list(itertools.product(*DIMS))
+    assert len(space) == len(combos) == 48
+    assert [space[i] for i in range(len(space))] == combos
+    assert [space.index(c) for c in combos] == list(range(48))
+    assert space[-1] == combos[-1]
+    with pytest.raises(IndexError):
+        space[48]
+    with pytest.raises(ValueError, match="not an option value"):
+        space.index(("s1", "front", "h9", "bag"))
+
+
+def test_ranges_and_shards_cover_the_space():
+    space = CombinationSpace(*DIMS)
+    combos = list(space)
+    assert list(space.range(7, 30)) == combos[7:30]
+    assert space[5:9] == combos[5:9]
+    shards = list(space.shards(5))
+    assert [c for start, stop in shards for c in space.range(start, stop)] == combos
+    assert max(b - a for a, b in shards) - min(b - a for a, b in shards) <= 1
+
+
+def test_parse_range_is_one_based_and_inclusive():
+    assert parse_range("17:40", 324) == (16, 40)
+    assert parse_range("250:", 324) == (249, 324)
+    assert parse_range(":10", 324) == (0, 10)
+    assert parse_range("17", 324) == (16, 17)
+    with pytest.raises(ValueError):
+        parse_range("300:400", 324)
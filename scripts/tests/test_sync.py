@@ -0,0 +1,122 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from catalog import sync
+from catalog.metaobjects import load_metaobjects
+
+from conftest import SCRIPTS
+
+A = [("a-s1", "a-p1"), ("a-s1", "a-p2"), ("a-s2", "a-p1")]
+B = [("b-s1", "b-p1")]
+
+
+def desired(combos):
+    return [sync.Desired(refs, 6.6, (120.0, "GRAMS"), " | ".join(refs)) for refs in combos]
+
+
+def live_state(configs, variants=(), page_info=None):
+    """A live_state.graphql response; ``configs`` maps config id → refs."""
+    data = {
+        "configurations": {"nodes": [{"id": cid, "configurations": {"value": json.dumps(list(refs))}}
+                                     for cid, refs in configs.items()]},
+        "product": {"variants": {"nodes": [
+            {"id": vid, "title": title, "price": "6.60", "variations": {"value": cid},
+             "weight": {"value": json.dumps({"value": 120.0, "unit": "GRAMS"})}}
+            for vid, cid, title in variants]}},
+    }
+    if page_info is not None:
+        data["configurations"]["pageInfo"] = {"hasNextPage": page_info}
+        data["product"]["variants"]["pageInfo"] = {"hasNextPage": page_info}
+    return {"data": data}
+
+
+def test_fingerprint_ignores_price_and_weight_spelling():
+    refs = ("x", "y")
+    assert (sync.fingerprint(refs, 6.6, (120, "GRAMS"), "t")
+            == sync.fingerprint(refs, "6.60", '{"value": 120.0, "unit": "GRAMS"}', "t"))
+    assert sync.fingerprint(refs, 6.6, None, "t") != sync.fingerprint(refs, 6.61, None, "t")
+
+
+def test_unchanged_state_needs_nothing():
+    configs = {f"c{i}": refs for i, refs in enumerate(A)}
+    variants = [(f"v{i}", f"c{i}", " | ".join(refs)) for i, refs in enumerate(A)]
+    live_configs, live_variants, unmanaged = sync.parse_live_state(live_state(configs, variants))
+    plan = sync.diff(A, desired(A), live_configs, live_variants, prune_options=[])
+    assert sync.summary(plan, unmanaged) == {
+        "config_creates": 0, "config_deletes": 0, "variant_creates": 0,
+        "variant_updates": 0, "variant_deletes": 0, "unchanged": 3, "unmanaged": []}
+
+
+def test_changes_are_keyed_by_refs():
+    live = live_state({"c0": A[0], "c9": ("a-s9", "a-p1")},
+                      [("v0", "c0", "renamed"), ("v1", "c0", "duplicate"), ("v9", "gone", "x")])
+    live_configs, live_variants, unmanaged = sync.parse_live_state(live)
+    plan = sync.diff(A, desired(A), live_configs, live_variants)
+    assert plan["config_creates"] == [(2, A[1]), (3, A[2])]
+    assert [d.refs for d in plan["variant_creates"]] == A[1:]
+    assert [(v.id, d.title) for v, d in plan["variant_updates"]] == [("v0", "a-s1 | a-p1")]
+    assert plan["variant_deletes"] == ["v1"]
+    assert unmanaged == ["v9"]
+
+
+def test_stale_configs_are_kept_unless_pruning_is_asked_for():
+    live_configs, _, _ = sync.parse_live_state(live_state({"stale": ("a-s2", "a-p2")}))
+    assert sync.diff(A, [], live_configs, [])["config_deletes"] == []
+    own = {r for refs in A for r in refs} | {"a-p2"}
+    assert sync.diff(A, [], live_configs, [], own)["config_deletes"] == ["stale"]
+
+
+def test_pruning_never_touches_another_products_configs():
+    # both products share the mft_configuration definition
+    live = live_state({f"a{i}": refs for i, refs in enumerate(A)}
+                      | {"b0": B[0], "mixed": ("a-s1", "b-p1"), "a-old": ("a-s2", "a-p2")})
+    live_configs, _, _ = sync.parse_live_state(live)
+    own_a = {r for refs in A for r in refs} | {"a-p2"}
+    plan_a = sync.diff(A, desired(A), live_configs, [], own_a)
+    assert plan_a["config_deletes"] == ["a-old"]
+    assert plan_a["config_creates"] == []
+
+    plan_b = sync.diff(B, desired(B), live_configs, [], {"b-s1", "b-p1"})
+    assert plan_b["config_deletes"] == []
+
+
+def test_pages_are_merged_and_a_truncated_export_is_refused():
+    page1 = live_state({"c0": A[0]}, [("v0", "c0", "t")], page_info=True)
+    page2 = live_state({"c1": A[1]}, [("v0", "c0", "t"), ("v1", "c1", "t")], page_info=False)
+    live_configs, live_variants, _ = sync.parse_live_state([page1, page2])
+    assert live_configs == {A[0]: "c0", A[1]: "c1"}
+    assert [v.id for v in live_variants] == ["v0", "v1"]
+
+    with pytest.raises(sync.TruncatedLiveState, match="continues after the last page"):
+        sync.parse_live_state([page1])
+    with pytest.raises(sync.TruncatedLiveState):
+        sync.parse_live_state(page1)
+
+
+def run_sync(tmp_path, live, *flags):
+    (tmp_path / "live.json").write_text(json.dumps(live))
+    script = f"{SCRIPTS}/create-varients-v2/generate_full_workflow.py"
+    return subprocess.run([sys.executable, script, "--sync", "live.json", *flags,
+                           f"{SCRIPTS}/create-varients-v2/metaobjects.json"],
+                          cwd=tmp_path, capture_output=True, text=True)
+
+
+def test_cli_prunes_only_on_request_and_only_own_configs(tmp_path):
+    cat = load_metaobjects(f"{SCRIPTS}/create-varients-v2/metaobjects.json")
+    size, other = cat.ids("sizeOptions")[:2]
+    live = live_state({"own-stale": (size, other), "foreign": (size, "gid://other-product")})
+
+    assert run_sync(tmp_path, live).returncode == 0
+    assert json.loads((tmp_path / "sync_plan.json").read_text())["config_deletes"] == 0
+
+    assert run_sync(tmp_path, live, "--prune-configs").returncode == 0
+    assert json.loads((tmp_path / "sync_plan.json").read_text())["config_deletes"] == 1
+    batches = "".join(p.read_text() for p in tmp_path.glob("sync_configs_*.graphql"))
+    assert 'metaobjectDelete(id: "own-stale")' in batches and "foreign" not in batches
+
+    truncated = run_sync(tmp_path, live_state({}, page_info=True))
+    assert truncated.returncode != 0
+    assert "Live state is incomplete" in truncated.stderr
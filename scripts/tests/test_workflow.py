@@ -0,0 +1,57 @@
+import pytest
+
+from catalog.workflow import (config_ids_by_refs, config_space, iter_combinations, iter_variants,
+                              select, variant_space)
+
+from conftest import config_id_of, configs_response, refs_by_config_id
+
+OPTION_ID = "gid://shopify/ProductOption/1"
+
+
+def test_spaces_have_the_catalog_shape(options):
+    assert len(config_space(options)) == 324
+    assert len(variant_space(options)) == 72
+    hangs = [config_space(options)[i][2] for i in range(0, 27, 3)]
+    prices = {o.id: o.price for o in options["hangloopOptions"]}
+    assert [prices[h] for h in hangs] == sorted(prices[h] for h in hangs)
+
+
+def test_every_variant_links_to_the_config_with_its_refs(options, assert_linked):
+    resp = configs_response(options)
+    refs_of = refs_by_config_id(options, resp)
+    space = variant_space(options)
+    variants = list(iter_variants(space, OPTION_ID, config_ids_by_refs(options, resp)))
+    combos = list(iter_combinations(space))
+    assert len(variants) == len(combos) == 72
+    for variant, (refs, _, _, title) in zip(variants, combos):
+        assert refs_of[config_id_of(variant)] == refs
+        assert_linked(title, refs_of[config_id_of(variant)])
+
+
+def test_range_links_like_the_full_run(options):
+    ids = config_ids_by_refs(options, configs_response(options))
+    space = variant_space(options)
+    full = list(iter_variants(space, OPTION_ID, ids))
+    assert list(iter_variants(space, OPTION_ID, ids, 16, 40)) == full[16:40]
+
+
+def test_missing_config_is_an_error(options):
+    resp = configs_response(options, skip={"conf_001"})
+    with pytest.raises(KeyError, match="no config created"):
+        list(iter_variants(variant_space(options), OPTION_ID, config_ids_by_refs(options, resp)))
+
+
+def test_config_ids_ignore_other_aliases(options):
+    resp = configs_response(options)
+    resp["data"]["del_001"] = {"deletedId": "gid://shopify/Metaobject/1"}
+    resp["data"]["conf_999"] = {"metaobject": {"id": "gid://shopify/Metaobject/2"}}
+    assert len(config_ids_by_refs(options, resp)) == 324
+
+
+def test_select_keeps_the_listed_order(options):
+    sizes = [o.id for o in options["sizeOptions"]]
+    picked = select(options, {"sizeOptions": sizes[:2][::-1], "printedSides": "*"})
+    assert [o.id for o in picked["sizeOptions"]] == sizes[:2][::-1]
+    assert picked["printedSides"] == options["printedSides"]
+    with pytest.raises(KeyError, match="unknown option ids"):
+        select(options, {"sizeOptions": ["gid://nope"]})